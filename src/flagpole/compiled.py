@@ -0,0 +1,203 @@
+"""
+Compiled feature definitions.
+
+Evaluating a `Feature` interprets its segments and conditions on every check,
+which includes building a case insensitive set of the values of every `in`
+condition. A `CompiledFeature` does that work once when the feature is loaded:
+
+* `in` and `not_in` conditions match against a prebuilt frozenset, so that
+  checking long lists of organization or project ids takes constant time,
+* string values of `equals` and `contains` conditions are lowercased once,
+* rollouts are turned into a precomputed threshold,
+* context property names are interned.
+
+Compiled features evaluate exactly like the features they are compiled from,
+including the exceptions raised for mismatching types.
+
+>>> compiled = CompiledFeature.compile(feature)
+>>> compiled.match(context)
+"""
+from __future__ import annotations
+
+import sys
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from flagpole import Feature
+from flagpole.conditions import (
+    ConditionBase,
+    ConditionOperatorKind,
+    ConditionTypeMismatchException,
+    Segment,
+    create_case_insensitive_set_from_list,
+    get_type_name,
+)
+from flagpole.evaluation_context import EvaluationContext
+
+# Matches the value of a context property.
+PropertyMatcher = Callable[[Any], bool]
+
+# Rollout thresholds of segments which are always or never granted.
+ROLLOUT_NONE = -1
+ROLLOUT_ALL = 100
+
+
+def _compile_in(condition: ConditionBase, segment_name: str) -> PropertyMatcher:
+    if not isinstance(condition.value, list):
+        raise ConditionTypeMismatchException(
+            f"'In' condition value must be a list, but was provided a '{get_type_name(condition.value)}'"
+            + f" of segment {segment_name}"
+        )
+    values = frozenset(create_case_insensitive_set_from_list(condition.value))
+    value_type_name = get_type_name(condition.value)
+
+    def match(condition_property: Any) -> bool:
+        if isinstance(condition_property, str):
+            return condition_property.lower() in values
+        if isinstance(condition_property, (list, dict)):
+            raise ConditionTypeMismatchException(
+                "'In' condition property value must be str | int | float | bool | None, but was provided a"
+                + f"'{value_type_name}' of segment {segment_name}"
+            )
+        return condition_property in values
+
+    return match
+
+
+def _compile_contains(condition: ConditionBase, segment_name: str) -> PropertyMatcher:
+    value = condition.value
+    if isinstance(value, str):
+        value = value.lower()
+
+    def match(condition_property: Any) -> bool:
+        if not isinstance(condition_property, list):
+            raise ConditionTypeMismatchException(
+                f"'Contains' can only be checked against a list, but was given a {get_type_name(condition_property)}"
+                + f" context property '{condition_property}' of segment '{segment_name}'"
+            )
+        return value in create_case_insensitive_set_from_list(condition_property)
+
+    return match
+
+
+def _compile_equals(condition: ConditionBase, segment_name: str) -> PropertyMatcher:
+    value = condition.value
+    value_type = type(value)
+    strict_validation = getattr(condition, "strict_validation", False)
+    if isinstance(value, str):
+        value = value.lower()
+
+    def match(condition_property: Any) -> bool:
+        if condition_property is None and not strict_validation:
+            return False
+
+        if not isinstance(condition_property, value_type):
+            raise ConditionTypeMismatchException(
+                "'Equals' operator cannot be applied to values of mismatching types"
+                + f"({get_type_name(condition.value)} and {get_type_name(condition_property)}) for segment {segment_name}"
+            )
+
+        if isinstance(condition_property, str):
+            return condition_property.lower() == value
+        return condition_property == value
+
+    return match
+
+
+_COMPILERS: dict[
+    ConditionOperatorKind, tuple[Callable[[ConditionBase, str], PropertyMatcher], bool]
+] = {
+    ConditionOperatorKind.IN: (_compile_in, False),
+    ConditionOperatorKind.NOT_IN: (_compile_in, True),
+    ConditionOperatorKind.CONTAINS: (_compile_contains, False),
+    ConditionOperatorKind.NOT_CONTAINS: (_compile_contains, True),
+    ConditionOperatorKind.EQUALS: (_compile_equals, False),
+    ConditionOperatorKind.NOT_EQUALS: (_compile_equals, True),
+}
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    property: str
+    matcher: PropertyMatcher
+    negate: bool
+
+    @classmethod
+    def compile(cls, condition: ConditionBase, segment_name: str) -> CompiledCondition:
+        compiler, negate = _COMPILERS[condition.operator]
+        return cls(
+            property=sys.intern(condition.property),
+            matcher=compiler(condition, segment_name),
+            negate=negate,
+        )
+
+    def match(self, context: EvaluationContext) -> bool:
+        return self.matcher(context.get(self.property)) != self.negate
+
+
+@dataclass(frozen=True)
+class CompiledSegment:
+    conditions: Sequence[CompiledCondition]
+    # Contexts are granted when `context.id % 100` is at most the threshold.
+    rollout_threshold: int
+
+    @classmethod
+    def compile(cls, segment: Segment) -> CompiledSegment:
+        # A rollout of 0 allows segments to match and disable a feature even
+        # if other segments would match.
+        if segment.rollout == 0:
+            rollout_threshold = ROLLOUT_NONE
+        elif segment.rollout is not None and segment.rollout < 100:
+            rollout_threshold = segment.rollout
+        else:
+            rollout_threshold = ROLLOUT_ALL
+
+        return cls(
+            conditions=tuple(
+                CompiledCondition.compile(condition, segment.name)
+                for condition in segment.conditions
+            ),
+            rollout_threshold=rollout_threshold,
+        )
+
+    def match(self, context: EvaluationContext) -> bool:
+        for condition in self.conditions:
+            if not condition.match(context):
+                return False
+        return True
+
+    def in_rollout(self, context: EvaluationContext) -> bool:
+        if self.rollout_threshold == ROLLOUT_NONE:
+            return False
+        if self.rollout_threshold == ROLLOUT_ALL:
+            return True
+        return context.id % 100 <= self.rollout_threshold
+
+
+@dataclass(frozen=True)
+class CompiledFeature:
+    name: str
+    enabled: bool
+    segments: Sequence[CompiledSegment]
+
+    @classmethod
+    def compile(cls, feature: Feature) -> CompiledFeature:
+        return cls(
+            name=feature.name,
+            enabled=feature.enabled,
+            segments=tuple(CompiledSegment.compile(segment) for segment in feature.segments),
+        )
+
+    def match(self, context: EvaluationContext) -> bool:
+        if not self.enabled:
+            return False
+
+        for segment in self.segments:
+            if segment.match(context):
+                return segment.in_rollout(context)
+
+        return False
+
+
+__all__ = ["CompiledFeature", "CompiledSegment", "CompiledCondition"]
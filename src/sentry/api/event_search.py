@@ -5,7 +5,7 @@ from collections import namedtuple
 from collections.abc import Mapping, Sequence
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from functools import reduce
+from functools import lru_cache, reduce
 from typing import Any, Literal, NamedTuple, Union
 
 from django.utils.functional import cached_property
@@ -1231,6 +1231,31 @@ default_config = SearchConfig(
 QueryOp = Literal["AND", "OR"]
 QueryToken = Union[SearchFilter, QueryOp, ParenExpression]
 
+# The number of parse trees kept by `_parse_query_tree`. Queries longer than
+# `MAX_CACHED_QUERY_LENGTH` are parsed without caching their tree.
+PARSE_CACHE_SIZE = 1000
+MAX_CACHED_QUERY_LENGTH = 1000
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_query_tree_cached(query: str) -> Node:
+    return event_search_grammar.parse(query)
+
+
+def _parse_query_tree(query: str) -> Node:
+    """
+    Parses a query with the search grammar. Parsing is the most expensive part
+    of `parse_search_query`, and the same dashboard, alert and saved search
+    queries are parsed over and over again, so recent trees are cached. Trees
+    do not depend on the search config and are never modified by the visitor,
+    which makes them safe to share. The visited filters are not cached since
+    they depend on the config, params and builder, and on the current time for
+    relative dates.
+    """
+    if len(query) > MAX_CACHED_QUERY_LENGTH:
+        return event_search_grammar.parse(query)
+    return _parse_query_tree_cached(query)
+
 
 def parse_search_query(
     query, config=None, params=None, builder=None, config_overrides=None
@@ -1241,7 +1266,7 @@ def parse_search_query(
         config = default_config
 
     try:
-        tree = event_search_grammar.parse(query)
+        tree = _parse_query_tree(query)
     except IncompleteParseError as e:
         idx = e.column()
         prefix = query[max(0, idx - 5) : idx]
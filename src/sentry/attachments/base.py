@@ -1,4 +1,7 @@
+import io
 import zlib
+from collections.abc import Iterator
+from typing import IO
 
 import sentry_sdk
 import zstandard
@@ -67,6 +70,25 @@ class CachedAttachment:
         assert self._data is not UNINITIALIZED_DATA
         return self._data
 
+    def has_data(self) -> bool:
+        """
+        Checks that all chunks of the attachment are still in the cache without
+        loading them.
+        """
+        if self._data is UNINITIALIZED_DATA and self._cache is not None:
+            return self._cache.has_data(self)
+        return True
+
+    def open(self) -> IO[bytes]:
+        """
+        Returns a file-like object with the attachment's data. Unless the data
+        has already been loaded, chunks are read from the cache and
+        decompressed one at a time while the file is read.
+        """
+        if self._data is UNINITIALIZED_DATA and self._cache is not None:
+            return AttachmentReader(self._cache, self)
+        return io.BytesIO(self.data or b"")
+
     def delete(self):
         for key in self.chunk_keys:
             self._cache.inner.delete(key)
@@ -161,20 +183,25 @@ class BaseAttachmentCache:
             attachment.setdefault("key", key)
             yield CachedAttachment(cache=self, **attachment)
 
+    def has_data(self, attachment) -> bool:
+        return all(self.inner.exists(key) for key in attachment.chunk_keys)
+
     def get_data(self, attachment) -> bytes:
-        data = bytearray()
+        return b"".join(self.iter_data(attachment))
 
+    def iter_data(self, attachment) -> Iterator[bytes]:
+        """
+        Yields the decompressed chunks of an attachment, fetching each chunk
+        from the cache only when the previous one has been consumed.
+        """
         for key in attachment.chunk_keys:
             raw_data = self.inner.get(key, raw=True)
             if raw_data is None:
                 raise MissingAttachmentChunks()
             if raw_data.startswith(b"\x28\xb5\x2f\xfd"):
-                decompressed = zstandard.decompress(raw_data)
+                yield zstandard.decompress(raw_data)
             else:
-                decompressed = zlib.decompress(raw_data)
-            data.extend(decompressed)
-
-        return bytes(data)
+                yield zlib.decompress(raw_data)
 
     @sentry_sdk.tracing.trace
     def delete(self, key):
@@ -184,5 +211,82 @@ class BaseAttachmentCache:
         self.inner.delete(ATTACHMENT_META_KEY.format(key=key))
 
 
+class AttachmentReader(io.RawIOBase):
+    """
+    A read-only file-like object over the data of a cached attachment, which
+    holds at most one decompressed chunk in memory.
+
+    The reader can be rewound to the start, which reads all chunks from the
+    cache again, but does not support seeking to other positions.
+    """
+
+    def __init__(self, cache: BaseAttachmentCache, attachment: CachedAttachment) -> None:
+        self._cache = cache
+        self._attachment = attachment
+        self._chunks = cache.iter_data(attachment)
+        self._chunk = b""
+        self._offset = 0
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR and offset == 0:
+            return self._position
+        if whence != io.SEEK_SET or offset != 0:
+            raise io.UnsupportedOperation("attachments can only be rewound to the start")
+
+        self._chunks = self._cache.iter_data(self._attachment)
+        self._chunk = b""
+        self._offset = 0
+        self._position = 0
+        return 0
+
+    def _fill(self) -> bool:
+        while self._offset >= len(self._chunk):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return False
+            self._chunk = chunk
+            self._offset = 0
+        return True
+
+    def read(self, size: int | None = -1) -> bytes:
+        if size is None or size < 0:
+            return self.readall()
+
+        if not size or not self._fill():
+            return b""
+
+        data = self._chunk[self._offset : self._offset + size]
+        self._offset += len(data)
+        self._position += len(data)
+        return data
+
+    def readall(self) -> bytes:
+        parts = []
+        if self._fill():
+            parts.append(self._chunk[self._offset :])
+        parts.extend(self._chunks)
+        self._chunk = b""
+        self._offset = 0
+
+        data = b"".join(parts)
+        self._position += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
 def compress_chunk(chunk_data: bytes) -> bytes:
     return zstandard.compress(chunk_data)
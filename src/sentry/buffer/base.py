@@ -37,6 +37,7 @@ class Buffer(Service):
         "get_hash_length",
         "delete_hash",
         "delete_key",
+        "flush",
     )
 
     def get(
@@ -123,6 +124,13 @@ class Buffer(Service):
     def process_pending(self) -> None:
         return
 
+    def flush(self) -> None:
+        """
+        Pushes out any increments held in process memory. Only meaningful for
+        buffers that coalesce writes locally, see `CoalescingBuffer`.
+        """
+        return
+
     def process_batch(self) -> None:
         return
 
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from time import monotonic
+from typing import Any
+
+from sentry.buffer.base import Buffer
+from sentry.db import models
+from sentry.utils import metrics
+from sentry.utils.services import build_instance_from_options_of_type
+
+logger = logging.getLogger(__name__)
+
+CoalescingKey = tuple[type[models.Model], tuple[tuple[str, Any], ...], bool | None]
+
+
+@dataclass
+class PendingIncr:
+    filters: dict[str, models.Model | str | int]
+    columns: dict[str, int] = field(default_factory=dict)
+    extra: dict[str, Any] = field(default_factory=dict)
+    count: int = 0
+
+
+class CoalescingBuffer(Buffer):
+    """
+    Per-process write-coalescing front end for another buffer backend.
+
+    Increments for the same `(model, filters)` are merged in memory (counters are
+    summed, `extra` values are last write wins, just like in the Redis buffer) and
+    pushed to the wrapped backend once `flush_interval` seconds have passed or
+    `max_keys` distinct keys are pending, whichever comes first. Everything else is
+    passed straight through.
+
+    >>> SENTRY_BUFFER = "sentry.buffer.coalescing.CoalescingBuffer"
+    >>> SENTRY_BUFFER_OPTIONS = {
+    ...     "backend": {"path": "sentry.buffer.redis.RedisBuffer", "options": {}},
+    ...     "flush_interval": 0.5,
+    ...     "max_keys": 1000,
+    ... }
+
+    Pending increments are flushed at interpreter exit, and by worker processes of
+    arroyo and Celery before they exit (see `sentry.utils.process_buffers`).
+    Increments which could not be written are kept for the next flush. Pending
+    increments are lost if the process is killed.
+    """
+
+    def __init__(
+        self,
+        backend: Mapping[str, Any],
+        flush_interval: float = 0.5,
+        max_keys: int = 1000,
+        **options: object,
+    ) -> None:
+        self.backend = build_instance_from_options_of_type(Buffer, backend)
+        self.flush_interval = flush_interval
+        self.max_keys = max_keys
+        assert self.flush_interval > 0
+        assert self.max_keys > 0
+
+        self._lock = threading.Lock()
+        self._pending: dict[CoalescingKey, PendingIncr] = {}
+        self._last_flush = monotonic()
+        self._pid = os.getpid()
+        self._flusher: threading.Thread | None = None
+        self._stopped = threading.Event()
+
+        atexit.register(self.close)
+
+    def validate(self) -> None:
+        self.backend.validate()
+
+    def _make_key(
+        self,
+        model: type[models.Model],
+        filters: dict[str, models.Model | str | int],
+        signal_only: bool | None,
+    ) -> CoalescingKey:
+        return (model, tuple(sorted(filters.items())), signal_only)
+
+    def _check_pid(self) -> None:
+        # Pending increments (and the flusher thread) must not survive a fork,
+        # otherwise the parent and the child would both flush them.
+        pid = os.getpid()
+        if pid != self._pid:
+            self._pid = pid
+            self._lock = threading.Lock()
+            self._pending = {}
+            self._last_flush = monotonic()
+            self._flusher = None
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None:
+            return
+        self._flusher = threading.Thread(
+            target=self._run_flusher, name="buffer-coalescing-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                if monotonic() - self._last_flush >= self.flush_interval:
+                    self.flush()
+            except Exception:
+                logger.exception("buffer.coalescing.flush_failed")
+
+    def get(
+        self,
+        model: type[models.Model],
+        columns: list[str],
+        filters: dict[str, Any],
+    ) -> dict[str, int]:
+        result = self.backend.get(model, columns, filters)
+        with self._lock:
+            pending = self._pending.get(self._make_key(model, filters, None))
+            if pending is not None:
+                for col in columns:
+                    result[col] = result.get(col, 0) + pending.columns.get(col, 0)
+        return result
+
+    def incr(
+        self,
+        model: type[models.Model],
+        columns: dict[str, int],
+        filters: dict[str, models.Model | str | int],
+        extra: dict[str, Any] | None = None,
+        signal_only: bool | None = None,
+    ) -> None:
+        self._check_pid()
+        key = self._make_key(model, filters, signal_only)
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = PendingIncr(filters=filters)
+            for column, amount in columns.items():
+                pending.columns[column] = pending.columns.get(column, 0) + amount
+            if extra:
+                pending.extra.update(extra)
+            pending.count += 1
+
+            should_flush = (
+                len(self._pending) >= self.max_keys
+                or monotonic() - self._last_flush >= self.flush_interval
+            )
+
+        if should_flush:
+            self.flush()
+        else:
+            self._ensure_flusher()
+
+    def flush(self) -> None:
+        """
+        Pushes all pending increments to the wrapped backend.
+        """
+        self._check_pid()
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = monotonic()
+
+        if not pending:
+            return
+
+        items = list(pending.items())
+        calls = 0
+        for index, ((model, _, signal_only), item) in enumerate(items):
+            try:
+                self.backend.incr(
+                    model,
+                    item.columns,
+                    item.filters,
+                    extra=item.extra or None,
+                    signal_only=signal_only,
+                )
+            except Exception:
+                self._requeue(items[index:])
+                raise
+            calls += item.count
+
+        metrics.distribution("buffer.coalescing.keys", len(pending))
+        metrics.incr("buffer.coalescing.coalesced", amount=calls - len(pending))
+
+    def _requeue(self, items: list[tuple[CoalescingKey, PendingIncr]]) -> None:
+        # Increments that were not written are merged with the ones collected in
+        # the meantime, so that the next flush retries them.
+        with self._lock:
+            for key, item in items:
+                pending = self._pending.get(key)
+                if pending is not None:
+                    for column, amount in pending.columns.items():
+                        item.columns[column] = item.columns.get(column, 0) + amount
+                    item.extra.update(pending.extra)
+                    item.count += pending.count
+                self._pending[key] = item
+
+    def close(self) -> None:
+        self._stopped.set()
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("buffer.coalescing.close_failed")
+
+    def process_pending(self) -> None:
+        self.backend.process_pending()
+
+    def process_batch(self) -> None:
+        self.backend.process_batch()
+
+    def process(self, *args: Any, **kwargs: Any) -> None:  # type: ignore[override]
+        self.backend.process(*args, **kwargs)
+
+    def get_hash(
+        self, model: type[models.Model], field: dict[str, models.Model | str | int]
+    ) -> dict[str, str]:
+        return self.backend.get_hash(model, field)
+
+    def get_hash_length(
+        self, model: type[models.Model], field: dict[str, models.Model | str | int]
+    ) -> int:
+        return self.backend.get_hash_length(model, field)
+
+    def get_sorted_set(self, key: str, min: float, max: float) -> list[tuple[int, datetime]]:
+        return self.backend.get_sorted_set(key, min, max)
+
+    def push_to_sorted_set(self, key: str, value: list[int] | int) -> None:
+        self.backend.push_to_sorted_set(key, value)
+
+    def push_to_hash(
+        self,
+        model: type[models.Model],
+        filters: dict[str, models.Model | str | int],
+        field: str,
+        value: str,
+    ) -> None:
+        self.backend.push_to_hash(model, filters, field, value)
+
+    def push_to_hash_bulk(
+        self,
+        model: type[models.Model],
+        filters: dict[str, models.Model | str | int],
+        data: dict[str, str],
+    ) -> None:
+        self.backend.push_to_hash_bulk(model, filters, data)
+
+    def delete_hash(
+        self,
+        model: type[models.Model],
+        filters: dict[str, models.Model | str | int],
+        fields: list[str],
+    ) -> None:
+        self.backend.delete_hash(model, filters, fields)
+
+    def delete_key(self, key: str, min: float, max: float) -> None:
+        self.backend.delete_key(key, min, max)
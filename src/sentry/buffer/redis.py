@@ -3,18 +3,24 @@ from __future__ import annotations
 import logging
 import pickle
 import threading
-from collections.abc import Callable
+from collections import defaultdict
+from collections.abc import Callable, Iterator, Sequence
 from datetime import date, datetime, timezone
 from enum import Enum
 from time import time
-from typing import Any, TypeVar
+from typing import Any, NamedTuple, TypeVar
 
 import rb
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, router
+from django.db.models.fields import Field
+from django.db.models.signals import post_save
 from django.utils.encoding import force_bytes, force_str
 from rediscluster import RedisCluster
 
 from sentry.buffer.base import Buffer
 from sentry.db import models
+from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils import json, metrics
 from sentry.utils.hashlib import md5_text
@@ -120,16 +126,37 @@ class PendingBuffer:
         return rv
 
 
+class BufferedIncr(NamedTuple):
+    key: str
+    model: type[models.Model]
+    columns: dict[str, int]
+    filters: dict[str, Any]
+    extra: dict[str, Any]
+    signal_only: bool | None
+
+
 class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
 
-    def __init__(self, incr_batch_size: int = 2, **options: object):
+    def __init__(
+        self,
+        incr_batch_size: int = 2,
+        bulk_flush: bool = False,
+        bulk_flush_batch_size: int = 500,
+        **options: object,
+    ):
         self.is_redis_cluster, self.cluster, options = get_dynamic_cluster_from_options(
             "SENTRY_BUFFER_OPTIONS", options
         )
         self.incr_batch_size = incr_batch_size
         assert self.incr_batch_size > 0
+        # When enabled, pending keys are handed out in large batches and each
+        # batch is read with one pipeline per Redis host and written with a
+        # single set-based UPDATE per (model, columns) shape.
+        self.bulk_flush = bulk_flush
+        self.bulk_flush_batch_size = bulk_flush_batch_size
+        assert self.bulk_flush_batch_size > 0
 
     def validate(self) -> None:
         validate_dynamic_cluster(self.is_redis_cluster, self.cluster)
@@ -392,18 +419,36 @@ class RedisBuffer(Buffer):
             tags={"module": model.__module__, "model": model.__name__},
         )
 
+    def _record_pending_lag(self, entries: Sequence[tuple[T, float]]) -> list[T]:
+        """
+        Strips the scores off of a `zrange(..., withscores=True)` result of the
+        pending set, recording how long the oldest key has been waiting.
+        """
+        if entries:
+            metrics.distribution(
+                "buffer.pending-lag",
+                time() - min(score for _, score in entries),
+                unit="second",
+            )
+        return [key for key, _ in entries]
+
     def process_pending(self) -> None:
         client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
         lock_key = self._lock_key(client, self.pending_key, ex=60)
         if not lock_key:
             return
 
-        pending_buffer = PendingBuffer(self.incr_batch_size)
+        if self.bulk_flush:
+            pending_buffer = PendingBuffer(self.bulk_flush_batch_size)
+        else:
+            pending_buffer = PendingBuffer(self.incr_batch_size)
 
         try:
             keycount = 0
             if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
-                keys = self.cluster.zrange(self.pending_key, 0, -1)
+                keys = self.cluster.zrange(self.pending_key, 0, -1, withscores=self.bulk_flush)
+                if self.bulk_flush:
+                    keys = self._record_pending_lag(keys)
                 keycount += len(keys)
 
                 for key in keys:
@@ -417,12 +462,14 @@ class RedisBuffer(Buffer):
                 self.cluster.zrem(self.pending_key, *keys)
             elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
                 with self.cluster.all() as conn:
-                    results = conn.zrange(self.pending_key, 0, -1)
+                    results = conn.zrange(self.pending_key, 0, -1, withscores=self.bulk_flush)
 
                 with self.cluster.all() as conn:
                     for host_id, keysb in results.value.items():
                         if not keysb:
                             continue
+                        if self.bulk_flush:
+                            keysb = self._record_pending_lag(keysb)
                         keycount += len(keysb)
                         for keyb in keysb:
                             pending_buffer.append(keyb.decode("utf-8"))
@@ -454,8 +501,11 @@ class RedisBuffer(Buffer):
             batch_keys = [key]
 
         if batch_keys is not None:
-            for key in batch_keys:
-                self._process_single_incr(key)
+            if self.bulk_flush:
+                self._process_batch_incr(batch_keys)
+            else:
+                for key in batch_keys:
+                    self._process_single_incr(key)
 
     def _process(
         self,
@@ -467,6 +517,42 @@ class RedisBuffer(Buffer):
     ) -> Any:
         return super().process(model, columns, filters, extra, signal_only)
 
+    def _load_buffered_incr(self, key: str, values: dict[Any, Any]) -> BufferedIncr | None:
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_str(k): v for k, v in values.items()}
+
+        if not values:
+            metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+            logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            return None
+
+        model = import_string(force_str(values.pop("m")))
+
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return BufferedIncr(key, model, incr_values, filters, extra_values, signal_only)
+
     def _process_single_incr(self, key: str) -> None:
         client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
         lock_key = self._lock_key(client, key, ex=10)
@@ -482,39 +568,240 @@ class RedisBuffer(Buffer):
             pipe.delete(key)
             values = pipe.execute()[0]
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_str(k): v for k, v in values.items()}
-
-            if not values:
-                metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
-                logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            item = self._load_buffered_incr(key, values)
+            if item is None:
                 return
 
-            model = import_string(force_str(values.pop("m")))
-
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._process(model, incr_values, filters, extra_values, signal_only)
+            self._process(item.model, item.columns, item.filters, item.extra, item.signal_only)
         finally:
             client.delete(lock_key)
+
+    def _pipelines_by_host(self, keys: Sequence[str]) -> Iterator[tuple[Pipeline, list[str]]]:
+        """
+        Groups keys by the Redis host that owns them, yielding a non-transactional
+        pipeline for each host along with its keys.
+        """
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            # The cluster pipeline does its own per-node routing.
+            yield self.cluster.pipeline(transaction=False), list(keys)
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            host_router = self.cluster.get_router()
+            keys_by_host: dict[int, list[str]] = defaultdict(list)
+            for key in keys:
+                keys_by_host[host_router.get_host_for_key(key)].append(key)
+            for host_id, host_keys in keys_by_host.items():
+                yield self.cluster.get_local_client(host_id).pipeline(transaction=False), host_keys
+        else:
+            raise AssertionError("unreachable")
+
+    def _lock_keys(self, keys: Sequence[str], ex: int) -> list[str]:
+        """
+        Bulk version of `_lock_key`. Returns the subset of keys which were locked.
+        """
+        keys_by_lock_key = {self._make_lock_key(key): key for key in keys}
+        locked = []
+        for pipe, lock_keys in self._pipelines_by_host(list(keys_by_lock_key)):
+            for lock_key in lock_keys:
+                pipe.set(lock_key, "1", nx=True, ex=ex)
+            for lock_key, acquired in zip(lock_keys, pipe.execute()):
+                if acquired:
+                    locked.append(keys_by_lock_key[lock_key])
+        return locked
+
+    def _unlock_keys(self, keys: Sequence[str]) -> None:
+        for pipe, lock_keys in self._pipelines_by_host([self._make_lock_key(k) for k in keys]):
+            for lock_key in lock_keys:
+                pipe.delete(lock_key)
+            pipe.execute()
+
+    def _process_batch_incr(self, keys: Sequence[str]) -> None:
+        """
+        Bulk flush counterpart of `_process_single_incr`. Every buffered hash in
+        the batch is read (and cleared) with one pipelined round trip per Redis
+        host, and increments are applied with one set-based UPDATE per model and
+        column shape instead of one UPDATE per key.
+        """
+        locked = self._lock_keys(keys, ex=10)
+        if len(locked) < len(keys):
+            metrics.incr(
+                "buffer.revoked",
+                amount=len(keys) - len(locked),
+                tags={"reason": "locked"},
+                skip_internal=False,
+            )
+
+        try:
+            items = []
+            for pipe, host_keys in self._pipelines_by_host(locked):
+                for key in host_keys:
+                    pipe.hgetall(key)
+                    pipe.zrem(self.pending_key, key)
+                    pipe.delete(key)
+                results = pipe.execute()
+                for key, values in zip(host_keys, results[::3]):
+                    item = self._load_buffered_incr(key, values)
+                    if item is not None:
+                        items.append(item)
+
+            self._flush_buffered_incrs(items)
+        finally:
+            if locked:
+                self._unlock_keys(locked)
+
+    def _flush_buffered_incrs(self, items: Sequence[BufferedIncr]) -> None:
+        batches: dict[tuple[Any, ...], list[BufferedIncr]] = defaultdict(list)
+        fallback = []
+        for item in items:
+            if item.signal_only or not (item.columns or item.extra):
+                fallback.append(item)
+                continue
+            try:
+                for name in (*item.filters, *item.columns, *item.extra):
+                    _get_concrete_field(item.model, name)
+            except (AttributeError, FieldDoesNotExist):
+                fallback.append(item)
+                continue
+            shape = (
+                item.model,
+                tuple(sorted(item.filters)),
+                tuple(sorted(item.columns)),
+                tuple(sorted(item.extra)),
+            )
+            batches[shape].append(item)
+
+        for batch in batches.values():
+            with metrics.timer("buffer.bulk_flush.update", tags={"model": batch[0].model.__name__}):
+                fallback.extend(self._bulk_update(batch))
+
+        if fallback:
+            metrics.incr("buffer.bulk_flush.fallback", amount=len(fallback))
+        for item in fallback:
+            self._process(item.model, item.columns, item.filters, item.extra, item.signal_only)
+
+    def _bulk_update(self, items: Sequence[BufferedIncr]) -> list[BufferedIncr]:
+        """
+        Applies buffered increments which all share the same model, filter,
+        counter and extra columns with a single `UPDATE ... FROM (VALUES ...)`.
+
+        Mirrors `Buffer.process`: Group rows that no longer exist are skipped and
+        the remaining ones get a recalculated score and a `post_save` signal.
+        Returns the items of any other model that did not match an existing row,
+        so that they can go through `create_or_update`.
+        """
+        from sentry.models.group import Group
+
+        model = items[0].model
+        using = router.db_for_write(model)
+        connection = connections[using]
+        qn = connection.ops.quote_name
+
+        filter_names = sorted(items[0].filters)
+        incr_names = sorted(items[0].columns)
+        extra_names = sorted(items[0].extra)
+        fields = [
+            _get_concrete_field(model, name) for name in (*filter_names, *incr_names, *extra_names)
+        ]
+        filter_fields = fields[: len(filter_names)]
+        incr_fields = fields[len(filter_names) : len(filter_names) + len(incr_names)]
+        extra_fields = fields[len(filter_names) + len(incr_names) :]
+
+        rows = []
+        for item in items:
+            values = [
+                *(_coerce_model(item.filters[name]) for name in filter_names),
+                *(item.columns[name] for name in incr_names),
+                *(item.extra[name] for name in extra_names),
+            ]
+            rows.append(
+                [field.get_db_prep_save(value, connection) for field, value in zip(fields, values)]
+            )
+
+        # Always touch rows in the same order to avoid deadlocking with
+        # concurrent flushes of overlapping batches.
+        try:
+            order = sorted(range(len(rows)), key=lambda i: rows[i][: len(filter_names)])
+        except TypeError:
+            order = list(range(len(rows)))
+
+        placeholder = "({})".format(
+            ", ".join(
+                ["%s"] + [f"CAST(%s AS {field.cast_db_type(connection)})" for field in fields]
+            )
+        )
+        aliases = ["i"] + [f"c{n}" for n in range(len(fields))]
+        alias_for = dict(zip(fields, aliases[1:]))
+
+        assignments = [
+            f"{qn(field.column)} = t.{qn(field.column)} + v.{alias_for[field]}"
+            for field in incr_fields
+        ] + [f"{qn(field.column)} = v.{alias_for[field]}" for field in extra_fields]
+
+        # HACK(dcramer): See `Buffer.process`, this is the set-based equivalent of `ScoreClause`.
+        if model is Group and "times_seen" in incr_names and "last_seen" in extra_names:
+            times_seen = alias_for[_get_concrete_field(model, "times_seen")]
+            last_seen = alias_for[_get_concrete_field(model, "last_seen")]
+            assignments.append(
+                f"{qn('score')} = log(t.{qn('times_seen')} + v.{times_seen}) * 600"
+                f" + trunc(extract(epoch FROM v.{last_seen}))"
+            )
+
+        conditions = " AND ".join(
+            f"t.{qn(field.column)} = v.{alias_for[field]}" for field in filter_fields
+        )
+
+        sql = (
+            f"UPDATE {qn(model._meta.db_table)} AS t SET {', '.join(assignments)} "
+            f"FROM (VALUES {', '.join([placeholder] * len(rows))}) AS v ({', '.join(aliases)}) "
+            f"WHERE {conditions} RETURNING v.i"
+        )
+        params: list[Any] = []
+        for i in order:
+            params.append(i)
+            params.extend(rows[i])
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            matched = {row[0] for row in cursor.fetchall()}
+
+        metrics.distribution("buffer.bulk_flush.rows", len(matched), tags={"model": model.__name__})
+
+        if model is Group:
+            # XXX: Like `Buffer.process` this needs to fire `post_save` so that the
+            # group cache gets updated.
+            update_fields = [*incr_names, *extra_names]
+            if filter_names in (["id"], ["pk"]):
+                group_ids = [_coerce_model(items[i].filters[filter_names[0]]) for i in matched]
+                for group in Group.objects.filter(id__in=group_ids):
+                    post_save.send(
+                        sender=Group, instance=group, created=False, update_fields=update_fields
+                    )
+            missing = []
+        else:
+            missing = [item for i, item in enumerate(items) if i not in matched]
+
+        for i in matched:
+            item = items[i]
+            buffer_incr_complete.send_robust(
+                model=model,
+                columns=item.columns,
+                filters=item.filters,
+                extra=item.extra,
+                created=False,
+                sender=model,
+            )
+
+        return missing
+
+
+def _coerce_model(value: Any) -> Any:
+    if isinstance(value, models.Model):
+        return value.pk
+    return value
+
+
+def _get_concrete_field(model: type[models.Model], name: str) -> Field[Any, Any]:
+    meta = model._meta
+    field = meta.pk if name == "pk" else meta.get_field(name)
+    if not isinstance(field, Field) or not field.concrete or field.many_to_many:
+        raise FieldDoesNotExist(name)
+    return field
@@ -38,6 +38,9 @@ class BaseCache(local):
     def get(self, key, version=None, raw=False):
         raise NotImplementedError
 
+    def exists(self, key, version=None) -> bool:
+        return self.get(key, version=version, raw=True) is not None
+
     def _mark_transaction(self, op):
         """
         Mark transaction with a tag so we can identify system components that rely
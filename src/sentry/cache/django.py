@@ -16,3 +16,8 @@ class DjangoCache(BaseCache):
         result = cache.get(key, version=version or self.version)
         self._mark_transaction("get")
         return result
+
+    def exists(self, key, version=None) -> bool:
+        result = cache.has_key(key, version=version or self.version)
+        self._mark_transaction("get")
+        return result
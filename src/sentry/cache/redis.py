@@ -51,6 +51,14 @@ class CommonRedisCache(BaseCache):
 
         return result
 
+    def exists(self, key, version=None) -> bool:
+        key = self.make_key(key, version=version)
+        result = self._client(raw=False).exists(key)
+
+        self._mark_transaction("get")
+
+        return bool(result)
+
 
 class RbCache(CommonRedisCache):
     def __init__(self, **options: object) -> None:
@@ -83,6 +83,14 @@ def celery_prefork_freeze_gc(**kwargs: object) -> None:
     gc.freeze()
 
 
+@signals.worker_process_shutdown.connect
+def celery_flush_process_buffers(**kwargs: object) -> None:
+    # prefork children exit through `os._exit`, which skips `atexit` handlers.
+    from sentry.utils.process_buffers import flush_process_buffers
+
+    flush_process_buffers()
+
+
 class SentryTask(Task):
     Request = "sentry.celery:SentryRequest"
 
@@ -335,6 +335,7 @@ MIDDLEWARE: tuple[str, ...] = (
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "sentry.middleware.auth.AuthenticationMiddleware",
+    "sentry.middleware.features.feature_evaluation_cache_middleware",
     "sentry.middleware.integrations.IntegrationControlMiddleware",
     "sentry.hybridcloud.apigateway.middleware.ApiGatewayMiddleware",
     "sentry.middleware.customer_domain.CustomerDomainMiddleware",
@@ -1697,6 +1698,10 @@ SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS: dict[str, Any] = {}
+# Directory holding zstd dictionaries for nodestore compression, as written by
+# `sentry nodestore train-dictionaries`. Dictionaries must never be removed
+# while nodes compressed with them are still around.
+SENTRY_NODESTORE_DICTIONARY_DIR: str | None = None
 
 # Node storage backend used for ArtifactBundle indexing (aka FlatFileIndex aka BundleIndex)
 SENTRY_INDEXSTORE = "sentry.nodestore.django.DjangoNodeStorage"
@@ -2111,6 +2116,10 @@ SENTRY_OPTIONS: dict[str, Any] = {}
 SENTRY_DEFAULT_OPTIONS: dict[str, Any] = {}
 # Raise an error in dev on failed lookups
 SENTRY_OPTIONS_COMPLAIN_ON_ERRORS = True
+# Serve stored options from a snapshot of all of them, which is refreshed by a
+# background thread that checks the snapshot version every this many seconds.
+# When disabled (None), options are fetched individually and cached locally.
+SENTRY_OPTIONS_SNAPSHOT_INTERVAL: float | None = None
 
 # You should not change this setting after your database has been created
 # unless you have altered all schemas first
@@ -61,6 +61,19 @@ def multiprocessing_options(
     ]
 
 
+def process_spans_options() -> list[click.Option]:
+    """Return a list of process-spans options."""
+    return [
+        *multiprocessing_options(default_max_batch_size=100),
+        click.Option(
+            ["--mode", "mode"],
+            type=click.Choice(["batched-parallel", "parallel"]),
+            default="parallel",
+            help="The mode to process spans in. Parallel only deserializes spans in the multiprocessing pool, batched-parallel also groups batches of spans by segment there.",
+        ),
+    ]
+
+
 def issue_occurrence_options() -> list[click.Option]:
     """Return a list of issue-occurrence options."""
     return [
@@ -390,7 +403,7 @@ KAFKA_CONSUMERS: Mapping[str, ConsumerDefinition] = {
     "process-spans": {
         "topic": Topic.SNUBA_SPANS,
         "strategy_factory": "sentry.spans.consumers.process.factory.ProcessSpansStrategyFactory",
-        "click_options": multiprocessing_options(default_max_batch_size=100),
+        "click_options": process_spans_options(),
     },
     "detect-performance-issues": {
         "topic": Topic.BUFFERED_SEGMENTS,
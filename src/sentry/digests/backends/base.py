@@ -66,7 +66,16 @@ class Backend(Service):
     be transitioned to "waiting" instead.)
     """
 
-    __all__ = ("add", "delete", "digest", "enabled", "maintenance", "schedule", "validate")
+    __all__ = (
+        "add",
+        "delete",
+        "digest",
+        "digest_many",
+        "enabled",
+        "maintenance",
+        "schedule",
+        "validate",
+    )
 
     def __init__(self, **options: Any) -> None:
         # The ``minimum_delay`` option defines the default minimum amount of
@@ -176,6 +185,34 @@ class Backend(Service):
         """
         raise NotImplementedError
 
+    def digest_many(self, minimum_delays: Mapping[str, int | None]) -> Any:
+        """
+        Extract records from many timelines for processing at once.
+
+        This method acts as a context manager, like ``digest``, for all the
+        timelines that are keys of ``minimum_delays`` (the values are the
+        minimum delays of each, or ``None`` for the default.) The target of the
+        ``as`` clause is a dictionary mapping the key of every timeline that
+        could be digested to its records. Timelines that are not in the
+        "ready" state, or are currently being digested elsewhere, are left out.
+
+        If the context manager successfully exits, the timelines that are
+        still part of the dictionary are closed as with ``digest``. Timelines
+        that have been removed from the dictionary, or all timelines if an
+        exception is raised, are left unchanged to be retried later.
+
+        For example::
+
+            with timelines.digest_many({'project:1': None, 'project:2': 60}) as digests:
+                for key, records in list(digests.items()):
+                    try:
+                        messages.append(build_digest_email(records))
+                    except Exception:
+                        del digests[key]
+
+        """
+        raise NotImplementedError
+
     def schedule(self, deadline: float, timestamp: float | None = None) -> Iterable[ScheduleEntry]:
         """
         Identify timelines that are ready for processing.
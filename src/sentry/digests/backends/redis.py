@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import logging
 import time
-from collections.abc import Generator, Iterable
+from collections import defaultdict
+from collections.abc import Generator, Iterable, Mapping
 from contextlib import contextmanager
 from typing import Any
+from uuid import uuid4
 
 from rb.clients import LocalClient
 from redis.exceptions import ResponseError
@@ -21,6 +23,9 @@ logger = logging.getLogger("sentry.digests")
 
 script = load_redis_script("digests/digests.lua")
 
+# How long (in seconds) timelines stay locked while a batch of digests is open.
+DIGEST_MANY_LOCK_DURATION = 60
+
 
 class RedisBackend(Backend):
     """
@@ -75,7 +80,8 @@ class RedisBackend(Backend):
     def __init__(self, **options: Any) -> None:
         cluster, options = get_cluster_from_options("SENTRY_DIGESTS_OPTIONS", options)
         self.cluster = cluster
-        self.locks = LockManager(RedisLockBackend(self.cluster))
+        self.lock_backend = RedisLockBackend(self.cluster)
+        self.locks = LockManager(self.lock_backend)
 
         self.namespace = options.pop("namespace", "d")
 
@@ -219,29 +225,8 @@ class RedisBackend(Backend):
                 else:
                     raise
 
-            records = [
-                Record(
-                    key.decode(),
-                    self.codec.decode(value) if value is not None else None,
-                    float(timestamp),
-                )
-                for key, value, timestamp in response
-            ]
-
-            # If the record value is `None`, this means the record data was
-            # missing (it was presumably evicted by Redis) so we don't need to
-            # return it here.
-            filtered_records = [record for record in records if record.value is not None]
-            if len(records) != len(filtered_records):
-                logger.warning(
-                    "Filtered out missing records when fetching digest",
-                    extra={
-                        "key": key,
-                        "record_count": len(records),
-                        "filtered_record_count": len(filtered_records),
-                    },
-                )
-            yield filtered_records
+            records = self._decode_records(response)
+            yield self._filter_records(key, records)
 
             script(
                 [key],
@@ -250,6 +235,105 @@ class RedisBackend(Backend):
                 connection,
             )
 
+    def _decode_records(
+        self, response: Iterable[tuple[bytes, bytes | None, bytes]]
+    ) -> list[Record]:
+        return [
+            Record(
+                key.decode(),
+                self.codec.decode(value) if value is not None else None,
+                float(timestamp),
+            )
+            for key, value, timestamp in response
+        ]
+
+    def _filter_records(self, key: str, records: list[Record]) -> list[Record]:
+        # If the record value is `None`, this means the record data was
+        # missing (it was presumably evicted by Redis) so we don't need to
+        # return it here.
+        filtered_records = [record for record in records if record.value is not None]
+        if len(records) != len(filtered_records):
+            logger.warning(
+                "Filtered out missing records when fetching digest",
+                extra={
+                    "key": key,
+                    "record_count": len(records),
+                    "filtered_record_count": len(filtered_records),
+                },
+            )
+        return filtered_records
+
+    @contextmanager
+    def digest_many(
+        self, minimum_delays: Mapping[str, int | None], timestamp: float | None = None
+    ) -> Generator[dict[str, list[Record]]]:
+        if timestamp is None:
+            timestamp = time.time()
+
+        router = self.cluster.get_router()
+        keys_by_host: dict[int, list[str]] = defaultdict(list)
+        for key in minimum_delays:
+            keys_by_host[router.get_host_for_key(f"{self.namespace}:t:{key}")].append(key)
+
+        lock_arguments = [self.lock_backend.prefix, uuid4().hex, DIGEST_MANY_LOCK_DURATION]
+        configuration = [self.namespace, self.ttl, timestamp]
+
+        digests: dict[str, list[Record]] = {}
+        opened: dict[int, dict[str, list[Record]]] = defaultdict(dict)
+        for host, keys in keys_by_host.items():
+            response = script(
+                ["-"],
+                [
+                    "DIGEST_OPEN_MANY",
+                    *configuration,
+                    *lock_arguments,
+                    self.capacity if self.capacity else -1,
+                    *keys,
+                ],
+                self.cluster.get_local_client(host),
+            )
+            for raw_key, status, response_records in response:
+                key = raw_key.decode("utf-8")
+                if status == b"ok":
+                    records = self._decode_records(response_records)
+                    opened[host][key] = records
+                    digests[key] = self._filter_records(key, records)
+                else:
+                    logger.info(
+                        "Skipped digest of timeline",
+                        extra={"key": key, "status": status.decode("utf-8")},
+                    )
+
+        succeeded = False
+        try:
+            yield digests
+            succeeded = True
+        finally:
+            for host, host_records in opened.items():
+                arguments: list[Any] = ["DIGEST_CLOSE_MANY", *configuration, *lock_arguments]
+                for key, records in host_records.items():
+                    minimum_delay = minimum_delays[key]
+                    arguments.extend(
+                        [
+                            key,
+                            1 if succeeded and key in digests else 0,
+                            self.minimum_delay if minimum_delay is None else minimum_delay,
+                            len(records),
+                        ]
+                    )
+                    arguments.extend(record.key for record in records)
+
+                try:
+                    script(["-"], arguments, self.cluster.get_local_client(host))
+                except Exception as error:
+                    if succeeded:
+                        raise
+                    logger.exception(
+                        "Failed to release digests on partition %s due to error: %s",
+                        host,
+                        error,
+                    )
+
     def delete(self, key: str, timestamp: float | None = None) -> None:
         if timestamp is None:
             timestamp = time.time()
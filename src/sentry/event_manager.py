@@ -62,6 +62,7 @@ from sentry.grouping.ingest.hashing import (
     find_existing_grouphash,
     find_existing_grouphash_new,
     get_hash_values,
+    get_or_create_grouphashes,
     maybe_run_background_grouping,
     maybe_run_secondary_grouping,
     run_primary_grouping,
@@ -121,6 +122,7 @@ from sentry.signals import (
 from sentry.tasks.process_buffer import buffer_incr
 from sentry.tasks.relay import schedule_invalidate_project_config
 from sentry.tsdb.base import TSDBModel
+from sentry.tsdb.batch import batched_writes
 from sentry.types.activity import ActivityType
 from sentry.types.group import GroupSubStatus, PriorityLevel
 from sentry.usage_accountant import record
@@ -1088,60 +1090,63 @@ def _get_or_create_group_release(
 
 def _tsdb_record_all_metrics(jobs: Sequence[Job]) -> None:
     """
-    Do all tsdb-related things for save_event in here s.t. we can potentially
-    put everything in a single redis pipeline someday.
+    Do all tsdb-related things for save_event in here s.t. the writes of all
+    jobs are coalesced into a few pipelines. If called within a
+    `batched_writes` block, they are only written out at the end of it.
     """
 
     # XXX: validate whether anybody actually uses those metrics
 
-    for job in jobs:
-        incrs = []
-        frequencies = []
-        records = []
-        incrs.append((TSDBModel.project, job["project_id"]))
-        event = job["event"]
-        release = job["release"]
-        environment = job["environment"]
-        user = job["user"]
+    with batched_writes(tsdb.backend) as batch:
+        for job in jobs:
+            event = job["event"]
+            release = job["release"]
+            environment = job["environment"]
+            user = job["user"]
+            timestamp = event.datetime
 
-        for group_info in job["groups"]:
-            incrs.append((TSDBModel.group, group_info.group.id))
-            frequencies.append(
-                (
-                    TSDBModel.frequent_environments_by_group,
-                    {group_info.group.id: {environment.id: 1}},
-                )
+            batch.incr(
+                TSDBModel.project, job["project_id"], timestamp, environment_id=environment.id
             )
 
-            if group_info.group_release:
-                frequencies.append(
-                    (
-                        TSDBModel.frequent_releases_by_group,
-                        {group_info.group.id: {group_info.group_release.id: 1}},
-                    )
+            for group_info in job["groups"]:
+                batch.incr(
+                    TSDBModel.group, group_info.group.id, timestamp, environment_id=environment.id
                 )
-            if user:
-                records.append(
-                    (TSDBModel.users_affected_by_group, group_info.group.id, (user.tag_value,))
+                batch.record_frequency(
+                    TSDBModel.frequent_environments_by_group,
+                    group_info.group.id,
+                    {environment.id: 1},
+                    timestamp,
                 )
 
-        if release:
-            incrs.append((TSDBModel.release, release.id))
-
-        if user:
-            project_id = job["project_id"]
-            records.append((TSDBModel.users_affected_by_project, project_id, (user.tag_value,)))
-
-        if incrs:
-            tsdb.backend.incr_multi(incrs, timestamp=event.datetime, environment_id=environment.id)
+                if group_info.group_release:
+                    batch.record_frequency(
+                        TSDBModel.frequent_releases_by_group,
+                        group_info.group.id,
+                        {group_info.group_release.id: 1},
+                        timestamp,
+                    )
+                if user:
+                    batch.record(
+                        TSDBModel.users_affected_by_group,
+                        group_info.group.id,
+                        (user.tag_value,),
+                        timestamp,
+                        environment_id=environment.id,
+                    )
 
-        if records:
-            tsdb.backend.record_multi(
-                records, timestamp=event.datetime, environment_id=environment.id
-            )
+            if release:
+                batch.incr(TSDBModel.release, release.id, timestamp, environment_id=environment.id)
 
-        if frequencies:
-            tsdb.backend.record_frequency_multi(frequencies, timestamp=event.datetime)
+            if user:
+                batch.record(
+                    TSDBModel.users_affected_by_project,
+                    job["project_id"],
+                    (user.tag_value,),
+                    timestamp,
+                    environment_id=environment.id,
+                )
 
 
 def _nodestore_save_many(jobs: Sequence[Job], app_feature: str) -> None:
@@ -1420,9 +1425,7 @@ def _save_aggregate(
         and not primary_hashes.hierarchical_hashes
     )
 
-    flat_grouphashes = [
-        GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
-    ]
+    flat_grouphashes = get_or_create_grouphashes(project, hashes.hashes)
 
     # The root_hierarchical_hash is the least specific hash within the tree, so
     # typically hierarchical_hashes[0], unless a hash `n` has been split in
@@ -1788,10 +1791,7 @@ def get_hashes_and_grouphashes(
     grouping_config, hashes = hash_calculation_function(project, job, metric_tags)
 
     if extract_hashes(hashes):
-        grouphashes = [
-            GroupHash.objects.get_or_create(project=project, hash=hash)[0]
-            for hash in extract_hashes(hashes)
-        ]
+        grouphashes = get_or_create_grouphashes(project, extract_hashes(hashes))
 
         existing_grouphash = find_existing_grouphash_new(grouphashes)
 
@@ -2817,22 +2817,12 @@ def save_attachment(
     else:
         timestamp = datetime.now(timezone.utc)
 
-    try:
-        attachment.data
-    except MissingAttachmentChunks:
-        track_outcome(
-            org_id=project.organization_id,
-            project_id=project.id,
-            key_id=key_id,
-            outcome=Outcome.INVALID,
-            reason="missing_chunks",
-            timestamp=timestamp,
-            event_id=event_id,
-            category=DataCategory.ATTACHMENT,
-        )
-
-        logger.exception("Missing chunks for cache_key=%s", cache_key)
+    # The data is streamed from the cache when the attachment is stored. Only check
+    # that its chunks exist here, so that missing attachments are not rate limited.
+    if not attachment.has_data():
+        _track_missing_attachment_chunks(cache_key, project, event_id, key_id, timestamp)
         return
+
     from sentry import ratelimits as ratelimiter
 
     is_limited, num_requests, reset_time = ratelimiter.backend.is_limited_with_value(
@@ -2867,7 +2857,12 @@ def save_attachment(
         )
         return
 
-    file = EventAttachment.putfile(project.id, attachment)
+    try:
+        file = EventAttachment.putfile(project.id, attachment)
+    except MissingAttachmentChunks:
+        # The chunks expired since they were checked.
+        _track_missing_attachment_chunks(cache_key, project, event_id, key_id, timestamp)
+        return
 
     EventAttachment.objects.create(
         # lookup:
@@ -2898,6 +2893,27 @@ def save_attachment(
     )
 
 
+def _track_missing_attachment_chunks(
+    cache_key: str | None,
+    project: Project,
+    event_id: str,
+    key_id: int | None,
+    timestamp: datetime,
+) -> None:
+    track_outcome(
+        org_id=project.organization_id,
+        project_id=project.id,
+        key_id=key_id,
+        outcome=Outcome.INVALID,
+        reason="missing_chunks",
+        timestamp=timestamp,
+        event_id=event_id,
+        category=DataCategory.ATTACHMENT,
+    )
+
+    logger.error("Missing chunks for cache_key=%s", cache_key)
+
+
 def save_attachments(cache_key: str | None, attachments: list[Attachment], job: Job) -> None:
     """
     Persists cached event attachments into the file store.
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import contextlib
+from collections import Counter
+from collections.abc import Callable, Generator, Hashable
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from sentry import options
+from sentry.utils import metrics
+
+from .base import Feature, OrganizationFeature, ProjectFeature, SystemFeature, UserFeature
+
+if TYPE_CHECKING:
+    from flagpole import EvaluationContext
+
+__all__ = ["FeatureEvaluationCache", "feature_evaluation_cache", "get_feature_evaluation_cache"]
+
+_current_cache: ContextVar[FeatureEvaluationCache | None] = ContextVar(
+    "feature_evaluation_cache", default=None
+)
+
+
+def get_objects_key(*objs: Any) -> tuple[Hashable, ...] | None:
+    """
+    Returns a cache key identifying the given subjects and actor, or `None`
+    if one of them has no id (like unsaved models).
+    """
+    key: list[Hashable] = []
+    for obj in objs:
+        if obj is None:
+            key.append(None)
+            continue
+        object_id = getattr(obj, "id", None)
+        if object_id is None:
+            return None
+        key.append((type(obj).__name__, object_id))
+    return tuple(key)
+
+
+class FeatureEvaluationCache:
+    """
+    Memoizes feature checks within a scope, such as an API request or the
+    post processing of an event. The same feature is often checked dozens of
+    times for the same organization or project in such a scope.
+
+    Results are cached per feature, subject and actor, and flagpole evaluation
+    contexts per subject and actor. Changes to subjects made within the scope
+    (e.g. to organization flags) are not reflected in cached results, so scopes
+    should not outlive a single unit of work.
+    """
+
+    def __init__(self) -> None:
+        self._results: dict[Hashable, bool] = {}
+        self._contexts: dict[Hashable, EvaluationContext] = {}
+        self._evaluations: Counter[str] = Counter()
+        self._hits: Counter[str] = Counter()
+
+    @staticmethod
+    def get_key(feature: Feature, actor: Any, skip_entity: bool | None) -> Hashable | None:
+        """
+        Returns the cache key of a feature check, or `None` if the check
+        cannot be cached.
+        """
+        if isinstance(feature, OrganizationFeature):
+            subject = feature.organization
+        elif isinstance(feature, ProjectFeature):
+            subject = feature.project
+        elif isinstance(feature, UserFeature):
+            subject = feature.user
+        elif isinstance(feature, SystemFeature):
+            subject = None
+        else:
+            # Other features may depend on more than their subject.
+            return None
+
+        objects_key = get_objects_key(subject, actor)
+        if objects_key is None:
+            return None
+        return (feature.name, objects_key, bool(skip_entity))
+
+    def get(self, name: str, key: Hashable | None) -> bool | None:
+        self._evaluations[name] += 1
+        if key is None:
+            return None
+
+        rv = self._results.get(key)
+        if rv is not None:
+            self._hits[name] += 1
+        return rv
+
+    def set(self, key: Hashable, value: bool) -> None:
+        self._results[key] = value
+
+    def get_context(
+        self, key: Hashable, build: Callable[[], EvaluationContext]
+    ) -> EvaluationContext:
+        context = self._contexts.get(key)
+        if context is None:
+            context = self._contexts[key] = build()
+        return context
+
+    def flush_metrics(self) -> None:
+        for name, count in self._evaluations.items():
+            metrics.incr(
+                "features.evaluation_cache.evaluations", amount=count, tags={"feature": name}
+            )
+        for name, count in self._hits.items():
+            metrics.incr("features.evaluation_cache.hits", amount=count, tags={"feature": name})
+        self._evaluations.clear()
+        self._hits.clear()
+
+
+@contextlib.contextmanager
+def feature_evaluation_cache() -> Generator[FeatureEvaluationCache | None, None, None]:
+    """
+    Memoizes feature checks made within the block, if enabled with the
+    `features.evaluation-cache.enable` option. Nested blocks share the
+    outermost cache.
+    """
+    cache = _current_cache.get()
+    if cache is not None or not options.get("features.evaluation-cache.enable"):
+        yield cache
+        return
+
+    cache = FeatureEvaluationCache()
+    token = _current_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _current_cache.reset(token)
+        cache.flush_metrics()
+
+
+def get_feature_evaluation_cache() -> FeatureEvaluationCache | None:
+    return _current_cache.get()
@@ -2,7 +2,8 @@ from dataclasses import dataclass
 
 from django.contrib.auth.models import AnonymousUser
 
-from flagpole.evaluation_context import ContextBuilder, EvaluationContextDict
+from flagpole.evaluation_context import ContextBuilder, EvaluationContext, EvaluationContextDict
+from sentry.features.evaluation_cache import get_feature_evaluation_cache, get_objects_key
 from sentry.hybridcloud.services.organization_mapping.model import RpcOrganizationMapping
 from sentry.models.organization import Organization
 from sentry.models.project import Project
@@ -110,3 +111,20 @@ def get_sentry_flagpole_context_builder() -> ContextBuilder[SentryContextData]:
         .add_context_transformer(project_context_transformer, ["project_id"])
         .add_context_transformer(user_context_transformer)
     )
+
+
+def build_sentry_flagpole_context(data: SentryContextData) -> EvaluationContext:
+    """
+    Builds the flagpole evaluation context for the given subjects. Within a
+    feature evaluation cache scope, the context is only built once for every
+    organization, project and actor.
+    """
+    builder = get_sentry_flagpole_context_builder()
+    cache = get_feature_evaluation_cache()
+    if cache is None:
+        return builder.build(data)
+
+    key = get_objects_key(data.organization, data.project, data.actor)
+    if key is None:
+        return builder.build(data)
+    return cache.get_context(key, lambda: builder.build(data))
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Iterable
+from typing import Any
+
+from flagpole import Feature as FlagpoleFeature
+from flagpole import InvalidFeatureFlagConfiguration
+from flagpole.compiled import CompiledFeature
+from sentry import options
+from sentry.features.flagpole_context import SentryContextData, build_sentry_flagpole_context
+from sentry.utils import metrics
+
+from .manager import FLAGPOLE_OPTION_PREFIX
+
+logger = logging.getLogger(__name__)
+
+# feature name -> (option value it was compiled from, compiled feature)
+_compiled_features: dict[str, tuple[Any, CompiledFeature | None]] = {}
+_lock = threading.Lock()
+
+
+def get_flagpole_feature(name: str) -> CompiledFeature | None:
+    """
+    Returns the compiled flagpole definition of a feature, or `None` if the
+    feature has no (valid) definition.
+
+    Definitions are read from the feature's option on every call, but are only
+    parsed and compiled again when the option's value changes.
+    """
+    config = options.get(f"{FLAGPOLE_OPTION_PREFIX}.{name}")
+
+    cached = _compiled_features.get(name)
+    if cached is not None and (cached[0] is config or cached[0] == config):
+        return cached[1]
+
+    compiled = None
+    if config:
+        try:
+            with metrics.timer("features.flagpole.compile", tags={"feature": name}):
+                compiled = CompiledFeature.compile(
+                    FlagpoleFeature.from_feature_dictionary(name=name, config_dict=config)
+                )
+        except InvalidFeatureFlagConfiguration:
+            logger.exception("Invalid flagpole feature definition", extra={"feature": name})
+
+    with _lock:
+        _compiled_features[name] = (config, compiled)
+    return compiled
+
+
+def compile_flagpole_features(names: Iterable[str]) -> None:
+    """
+    Compiles the definitions of the given features ahead of their first check,
+    e.g. for all `FeatureManager.flagpole_features` when a process starts.
+    """
+    for name in names:
+        get_flagpole_feature(name)
+
+
+def has_flagpole_feature(name: str, data: SentryContextData) -> bool | None:
+    """
+    Evaluates the compiled flagpole definition of a feature for the given
+    organization, project and actor. Returns `None` if the feature has no
+    definition, so that callers can fall back to other handlers.
+    """
+    feature = get_flagpole_feature(name)
+    if feature is None:
+        return None
+    return feature.match(build_sentry_flagpole_context(data))
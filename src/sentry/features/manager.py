@@ -18,6 +18,7 @@ from sentry.utils import metrics
 from sentry.utils.types import Dict
 
 from .base import Feature, FeatureHandlerStrategy
+from .evaluation_cache import get_feature_evaluation_cache
 from .exceptions import FeatureNotRegistered
 
 if TYPE_CHECKING:
@@ -269,46 +270,122 @@ class FeatureManager(RegisteredFeatureManager):
                 actor = kwargs.pop("actor", None)
                 feature = self.get(name, *args, **kwargs)
 
-                # Check registered feature handlers
-                rv = self._get_handler(feature, actor)
-                if rv is not None:
-                    metrics.incr(
-                        "feature.has.result",
-                        tags={"feature": name, "result": rv},
-                        sample_rate=sample_rate,
-                    )
-                    return rv
-
-                if self._entity_handler and not skip_entity:
-                    rv = self._entity_handler.has(feature, actor)
+                # Check results memoized within the current scope
+                cache = get_feature_evaluation_cache()
+                cache_key = None
+                if cache is not None:
+                    cache_key = cache.get_key(feature, actor, skip_entity)
+                    rv = cache.get(name, cache_key)
                     if rv is not None:
-                        metrics.incr(
-                            "feature.has.result",
-                            tags={"feature": name, "result": rv},
-                            sample_rate=sample_rate,
-                        )
                         return rv
 
-                rv = settings.SENTRY_FEATURES.get(feature.name, False)
-                if rv is not None:
-                    metrics.incr(
-                        "feature.has.result",
-                        tags={"feature": name, "result": rv},
-                        sample_rate=sample_rate,
-                    )
-                    return rv
+                rv = self._has(feature, actor, skip_entity, sample_rate)
+                if cache is not None and cache_key is not None:
+                    cache.set(cache_key, rv)
+                return rv
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            return False
 
-                # Features are by default disabled if no plugin or default enables them
+    def _has(
+        self, feature: Feature, actor: User | None, skip_entity: bool | None, sample_rate: float
+    ) -> bool:
+        name = feature.name
+
+        # Check registered feature handlers
+        rv = self._get_handler(feature, actor)
+        if rv is not None:
+            metrics.incr(
+                "feature.has.result",
+                tags={"feature": name, "result": rv},
+                sample_rate=sample_rate,
+            )
+            return rv
+
+        if self._entity_handler and not skip_entity:
+            rv = self._entity_handler.has(feature, actor)
+            if rv is not None:
                 metrics.incr(
                     "feature.has.result",
-                    tags={"feature": name, "result": False},
+                    tags={"feature": name, "result": rv},
                     sample_rate=sample_rate,
                 )
+                return rv
 
-                return False
-        except Exception as e:
-            sentry_sdk.capture_exception(e)
-            return False
+        rv = settings.SENTRY_FEATURES.get(feature.name, False)
+        if rv is not None:
+            metrics.incr(
+                "feature.has.result",
+                tags={"feature": name, "result": rv},
+                sample_rate=sample_rate,
+            )
+            return rv
+
+        # Features are by default disabled if no plugin or default enables them
+        metrics.incr(
+            "feature.has.result",
+            tags={"feature": name, "result": False},
+            sample_rate=sample_rate,
+        )
+
+        return False
+
+    def prefetch(
+        self,
+        feature_names: Sequence[str],
+        organization: Organization,
+        projects: Sequence[Project] | None = None,
+        actor: User | RpcUser | AnonymousUser | None = None,
+    ) -> None:
+        """
+        Resolve a set of features for an organization and its projects in one
+        pass with the entity handler, and store the results in the current
+        feature evaluation cache, so that later calls to ``has`` do not need
+        to evaluate them again. Does nothing outside of a cache scope.
+
+        >>> with feature_evaluation_cache():
+        ...     FeatureManager.prefetch(['organizations:feature'], organization)
+        """
+        cache = get_feature_evaluation_cache()
+        if cache is None or self._entity_handler is None:
+            return
+
+        # Registered handlers take precedence over the entity handler in
+        # `has`, so features with handlers cannot be prefetched.
+        feature_names = [name for name in feature_names if not self._handler_registry[name]]
+        org_features = [name for name in feature_names if name.startswith("organizations:")]
+        project_features = [name for name in feature_names if name.startswith("projects:")]
+
+        subjects: dict[str, Organization | Project] = {}
+        if org_features:
+            subjects[f"organization:{organization.id}"] = organization
+        if projects and project_features:
+            for project in projects:
+                subjects[f"project:{project.id}"] = project
+        if not subjects:
+            return
+
+        results: dict[str, Mapping[str, bool | None]] = {}
+        if org_features:
+            results.update(self.batch_has(org_features, actor, organization=organization) or {})
+        if projects and project_features:
+            results.update(
+                self.batch_has(
+                    project_features, actor, projects=projects, organization=organization
+                )
+                or {}
+            )
+
+        for subject_key, subject_results in results.items():
+            subject = subjects.get(subject_key)
+            if subject is None:
+                continue
+            for name, rv in subject_results.items():
+                if rv is None:
+                    continue
+                cache_key = cache.get_key(self.get(name, subject), actor, False)
+                if cache_key is not None:
+                    cache.set(cache_key, rv)
 
     def batch_has(
         self,
@@ -154,6 +154,18 @@ class GroupingComponent:
         rv.values = list(self.values)
         return rv
 
+    def deep_copy(self) -> GroupingComponent:
+        """Creates a copy of the whole component tree."""
+        rv = object.__new__(self.__class__)
+        rv.__dict__.update(self.__dict__)
+        rv.values = [
+            value.deep_copy() if isinstance(value, GroupingComponent) else value
+            for value in self.values
+        ]
+        if self.tree_label is not None:
+            rv.tree_label = dict(self.tree_label)
+        return rv
+
     def iter_values(self) -> Generator[str | GroupingComponent]:
         """Recursively walks the component and flattens it into a list of
         values.
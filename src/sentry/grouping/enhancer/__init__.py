@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import base64
+import contextlib
 import logging
 import os
 import zlib
-from collections.abc import Sequence
+from collections.abc import Generator, Sequence
+from contextvars import ContextVar
 from typing import Any, Literal
 
 import msgpack
@@ -71,6 +73,73 @@ def parse_rust_enhancements(
 
 RustExceptionData = dict[str, bytes | None]
 
+MatchFrameCache = dict[tuple[Any, ...], dict[str, Any]]
+
+_match_frame_cache: ContextVar[MatchFrameCache | None] = ContextVar(
+    "enhancer_match_frame_cache", default=None
+)
+
+
+@contextlib.contextmanager
+def match_frame_cache() -> Generator[MatchFrameCache, None, None]:
+    """
+    Reuses match frames within the block, which should span the processing of a single event.
+
+    Match frames are built from the same frames again for every stacktrace pass (frame
+    modifications, then every grouping variant) and for every grouping config the event is
+    grouped with. Nested blocks share the outermost cache.
+    """
+    cache = _match_frame_cache.get()
+    if cache is not None:
+        yield cache
+        return
+
+    cache = {}
+    token = _match_frame_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _match_frame_cache.reset(token)
+
+
+def _match_frame_cache_key(frame: dict[str, Any], platform: str | None) -> tuple[Any, ...]:
+    # Everything `create_match_frame` reads. `in_app` and `category` are set by
+    # `apply_modifications_to_frame`, so the frames are looked up again afterwards.
+    return (
+        platform,
+        frame.get("platform"),
+        frame.get("function"),
+        frame.get("raw_function"),
+        frame.get("in_app"),
+        frame.get("module"),
+        frame.get("package"),
+        frame.get("abs_path"),
+        frame.get("filename"),
+        get_path(frame, "data", "category"),
+        get_path(frame, "data", "orig_in_app"),
+    )
+
+
+def create_match_frames(
+    frames: Sequence[dict[str, Any]], platform: str | None
+) -> list[dict[str, Any]]:
+    cache = _match_frame_cache.get()
+    if cache is None:
+        return [create_match_frame(frame, platform) for frame in frames]
+
+    rv = []
+    for frame in frames:
+        key = _match_frame_cache_key(frame, platform)
+        try:
+            match_frame = cache.get(key)
+        except TypeError:  # unhashable values in a malformed frame
+            rv.append(create_match_frame(frame, platform))
+            continue
+        if match_frame is None:
+            match_frame = cache[key] = create_match_frame(frame, platform)
+        rv.append(match_frame)
+    return rv
+
 
 def make_rust_exception_data(
     exception_data: dict[str, Any],
@@ -117,7 +186,7 @@ class Enhancements:
         """
         This applies the frame modifications to the frames itself. This does not affect grouping.
         """
-        match_frames = [create_match_frame(frame, platform) for frame in frames]
+        match_frames = create_match_frames(frames, platform)
 
         rust_enhanced_frames = self.rust_enhancements.apply_modifications_to_frames(
             match_frames, make_rust_exception_data(exception_data)
@@ -136,7 +205,7 @@ class Enhancements:
 
         This also handles cases where the entire stacktrace should be discarded.
         """
-        match_frames = [create_match_frame(frame, platform) for frame in frames]
+        match_frames = create_match_frames(frames, platform)
 
         rust_components = [
             RustComponent(
@@ -22,6 +22,7 @@ from sentry.grouping.api import (
     get_grouping_config_dict_for_project,
     load_grouping_config,
 )
+from sentry.grouping.enhancer import match_frame_cache
 from sentry.grouping.ingest.config import is_in_transition
 from sentry.grouping.ingest.metrics import record_hash_calculation_metrics
 from sentry.grouping.ingest.utils import extract_hashes
@@ -52,7 +53,10 @@ def _calculate_event_grouping(
         "sdk": normalized_sdk_tag_from_event(event.data),
     }
 
-    with metrics.timer("save_event._calculate_event_grouping", tags=metric_tags):
+    with (
+        metrics.timer("save_event._calculate_event_grouping", tags=metric_tags),
+        match_frame_cache(),
+    ):
         loaded_grouping_config = load_grouping_config(grouping_config)
 
         with metrics.timer("event_manager.normalize_stacktraces_for_grouping", tags=metric_tags):
@@ -198,6 +202,28 @@ def _calculate_primary_hash(
     return _calculate_event_grouping(project, job["event"], grouping_config)
 
 
+def get_or_create_grouphashes(project: Project, hashes: Sequence[str]) -> list[GroupHash]:
+    """
+    Returns the `GroupHash` for each of the given hashes, in the same order, creating the ones
+    which don't exist yet.
+
+    All existing grouphashes are fetched with a single query, so only hashes seen for the first
+    time cost additional round trips.
+    """
+    existing = {gh.hash: gh for gh in GroupHash.objects.filter(project=project, hash__in=hashes)}
+
+    grouphashes = []
+    for hash in hashes:
+        grouphash = existing.get(hash)
+        if grouphash is None:
+            grouphash = existing[hash] = GroupHash.objects.get_or_create(
+                project=project, hash=hash
+            )[0]
+        grouphashes.append(grouphash)
+
+    return grouphashes
+
+
 def find_existing_grouphash(
     project: Project,
     flat_grouphashes: Sequence[GroupHash],
@@ -304,16 +330,18 @@ def get_hash_values(
     job: Job,
     metric_tags: MutableTags,
 ) -> tuple[CalculatedHashes, CalculatedHashes | None, CalculatedHashes]:
-    # Background grouping is a way for us to get performance metrics for a new
-    # config without having it actually affect on how events are grouped. It runs
-    # either before or after the main grouping logic, depending on the option value.
-    maybe_run_background_grouping(project, job)
-
-    secondary_grouping_config, secondary_hashes = maybe_run_secondary_grouping(
-        project, job, metric_tags
-    )
-
-    primary_grouping_config, primary_hashes = run_primary_grouping(project, job, metric_tags)
+    # Match frames for the enhancer are shared between all configs the event is grouped with.
+    with match_frame_cache():
+        # Background grouping is a way for us to get performance metrics for a new
+        # config without having it actually affect on how events are grouped. It runs
+        # either before or after the main grouping logic, depending on the option value.
+        maybe_run_background_grouping(project, job)
+
+        secondary_grouping_config, secondary_hashes = maybe_run_secondary_grouping(
+            project, job, metric_tags
+        )
+
+        primary_grouping_config, primary_hashes = run_primary_grouping(project, job, metric_tags)
 
     record_hash_calculation_metrics(
         primary_grouping_config,
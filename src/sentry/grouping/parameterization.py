@@ -181,6 +181,23 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
 
 DEFAULT_PARAMETERIZATION_REGEXES_MAP = {r.name: r.pattern for r in DEFAULT_PARAMETERIZATION_REGEXES}
 
+# Each of the patterns above can only match if the content contains at least one of these: a
+# digit (numbers, dates, IPv4), `@` (email), `:` (url, IPv6), `=` (quoted_str, bool), a dot
+# between word characters (hostname), a run of 8 hex characters (uuid, sha1, md5) or the start of
+# the `datetime.datetime(` date, whose dot matches any character. Most messages without parameters
+# fail this test, which is a lot cheaper than running the combined regex over them. Keep this in
+# sync when adding patterns.
+PARAMETERIZATION_PREFILTER = re.compile(
+    r"""\d|[@:=]|[\w-]\.[a-zA-Z]|[0-9a-fA-F]{8}|datetime.datetime\("""
+)
+
+
+@lru_cache(maxsize=16)
+def _compile_parameterization_regex(pattern_keys: tuple[str, ...]) -> re.Pattern[str]:
+    return re.compile(
+        rf"(?x){'|'.join(DEFAULT_PARAMETERIZATION_REGEXES_MAP[k] for k in pattern_keys)}"
+    )
+
 
 @dataclasses.dataclass
 class ParameterizationCallable:
@@ -237,7 +254,10 @@ class _UniqueId:
     TOKEN_LENGTH_RATIO_LONG = 0.4
 
     @staticmethod
+    @lru_cache(maxsize=10_000)
     def is_probably_uniq_id(token_str: str) -> bool:
+        # Tokenizing with tiktoken is by far the most expensive part of this, and the same tokens
+        # show up again and again across messages, so the result is cached per token.
         token_str = token_str.strip("\"'[]{}():;")
         if len(token_str) < _UniqueId.TOKEN_LENGTH_MINIMUM:
             return False
@@ -299,9 +319,7 @@ class Parameterizer:
         so we can use newlines and indentation for better legibility in patterns above.
         """
 
-        return re.compile(
-            rf"(?x){'|'.join(DEFAULT_PARAMETERIZATION_REGEXES_MAP[k] for k in pattern_keys)}"
-        )
+        return _compile_parameterization_regex(tuple(pattern_keys))
 
     def parametrize_w_regex(self, content: str) -> str:
         """
@@ -324,6 +342,9 @@ class Parameterizer:
                     return f"<{key}>"
             return ""
 
+        if not PARAMETERIZATION_PREFILTER.search(content):
+            return content
+
         return self._parameterization_regex.sub(_handle_regex_match, content)
 
     def parametrize_w_experiments(
@@ -282,6 +282,7 @@ class StrategyConfiguration:
     base: type["StrategyConfiguration"] | None = None
     config_class = None
     strategies: dict[str, Strategy[Any]] = {}
+    strategy_order: tuple[Strategy[Any], ...] = ()
     delegates: dict[str, Strategy[Any]] = {}
     changelog: str | None = None
     hidden = False
@@ -302,7 +303,7 @@ class StrategyConfiguration:
 
     def iter_strategies(self) -> Iterator[Strategy[Any]]:
         """Iterates over all strategies by highest score to lowest."""
-        return iter(sorted(self.strategies.values(), key=lambda x: x.score and -x.score or 0))
+        return iter(self.strategy_order)
 
     @classmethod
     def as_dict(cls) -> dict[str, Any]:
@@ -385,6 +386,13 @@ def create_strategy_configuration(
         NewStrategyConfiguration.delegates[strategy.interface] = strategy
         new_delegates.add(strategy.interface)
 
+    NewStrategyConfiguration.strategy_order = tuple(
+        sorted(
+            NewStrategyConfiguration.strategies.values(),
+            key=lambda x: x.score and -x.score or 0,
+        )
+    )
+
     if initial_context:
         NewStrategyConfiguration.initial_context.update(initial_context)
 
@@ -3,9 +3,13 @@ from __future__ import annotations
 import itertools
 import logging
 import re
-from collections.abc import Generator
+import threading
+from collections.abc import Generator, Hashable
 from typing import Any
 
+from cachetools import LRUCache
+
+from sentry import options
 from sentry.eventstore.models import Event
 from sentry.grouping.component import GroupingComponent, calculate_tree_label
 from sentry.grouping.strategies.base import (
@@ -90,6 +94,13 @@ RECURSION_COMPARISON_FIELDS = [
 # TODO(markus)
 StacktraceEncoderReturnValue = Any
 
+FRAME_COMPONENT_CACHE_SIZE = 10_000
+
+_frame_component_cache: LRUCache[Hashable, GroupingComponent] = LRUCache(
+    maxsize=FRAME_COMPONENT_CACHE_SIZE
+)
+_frame_component_cache_lock = threading.Lock()
+
 
 def is_recursion_v1(frame1: Frame, frame2: Frame | None) -> bool:
     """
@@ -339,6 +350,54 @@ def frame(
     frame = interface
     platform = frame.platform or event.platform
 
+    if not options.get("grouping.frame-component-cache.enabled"):
+        return {context["variant"]: _get_frame_component(frame, platform, context)}
+
+    # The frame component only depends on the frame itself, the platform and
+    # the grouping context, so identical frames (which make up most of the
+    # stacktraces of a project, and are grouped again for every variant and
+    # config) can reuse a previously built component tree. Callers update
+    # the returned components in place, so we only ever hand out copies.
+    cache_key = _get_frame_cache_key(frame, platform, context)
+    with _frame_component_cache_lock:
+        cached = _frame_component_cache.get(cache_key)
+
+    if cached is None:
+        rv = _get_frame_component(frame, platform, context)
+        with _frame_component_cache_lock:
+            _frame_component_cache[cache_key] = rv.deep_copy()
+    else:
+        rv = cached.deep_copy()
+        if rv.tree_label and "datapath" in rv.tree_label:
+            rv.tree_label["datapath"] = frame.datapath
+
+    return {context["variant"]: rv}
+
+
+def _get_frame_cache_key(frame: Frame, platform: str | None, context: GroupingContext) -> Hashable:
+    # The static part of the context is defined by the config, the only
+    # values that change while grouping an event are the variant and the
+    # recursion flag. The datapath is patched into the tree label of cached
+    # components instead, as it would otherwise make every key unique.
+    return (
+        type(context.config),
+        context["variant"],
+        context["is_recursion"],
+        platform,
+        frame.abs_path,
+        frame.filename,
+        frame.module,
+        frame.function,
+        frame.raw_function,
+        frame.context_line,
+        frame.package,
+        bool(frame.data and frame.data.get("sourcemap") is not None),
+    )
+
+
+def _get_frame_component(
+    frame: Frame, platform: str | None, context: GroupingContext
+) -> GroupingComponent:
     # Safari throws [native code] frames in for calls like ``forEach``
     # whereas Chrome ignores these. Let's remove it from the hashing algo
     # so that they're more likely to group together
@@ -461,7 +520,7 @@ def frame(
             # show.
             rv.tree_label = None
 
-    return {context["variant"]: rv}
+    return rv
 
 
 def get_contextline_component(
@@ -16,7 +16,7 @@ from django.utils import timezone as django_timezone
 from snuba_sdk import Column, Condition, Limit, Op
 from urllib3.exceptions import MaxRetryError, TimeoutError
 
-from sentry import analytics, audit_log, features, quotas
+from sentry import analytics, audit_log, features, options, quotas
 from sentry.api.exceptions import ResourceDoesNotExist
 from sentry.auth.access import SystemAccess
 from sentry.constants import CRASH_RATE_ALERT_AGGREGATE_ALIAS, ObjectStatus
@@ -55,7 +55,10 @@ from sentry.integrations.services.integration.model import RpcOrganizationIntegr
 from sentry.models.notificationaction import ActionService, ActionTarget
 from sentry.models.project import Project
 from sentry.models.scheduledeletion import RegionScheduledDeletion
-from sentry.relay.config.metric_extraction import on_demand_metrics_feature_flags
+from sentry.relay.config.metric_extraction import (
+    cache_snuba_query_specs,
+    on_demand_metrics_feature_flags,
+)
 from sentry.search.events.builder.base import BaseQueryBuilder
 from sentry.search.events.fields import is_function, resolve_field
 from sentry.seer.anomaly_detection.store_data import send_historical_data_to_seer
@@ -1907,6 +1910,8 @@ def schedule_update_project_config(alert_rule: AlertRule, projects: Sequence[Pro
         prefilling,
     )
     if should_use_on_demand:
+        if options.get("on_demand_metrics.spec_cache.enable"):
+            cache_snuba_query_specs(projects[0], alert_snuba_query, prefilling)
         for project in projects:
             schedule_invalidate_project_config(
                 trigger="alerts:create-on-demand-metric", project_id=project.id
@@ -156,6 +156,11 @@ class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         return create_backpressure_step(health_checker=self.health_checker, next_step=step_1)
 
     def shutdown(self) -> None:
+        from sentry import buffer
+        from sentry.utils.outcomes import flush_outcomes
+
+        buffer.flush()
+        flush_outcomes()
         self._pool.close()
         if self._attachments_pool:
             self._attachments_pool.close()
@@ -5,7 +5,7 @@ from typing import Any
 
 import sentry_sdk
 
-from sentry import features
+from sentry import features, options
 from sentry.ingest.transaction_clusterer.base import ReplacementRule
 from sentry.models.project import Project
 from sentry.tasks.base import instrumented_task
@@ -14,7 +14,7 @@ from sentry.utils import metrics
 from . import ClustererNamespace, rules
 from .datasource import redis
 from .meta import track_clusterer_run
-from .tree import TreeClusterer
+from .tree import CompactTree, IncrementalTreeClusterer, TreeClusterer
 
 logger_transactions = logging.getLogger("sentry.ingest.transaction_clusterer.tasks")
 
@@ -39,6 +39,10 @@ PROJECTS_PER_TASK = 100
 #: this estimation for project batches instead.
 CLUSTERING_TIMEOUT_PER_PROJECT = 0.3
 
+#: Maximum number of nodes in a persisted clusterer tree. Larger trees are
+#: dropped, and the project starts over with an empty tree on the next run.
+MAX_TREE_NODES = 100_000
+
 
 @instrumented_task(
     name="sentry.ingest.transaction_clusterer.tasks.spawn_clusterers",
@@ -75,7 +79,11 @@ def cluster_projects(projects: Sequence[Project]) -> None:
                 span.set_data("project_id", project.id)
                 tx_names = list(redis.get_transaction_names(project))
                 new_rules = []
-                if len(tx_names) >= MERGE_THRESHOLD:
+                if options.get("txnames.clusterer.incremental"):
+                    new_rules = _cluster_incrementally(
+                        ClustererNamespace.TRANSACTIONS, project, tx_names
+                    )
+                elif len(tx_names) >= MERGE_THRESHOLD:
                     clusterer = TreeClusterer(merge_threshold=MERGE_THRESHOLD)
                     clusterer.add_input(tx_names)
                     new_rules = clusterer.get_rules()
@@ -122,6 +130,28 @@ def cluster_projects(projects: Sequence[Project]) -> None:
             )
 
 
+def _cluster_incrementally(
+    namespace: ClustererNamespace, project: Project, names: Sequence[str]
+) -> list[ReplacementRule]:
+    """Fold new names into the project's persisted tree and return the rules
+    that the new names contributed to."""
+    data = redis.get_tree(namespace, project)
+    tree = CompactTree.loads(data) if data else None
+    clusterer = IncrementalTreeClusterer(merge_threshold=MERGE_THRESHOLD, tree=tree)
+    clusterer.add_input(names)
+    new_rules = clusterer.get_rules()
+
+    num_nodes = len(clusterer.tree)
+    metrics.distribution("txcluster.tree_nodes", num_nodes)
+    if num_nodes > MAX_TREE_NODES:
+        metrics.incr("txcluster.tree_dropped")
+        redis.clear_tree(namespace, project)
+    else:
+        redis.store_tree(namespace, project, clusterer.tree.dumps())
+
+    return new_rules
+
+
 @instrumented_task(
     name="sentry.ingest.span_clusterer.tasks.spawn_span_cluster_projects",
     queue="transactions.name_clusterer",  # XXX(iker): we should use a different queue
@@ -45,17 +45,20 @@ The replacement rules are interpreted by Relay to match and replace `*`, and to
 
 """
 
+import heapq
 import logging
 from collections import UserDict, defaultdict
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from typing import TypeAlias, Union
 
 import sentry_sdk
 
+from sentry.utils import json
+
 from .base import Clusterer, ReplacementRule
 from .rule_validator import RuleValidator
 
-__all__ = ["TreeClusterer"]
+__all__ = ["CompactTree", "IncrementalTreeClusterer", "TreeClusterer"]
 
 
 class Merged:
@@ -163,3 +166,198 @@ class Node(UserDict):
         return Node(
             {name: cls._merge_nodes(children) for name, children in children_by_name.items()}
         )
+
+
+class CompactTree:
+    """A tree of transaction name segments stored in flat lists.
+
+    Nodes are indices into the lists, with the root at index ``0``. Removing
+    a subtree leaves holes that are only compacted when the tree is
+    serialized with :meth:`dumps`.
+    """
+
+    ROOT = 0
+    #: Parent of removed nodes
+    REMOVED = -2
+
+    def __init__(self) -> None:
+        self._parents: list[int] = [-1]
+        self._names: list[Edge] = [""]
+        self._depths: list[int] = [0]
+        self._children: list[dict[Edge, int]] = [{}]
+        self._num_removed = 0
+
+    def __len__(self) -> int:
+        return len(self._parents) - self._num_removed
+
+    def is_alive(self, node: int) -> bool:
+        return self._parents[node] != self.REMOVED
+
+    def get_depth(self, node: int) -> int:
+        return self._depths[node]
+
+    def get_child(self, node: int, name: Edge) -> int | None:
+        return self._children[node].get(name)
+
+    def get_children(self, node: int) -> Iterator[tuple[Edge, int]]:
+        return iter(list(self._children[node].items()))
+
+    def num_children(self, node: int) -> int:
+        return len(self._children[node])
+
+    def add_child(self, node: int, name: Edge) -> int:
+        child = len(self._parents)
+        self._parents.append(node)
+        self._names.append(name)
+        self._depths.append(self._depths[node] + 1)
+        self._children.append({})
+        self._children[node][name] = child
+        return child
+
+    def detach_children(self, node: int) -> list[int]:
+        """Unlinks all children of ``node`` without removing them."""
+        children = list(self._children[node].values())
+        self._children[node] = {}
+        return children
+
+    def remove(self, node: int) -> None:
+        """Removes ``node`` and its subtree. The node must have been detached."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            stack.extend(self._children[node].values())
+            self._parents[node] = self.REMOVED
+            self._children[node] = {}
+            self._num_removed += 1
+
+    def get_path(self, node: int) -> list[Edge]:
+        """The names of all edges from the root to ``node``."""
+        path = []
+        while node != self.ROOT:
+            path.append(self._names[node])
+            node = self._parents[node]
+        path.reverse()
+        return path
+
+    def dumps(self) -> str:
+        """Serializes the tree, in pre-order and without removed nodes."""
+        parents: list[int] = []
+        names: list[str | None] = []
+        stack = [(child, 0) for child in reversed(self._children[self.ROOT].values())]
+        while stack:
+            node, parent = stack.pop()
+            parents.append(parent)
+            name = self._names[node]
+            names.append(None if isinstance(name, Merged) else name)
+            index = len(parents)
+            stack.extend((child, index) for child in reversed(self._children[node].values()))
+
+        return json.dumps({"parents": parents, "names": names})
+
+    @classmethod
+    def loads(cls, data: str) -> "CompactTree":
+        payload = json.loads(data)
+        tree = cls()
+        for parent, name in zip(payload["parents"], payload["names"]):
+            tree.add_child(parent, MERGED if name is None else name)
+        return tree
+
+
+class IncrementalTreeClusterer(TreeClusterer):
+    """Tree clusterer that keeps its tree across runs.
+
+    Instead of building a new tree from a sample of transaction names on
+    every run, new names are folded into a persisted :class:`CompactTree`.
+    Only nodes that received new children are checked against the merge
+    threshold, and only rules of merged nodes that new names went through (or
+    that were merged in this run) are returned, so that the cost of a run
+    depends on the input rather than on the size of the tree.
+
+    Merges are final: names added after a node's children were merged are
+    added to the merged node directly.
+    """
+
+    def __init__(self, *, merge_threshold: int, tree: CompactTree | None = None) -> None:
+        super().__init__(merge_threshold=merge_threshold)
+        self.tree = tree if tree is not None else CompactTree()
+        #: Heap of (depth, node) of nodes whose children changed
+        self._changed: list[tuple[int, int]] = []
+        #: Merged nodes whose rules are returned by the next `get_rules`
+        self._touched: set[int] = set()
+
+    def add_input(self, strings: Iterable[str]) -> None:
+        tree = self.tree
+        for string in strings:
+            node = tree.ROOT
+            for part in string.split(SEP, maxsplit=MAX_DEPTH):
+                child = tree.get_child(node, MERGED)
+                if child is not None:
+                    self._touched.add(child)
+                else:
+                    child = tree.get_child(node, part)
+                    if child is None:
+                        child = self._add_child(node, part)
+                node = child
+
+    def _add_child(self, node: int, name: Edge) -> int:
+        child = self.tree.add_child(node, name)
+        heapq.heappush(self._changed, (self.tree.get_depth(node), node))
+        if name is MERGED:
+            self._touched.add(child)
+        return child
+
+    def _extract_rules(self) -> None:
+        with sentry_sdk.start_span(op="cluster_merge"):
+            self._merge_changed()
+
+        tree = self.tree
+        self._rules = [
+            self._build_rule(tree.get_path(node))
+            for node in sorted(self._touched)
+            if tree.is_alive(node)
+        ]
+        self._touched.clear()
+
+    def _merge_changed(self) -> None:
+        """Merge children of high-cardinality nodes, from the top down."""
+        tree = self.tree
+        while self._changed:
+            _, node = heapq.heappop(self._changed)
+            if (
+                tree.is_alive(node)
+                and tree.get_child(node, MERGED) is None
+                and tree.num_children(node) >= self._merge_threshold
+            ):
+                self._merge_children(node)
+
+    def _merge_children(self, node: int) -> int:
+        """Replaces the children of `node` with a single merged child."""
+        children = self.tree.detach_children(node)
+        merged = self._add_child(node, MERGED)
+        for child in children:
+            self._fold(child, merged)
+            self.tree.remove(child)
+        return merged
+
+    def _fold(self, source: int, target: int) -> None:
+        """Adds the subtree of `source` to the subtree of `target`."""
+        tree = self.tree
+        stack = [(source, target)]
+        while stack:
+            source, target = stack.pop()
+            if (
+                tree.get_child(source, MERGED) is not None
+                and tree.get_child(target, MERGED) is None
+                and tree.num_children(target)
+            ):
+                # Keep earlier merges instead of spreading merged and
+                # unmerged children under the same node.
+                self._merge_children(target)
+
+            for name, child in tree.get_children(source):
+                target_child = tree.get_child(target, MERGED)
+                if target_child is None:
+                    target_child = tree.get_child(target, name)
+                if target_child is None:
+                    target_child = self._add_child(target, name)
+                stack.append((child, target_child))
@@ -282,7 +282,7 @@ def process_minidump(symbolicator: Symbolicator, data: Any) -> Any:
         return
 
     metrics.incr("process.native.symbolicate.request")
-    response = symbolicator.process_minidump(minidump.data)
+    response = symbolicator.process_minidump(minidump.open())
 
     if _handle_response_status(data, response):
         _merge_full_response(data, response)
@@ -297,7 +297,7 @@ def process_applecrashreport(symbolicator: Symbolicator, data: Any) -> Any:
         return
 
     metrics.incr("process.native.symbolicate.request")
-    response = symbolicator.process_applecrashreport(report.data)
+    response = symbolicator.process_applecrashreport(report.open())
 
     if _handle_response_status(data, response):
         _merge_full_response(data, response)
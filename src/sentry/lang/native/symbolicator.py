@@ -336,6 +336,10 @@ class SymbolicatorSession:
         wait = 0.5
 
         while True:
+            # Uploaded files are read by every attempt, so rewind them first.
+            for file in kwargs.get("files", {}).values():
+                file.seek(0)
+
             try:
                 with metrics.timer(
                     "events.symbolicator.session.request", tags={"attempt": attempts}
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from sentry.features.evaluation_cache import feature_evaluation_cache
+
+
+def feature_evaluation_cache_middleware(
+    get_response: Callable[[Request], Response]
+) -> Callable[[Request], Response]:
+    """
+    Memoizes feature checks for the duration of a request.
+    """
+
+    def middleware(request: Request) -> Response:
+        with feature_evaluation_cache():
+            return get_response(request)
+
+    return middleware
@@ -4,6 +4,7 @@ import mimetypes
 from dataclasses import dataclass
 from hashlib import sha1
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
 from typing import IO, Any
 
 import zstandard
@@ -17,11 +18,18 @@ from sentry.backup.scopes import RelocationScope
 from sentry.db.models import BoundedBigIntegerField, Model, region_silo_model, sane_repr
 from sentry.db.models.fields.bounded import BoundedIntegerField
 from sentry.db.models.manager.base_query_set import BaseQuerySet
-from sentry.models.files.utils import get_size_and_checksum, get_storage
+from sentry.models.files.utils import get_storage
 
 # Attachment file types that are considered a crash report (PII relevant)
 CRASH_REPORT_TYPES = ("event.minidump", "event.applecrashreport")
 
+# Attachments shorter than this can be stored inline, see `can_store_inline`.
+INLINE_MAX_SIZE = 192
+# Attachments are read and compressed in pieces of this size when stored.
+ATTACHMENT_READ_SIZE = 1024 * 1024
+# Compressed attachments larger than this are spooled to disk while storing.
+ATTACHMENT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
 
 def get_crashreport_key(group_id: int) -> str:
     """
@@ -52,14 +60,14 @@ class PutfileResult:
     blob_path: str | None = None
 
 
-def can_store_inline(data: bytes) -> bool:
+def can_store_inline(data: bytes | bytearray) -> bool:
     """
     Determines whether `data` can be stored inline
 
     That is the case when it is shorter than 192 bytes,
     and all the bytes are non-NULL ASCII.
     """
-    return len(data) < 192 and all(byte > 0x00 and byte < 0x7F for byte in data)
+    return len(data) < INLINE_MAX_SIZE and all(byte > 0x00 and byte < 0x7F for byte in data)
 
 
 @region_silo_model
@@ -171,26 +179,38 @@ class EventAttachment(Model):
         from sentry.models.files import FileBlob
 
         content_type = normalize_content_type(attachment.content_type, attachment.name)
-        data = attachment.data
-
-        if len(data) == 0:
-            return PutfileResult(content_type=content_type, size=0, sha1=sha1().hexdigest())
-
-        blob = BytesIO(data)
-
-        size, checksum = get_size_and_checksum(blob)
 
-        if can_store_inline(data):
-            blob_path = ":" + data.decode()
-        else:
-            blob_path = "eventattachments/v1/" + FileBlob.generate_unique_path()
+        # The attachment is read in chunks, hashed and compressed in a single
+        # pass, so that it is never held in memory as a whole. The compressed
+        # data is spooled to disk if it gets large.
+        size = 0
+        checksum = sha1()
+        head = bytearray()
+        stream = attachment.open()
+        with SpooledTemporaryFile(max_size=ATTACHMENT_SPOOL_MAX_SIZE) as compressed_blob:
+            compressor = zstandard.ZstdCompressor().stream_writer(compressed_blob, closefd=False)
+            with compressor:
+                while chunk := stream.read(ATTACHMENT_READ_SIZE):
+                    size += len(chunk)
+                    checksum.update(chunk)
+                    if len(head) < INLINE_MAX_SIZE:
+                        head.extend(chunk[: INLINE_MAX_SIZE - len(head)])
+                    compressor.write(chunk)
+
+            if size == 0:
+                return PutfileResult(content_type=content_type, size=0, sha1=checksum.hexdigest())
+
+            if size < INLINE_MAX_SIZE and can_store_inline(head):
+                blob_path = ":" + head.decode()
+            else:
+                blob_path = "eventattachments/v1/" + FileBlob.generate_unique_path()
 
-            storage = get_storage()
-            compressed_blob = BytesIO(zstandard.compress(data))
-            storage.save(blob_path, compressed_blob)
+                storage = get_storage()
+                compressed_blob.seek(0)
+                storage.save(blob_path, compressed_blob)
 
         return PutfileResult(
-            content_type=content_type, size=size, sha1=checksum, blob_path=blob_path
+            content_type=content_type, size=size, sha1=checksum.hexdigest(), blob_path=blob_path
         )
 
 
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Collection, Mapping
 from datetime import datetime, timedelta
 from threading import local
 from typing import Any
@@ -10,6 +10,7 @@ from django.core.cache import BaseCache, InvalidCacheBackendError, caches
 from django.utils.functional import cached_property
 
 from sentry import options
+from sentry.nodestore.compression import get_compressor
 from sentry.utils import json, metrics
 from sentry.utils.services import Service
 
@@ -28,6 +29,50 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json.loads
 
+SECTIONS_MARKER = b"\x01"
+
+
+def _encode_json(value: Any) -> bytes:
+    return json_dumps(value).encode("utf8")
+
+
+def _encode_sections(value: Any) -> bytes:
+    """
+    Encodes every top-level key of a mapping as its own JSON document, so that
+    they can be deserialized independently:
+
+        <MARKER> [[key, length], ...] <MARKER> <value><value>...
+
+    JSON encoded with `ensure_ascii` never contains the marker or a newline,
+    which keeps this compatible with the line based subkey layout.
+    """
+    if not isinstance(value, Mapping):
+        return _encode_json(value)
+
+    sections = [_encode_json(section) for section in value.values()]
+    index = [[key, len(section)] for key, section in zip(value.keys(), sections)]
+    return SECTIONS_MARKER + _encode_json(index) + SECTIONS_MARKER + b"".join(sections)
+
+
+def _decode_line(line: bytes, fields: Collection[str] | None) -> Any:
+    if not line.startswith(SECTIONS_MARKER):
+        return _project(json_loads(line), fields)
+
+    header_end = line.index(SECTIONS_MARKER, 1)
+    offset = header_end + 1
+    rv = {}
+    for key, length in json_loads(line[1:header_end]):
+        if fields is None or key in fields:
+            rv[key] = json_loads(line[offset : offset + length])
+        offset += length
+    return rv
+
+
+def _project(value: Any, fields: Collection[str] | None) -> Any:
+    if fields is None or not isinstance(value, Mapping):
+        return value
+    return {key: value[key] for key in fields if key in value}
+
 
 class NodeStorage(local, Service):
     """
@@ -96,10 +141,13 @@ class NodeStorage(local, Service):
         for id in id_list:
             self.delete(id)
 
-    def _decode(self, value: None | bytes, subkey: str | None) -> Any | None:
+    def _decode(
+        self, value: None | bytes, subkey: str | None, fields: Collection[str] | None = None
+    ) -> Any | None:
         if value is None:
             return None
 
+        value = self._decompress(value)
         lines_iter = iter(value.splitlines())
         try:
             if subkey is not None:
@@ -116,7 +164,7 @@ class NodeStorage(local, Service):
 
                     next(lines_iter)
 
-            return json_loads(next(lines_iter))
+            return _decode_line(next(lines_iter), fields)
         except StopIteration:
             return None
 
@@ -131,10 +179,16 @@ class NodeStorage(local, Service):
         raise NotImplementedError
 
     @metrics.wraps("nodestore.get.duration")
-    def get(self, id: str, subkey: str | None = None) -> Any:
+    def get(self, id: str, subkey: str | None = None, fields: Collection[str] | None = None) -> Any:
         """
         >>> nodestore.get('key1')
         {"message": "hello world"}
+
+        Passing `fields` only returns (and for nodes written in the sectioned
+        format, only deserializes) those top-level keys:
+
+        >>> nodestore.get('key1', fields=["title"])
+        {"title": "hello world"}
         """
         with sentry_sdk.start_span(op="nodestore.get") as span:
             span.set_tag("node_id", id)
@@ -144,12 +198,12 @@ class NodeStorage(local, Service):
                     metrics.incr("nodestore.get", tags={"cache": "hit"})
                     span.set_tag("origin", "from_cache")
                     span.set_tag("found", bool(item_from_cache))
-                    return item_from_cache
+                    return _project(item_from_cache, fields)
 
             span.set_tag("subkey", str(subkey))
             bytes_data = self._get_bytes(id)
-            rv = self._decode(bytes_data, subkey=subkey)
-            if subkey is None:
+            rv = self._decode(bytes_data, subkey=subkey, fields=fields)
+            if subkey is None and fields is None:
                 # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
 
@@ -171,20 +225,31 @@ class NodeStorage(local, Service):
         """
         return {id: self._get_bytes(id) for id in id_list}
 
-    def get_multi(self, id_list: list[str], subkey: str | None = None) -> dict[str, Any | None]:
+    def get_multi(
+        self,
+        id_list: list[str],
+        subkey: str | None = None,
+        fields: Collection[str] | None = None,
+    ) -> dict[str, Any | None]:
         """
         >>> nodestore.get_multi(['key1', 'key2')
         {
             "key1": {"message": "hello world"},
             "key2": {"message": "hello world"}
         }
+
+        Like `get`, `fields` restricts the result to the given top-level keys.
         """
         with sentry_sdk.start_span(op="nodestore.get_multi") as span:
             span.set_tag("subkey", str(subkey))
             span.set_tag("num_ids", len(id_list))
+            span.set_tag("fields", str(fields))
 
             if subkey is None:
-                cache_items = self._get_cache_items(id_list)
+                cache_items = {
+                    id: _project(item, fields)
+                    for id, item in self._get_cache_items(id_list).items()
+                }
                 if len(cache_items) == len(id_list):
                     span.set_tag("result", "from_cache")
                     return cache_items
@@ -195,11 +260,12 @@ class NodeStorage(local, Service):
 
             with sentry_sdk.start_span(op="nodestore._get_bytes_multi_and_decode") as span:
                 items = {
-                    id: self._decode(value, subkey=subkey)
+                    id: self._decode(value, subkey=subkey, fields=fields)
                     for id, value in self._get_bytes_multi(uncached_ids).items()
                 }
             if subkey is None:
-                self._set_cache_items(items)
+                if fields is None:
+                    self._set_cache_items(items)
                 items.update(cache_items)
 
             span.set_tag("result", "from_service")
@@ -215,15 +281,37 @@ class NodeStorage(local, Service):
 
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
+
+        With `nodestore.sectioned-encoding` enabled, values are written in the
+        sectioned format instead of as a single JSON document per line, see
+        `_encode_sections`.
         """
-        lines = [json_dumps(data.pop(None)).encode("utf8")]
+        if options.get("nodestore.sectioned-encoding"):
+            encode_line = _encode_sections
+        else:
+            encode_line = _encode_json
+
+        lines = [encode_line(data.pop(None))]
         for key, value in data.items():
             if key is not None:
                 lines.append(key.encode("ascii"))
-                lines.append(json_dumps(value).encode("utf8"))
+                lines.append(encode_line(value))
 
         return b"\n".join(lines)
 
+    def _compress(self, value: bytes, platform: str | None = None) -> bytes:
+        """
+        Compresses encoded nodes according to `nodestore.compression`. Values
+        written this way are framed with a codec byte so `_decompress` can tell
+        them apart from plain JSON written before compression was enabled.
+        """
+        if options.get("nodestore.compression") == "zstd":
+            return get_compressor().compress(value, platform=platform)
+        return value
+
+    def _decompress(self, value: bytes) -> bytes:
+        return get_compressor().decompress(value)
+
     def set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         """
         >>> nodestore.set_bytes('key1', b"{'foo': 'bar'}")
@@ -261,7 +349,8 @@ class NodeStorage(local, Service):
         {'foo': 'bam'}
         """
         cache_item = data.get(None)
-        bytes_data = self._encode(data)
+        platform = cache_item.get("platform") if cache_item else None
+        bytes_data = self._compress(self._encode(data), platform=platform)
         self.set_bytes(item_id, bytes_data, ttl=ttl)
         # set cache only after encoding and write to nodestore has succeeded
         if options.get("nodestore.set-subkeys.enable-set-cache-item"):
@@ -0,0 +1,177 @@
+"""
+Optional compression of nodestore payloads with zstd, using dictionaries
+trained per platform (see ``sentry nodestore train-dictionaries``).
+
+Encoded payloads are framed so that they can be told apart from the legacy
+formats that are still around in storage (plain JSON lines, which always start
+with ``{``, and pickles in the Django backend):
+
+    <MARKER:1 byte> <CODEC:1 byte> <zstd frame>
+
+The zstd frame header carries the ID of the dictionary used to compress it, so
+the dictionary does not need to be recorded separately. Dictionaries are never
+deleted once blobs have been written with them, retraining adds a new version
+which takes over for writes.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from enum import IntEnum
+
+import zstandard
+from django.conf import settings
+
+from sentry import options
+from sentry.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+FRAME_MARKER = b"\x00"
+
+DICTIONARY_SUFFIX = ".zdict"
+COMPRESSION_LEVEL = 3
+
+
+class NodeCodec(IntEnum):
+    ZSTD = 1
+
+
+class NodeCompressionError(Exception):
+    pass
+
+
+def dictionary_filename(platform: str, version: int) -> str:
+    return f"{platform}.{version}{DICTIONARY_SUFFIX}"
+
+
+class DictionaryRegistry:
+    """
+    Loads all dictionaries from a directory. Files are named
+    ``<platform>.<version>.zdict``, the highest version of a platform is used
+    for writes while every version stays available for reads.
+    """
+
+    def __init__(self, path: str | None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._by_id: dict[int, zstandard.ZstdCompressionDict] | None = None
+        self._by_platform: dict[str, zstandard.ZstdCompressionDict] = {}
+
+    def _load(self) -> dict[int, zstandard.ZstdCompressionDict]:
+        if self._by_id is not None:
+            return self._by_id
+
+        with self._lock:
+            if self._by_id is not None:
+                return self._by_id
+
+            by_id: dict[int, zstandard.ZstdCompressionDict] = {}
+            latest: dict[str, tuple[int, zstandard.ZstdCompressionDict]] = {}
+            for filename in sorted(os.listdir(self.path)) if self.path else ():
+                if not filename.endswith(DICTIONARY_SUFFIX):
+                    continue
+                try:
+                    platform, version = filename[: -len(DICTIONARY_SUFFIX)].rsplit(".", 1)
+                    with open(os.path.join(self.path, filename), "rb") as f:
+                        dictionary = zstandard.ZstdCompressionDict(f.read())
+                    dictionary_id = dictionary.dict_id()
+                    int_version = int(version)
+                except (ValueError, OSError):
+                    logger.exception(
+                        "nodestore.compression.invalid_dictionary", extra={"filename": filename}
+                    )
+                    continue
+
+                by_id[dictionary_id] = dictionary
+                if platform not in latest or latest[platform][0] < int_version:
+                    latest[platform] = (int_version, dictionary)
+
+            self._by_platform = {platform: d for platform, (_, d) in latest.items()}
+            self._by_id = by_id
+            return by_id
+
+    def get_by_id(self, dictionary_id: int) -> zstandard.ZstdCompressionDict | None:
+        return self._load().get(dictionary_id)
+
+    def get_for_platform(self, platform: str | None) -> zstandard.ZstdCompressionDict | None:
+        self._load()
+        return self._by_platform.get(platform or "other")
+
+
+class NodeCompressor:
+    def __init__(self, dictionaries: DictionaryRegistry) -> None:
+        self.dictionaries = dictionaries
+        self._local = threading.local()
+
+    def _compressor(
+        self, dictionary: zstandard.ZstdCompressionDict | None
+    ) -> zstandard.ZstdCompressor:
+        # Compressors are not thread-safe but expensive enough to set up (a
+        # dictionary needs to be digested first) that we want to reuse them.
+        cache = self._local.__dict__.setdefault("compressors", {})
+        key = dictionary.dict_id() if dictionary is not None else 0
+        compressor = cache.get(key)
+        if compressor is None:
+            compressor = cache[key] = zstandard.ZstdCompressor(
+                level=COMPRESSION_LEVEL, dict_data=dictionary, write_content_size=True
+            )
+        return compressor
+
+    def _decompressor(self, dictionary_id: int) -> zstandard.ZstdDecompressor:
+        cache = self._local.__dict__.setdefault("decompressors", {})
+        decompressor = cache.get(dictionary_id)
+        if decompressor is None:
+            if dictionary_id:
+                dictionary = self.dictionaries.get_by_id(dictionary_id)
+                if dictionary is None:
+                    raise NodeCompressionError(f"Unknown zstd dictionary {dictionary_id}")
+                decompressor = zstandard.ZstdDecompressor(dict_data=dictionary)
+            else:
+                decompressor = zstandard.ZstdDecompressor()
+            cache[dictionary_id] = decompressor
+        return decompressor
+
+    def compress(self, data: bytes, platform: str | None = None) -> bytes:
+        dictionary = None
+        if options.get("nodestore.compression.use-dictionaries"):
+            dictionary = self.dictionaries.get_for_platform(platform)
+
+        rv = FRAME_MARKER + bytes([NodeCodec.ZSTD]) + self._compressor(dictionary).compress(data)
+        metrics.distribution(
+            "nodestore.compression.ratio",
+            len(rv) / max(len(data), 1),
+            tags={"dictionary": dictionary is not None},
+        )
+        return rv
+
+    def decompress(self, data: bytes) -> bytes:
+        if not is_framed(data):
+            return data
+
+        codec = data[1]
+        if codec != NodeCodec.ZSTD:
+            raise NodeCompressionError(f"Unknown nodestore codec {codec}")
+
+        payload = data[2:]
+        dictionary_id = zstandard.get_frame_parameters(payload).dict_id
+        return self._decompressor(dictionary_id).decompress(payload)
+
+
+def is_framed(data: bytes) -> bool:
+    return data[:1] == FRAME_MARKER
+
+
+_default_compressor: NodeCompressor | None = None
+
+
+def get_compressor() -> NodeCompressor:
+    global _default_compressor
+
+    if _default_compressor is None:
+        _default_compressor = NodeCompressor(
+            DictionaryRegistry(settings.SENTRY_NODESTORE_DICTIONARY_DIR)
+        )
+    return _default_compressor
@@ -3,13 +3,15 @@ from __future__ import annotations
 import logging
 import math
 import pickle
+from collections.abc import Collection
 from datetime import datetime, timedelta
 from typing import Any
 
 from django.utils import timezone
 
 from sentry.db.models.query import create_or_update
-from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.base import SECTIONS_MARKER, NodeStorage
+from sentry.nodestore.compression import is_framed
 from sentry.utils.strings import compress, decompress
 
 from .models import Node
@@ -22,16 +24,21 @@ class DjangoNodeStorage(NodeStorage):
         Node.objects.filter(id=id).delete()
         self._delete_cache_item(id)
 
-    def _decode(self, value: bytes | None, subkey: str | None) -> Any | None:
+    def _decode(
+        self, value: bytes | None, subkey: str | None, fields: Collection[str] | None = None
+    ) -> Any | None:
         if value is None:
             return None
 
         try:
-            if value.startswith(b"{"):
-                return NodeStorage._decode(self, value, subkey=subkey)
+            if value.startswith((b"{", SECTIONS_MARKER)) or is_framed(value):
+                return NodeStorage._decode(self, value, subkey=subkey, fields=fields)
 
             if subkey is None:
-                return pickle.loads(value)
+                rv = pickle.loads(value)
+                if fields is not None and isinstance(rv, dict):
+                    return {key: rv[key] for key in fields if key in rv}
+                return rv
 
             return None
         except Exception as e:
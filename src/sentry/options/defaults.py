@@ -194,6 +194,16 @@ register(
     flags=FLAG_ALLOW_EMPTY | FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Digests
+# Number of timelines delivered per digest task. With a value larger than one,
+# the timelines of a batch are digested in a single redis call per host.
+register(
+    "digests.delivery-batch-size",
+    type=Int,
+    default=1,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # TOTP (Auth app)
 register(
     "totp.disallow-new-enrollment",
@@ -1113,6 +1123,12 @@ register(
 # Controls whether generic inbound filters are sent to Relay.
 register("relay.emit-generic-inbound-filters", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Skips writing project configs to the cache when their content (everything but
+# the revision and timestamps) is the same as that of the cached config.
+register(
+    "relay.project-config-cache.skip-unchanged", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE
+)
+
 # Write new kafka headers in eventstream
 register("eventstream:kafka-headers", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -1928,6 +1944,9 @@ register("hybrid_cloud.rpc.disabled-service-methods", default=[], flags=FLAG_AUT
 
 # Decides whether an incoming transaction triggers an update of the clustering rule applied to it.
 register("txnames.bump-lifetime-sample-rate", default=0.1, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Folds transaction names into a per-project tree persisted across clusterer
+# runs, instead of clustering each batch of samples on its own.
+register("txnames.clusterer.incremental", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 # Decides whether an incoming span triggers an update of the clustering rule applied to it.
 register("span_descs.bump-lifetime-sample-rate", default=0.25, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -1936,6 +1955,15 @@ register("span_descs.bump-lifetime-sample-rate", default=0.25, flags=FLAG_AUTOMA
 register(
     "nodestore.set-subkeys.enable-set-cache-item", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE
 )
+# Compression applied to node payloads on write, either "none" or "zstd". Reads
+# handle every format regardless of this setting.
+register("nodestore.compression", default="none", flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Whether zstd compression should use the per-platform dictionaries found in
+# SENTRY_NODESTORE_DICTIONARY_DIR.
+register("nodestore.compression.use-dictionaries", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
+# Write nodes in the sectioned format, which allows `get_multi(..., fields=...)`
+# to only deserialize the requested top-level keys.
+register("nodestore.sectioned-encoding", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
 # === Backpressure related runtime options ===
 
@@ -2271,6 +2299,13 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE | FLAG_MODIFIABLE_RATE,
 )
 
+# Use to enable caching on-demand metric specs across project config builds.
+register(
+    "on_demand_metrics.spec_cache.enable",
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Relocation: whether or not the self-serve API for the feature is enabled. When set on a region
 # silo, this flag controls whether or not that region's API will serve relocation requests to
 # non-superuser clients. When set on the control silo, it can be used to regulate whether or not
@@ -2407,6 +2442,13 @@ register(
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Reuse the grouping components of identical stacktrace frames across events
+register(
+    "grouping.frame-component-cache.enabled",
+    default=False,
+    flags=FLAG_BOOL | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Rates controlling the rollout of grouping parameterization experiments
 register(
     "grouping.experiments.parameterization.uniq_id",
@@ -2506,6 +2548,25 @@ register(
     default=300,  # 5 minutes
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Buffer segments as a single blob of length-prefixed spans instead of a list
+register(
+    "standalone-spans.buffer-compact-segments.enable",
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Schedule segments for processing in a sorted set rather than a list
+register(
+    "standalone-spans.buffer-sorted-set-scheduling.enable",
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Maximum number of segments claimed from the schedule of a partition at once
+register(
+    "standalone-spans.buffer-claim-batch-size",
+    type=Int,
+    default=1000,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "standalone-spans.detect-performance-issues-consumer.enable",
     default=True,
@@ -2702,3 +2763,19 @@ register(
     default=10000,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+
+# Memoizes feature flag checks within an API request or the post processing of
+# an event.
+register(
+    "features.evaluation-cache.enable",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Sums non-billing outcomes per key and minute in every process instead of
+# producing one Kafka message per outcome. Billing outcomes are never aggregated.
+register(
+    "outcomes.aggregation.enable",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
@@ -319,8 +319,10 @@ class OptionsManager:
                 except KeyError:
                     optval = opt.default()
         # options already present in store are cached by store
-        # caching here to avoid database queries
-        self.store.set_cache(opt, optval)
+        # caching here to avoid database queries, unless the store serves
+        # options from a snapshot which already covers every stored option
+        if self.store.get_snapshot() is None:
+            self.store.set_cache(opt, optval)
         return optval
 
     def delete(self, key: str):
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import dataclasses
 import logging
+import os
+import threading
 from random import random
-from time import time
+from time import sleep, time
 from typing import Any
+from uuid import uuid4
 
 from django.conf import settings
+from django.db import router, transaction
 from django.db.utils import OperationalError, ProgrammingError
 from django.utils import timezone
 
@@ -16,6 +20,14 @@ from sentry.options.manager import UpdateChannel
 CACHE_FETCH_ERR = "Unable to fetch option cache for %s"
 CACHE_UPDATE_ERR = "Unable to update option cache for %s"
 
+# Snapshots are kept for a day after they have been replaced by a new version,
+# so that processes which have not noticed the new version yet can still load
+# the old one.
+SNAPSHOT_TTL = 60 * 60 * 24
+# A snapshot that could not be refreshed for this many intervals is considered
+# stale, and options are fetched individually again.
+SNAPSHOT_MAX_AGE_INTERVALS = 10
+
 logger = logging.getLogger("sentry")
 
 
@@ -73,6 +85,13 @@ class OptionsStore:
         self.ttl = ttl
         self.flush_local_cache()
 
+        # Snapshot of all stored options, see `get_snapshot`.
+        self._snapshot: dict[str, Any] | None = None
+        self._snapshot_version: str | None = None
+        self._snapshot_refreshed_at = 0.0
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_watcher_pid: int | None = None
+
     @property
     def model(self):
         return self.model_cls()
@@ -90,6 +109,10 @@ class OptionsStore:
         """
         Fetches a value from the options store.
         """
+        snapshot = self.get_snapshot()
+        if snapshot is not None:
+            return snapshot.get(key.name)
+
         result = self.get_cache(key, silent=silent)
         if result is not None:
             return result
@@ -127,6 +150,117 @@ class OptionsStore:
 
         return value
 
+    def get_snapshot(self) -> dict[str, Any] | None:
+        """
+        Returns a snapshot of all stored options, if enabled with
+        `SENTRY_OPTIONS_SNAPSHOT_INTERVAL`.
+
+        The snapshot is loaded as a single blob from the cache (or built from
+        the database if the cache doesn't have it), and is kept up to date by
+        a watcher thread in every process. The watcher polls the snapshot
+        version, which is changed on every write, and loads the new snapshot
+        only when it changes. Options read from a snapshot are a dictionary
+        lookup without any network round trip.
+
+        Returns `None` if snapshots are disabled, or the snapshot could not be
+        loaded or refreshed for a while, in which case options are fetched
+        individually again.
+        """
+        interval = settings.SENTRY_OPTIONS_SNAPSHOT_INTERVAL
+        if not interval or self.cache is None:
+            return None
+
+        if self._snapshot_watcher_pid != os.getpid():
+            self._start_snapshot_watcher(interval)
+
+        if time() - self._snapshot_refreshed_at > interval * SNAPSHOT_MAX_AGE_INTERVALS:
+            return None
+        return self._snapshot
+
+    def _get_snapshot_key(self, version: str | None = None) -> str:
+        key = f"o:snapshot:{self.model._meta.db_table}"
+        if version is None:
+            return f"{key}:version"
+        return f"{key}:{version}"
+
+    def _start_snapshot_watcher(self, interval: float) -> None:
+        with self._snapshot_lock:
+            # Threads do not survive forks, so every process has to start its
+            # own watcher.
+            pid = os.getpid()
+            if self._snapshot_watcher_pid == pid:
+                return
+            self._snapshot_watcher_pid = pid
+
+        # Load the first snapshot right away, so that it can be used by the
+        # calling `get`.
+        self.refresh_snapshot()
+
+        def watch() -> None:
+            while self._snapshot_watcher_pid == pid:
+                sleep(interval)
+                self.refresh_snapshot()
+
+        threading.Thread(target=watch, name="options-snapshot-watcher", daemon=True).start()
+
+    def refresh_snapshot(self) -> None:
+        """
+        Loads the current snapshot if its version changed since the last
+        refresh. Failures are logged and keep serving the previous snapshot
+        until it is considered stale.
+        """
+        try:
+            version_key = self._get_snapshot_key()
+            version = self.cache.get(version_key)
+            if version is None:
+                self.cache.add(version_key, uuid4().hex, None)
+                version = self.cache.get(version_key)
+                if version is None:
+                    raise RuntimeError("Options snapshot version is not cached")
+
+            if version == self._snapshot_version:
+                self._snapshot_refreshed_at = time()
+                return
+
+            snapshot_key = self._get_snapshot_key(version)
+            snapshot = self.cache.get(snapshot_key)
+            if snapshot is None:
+                with in_test_hide_transaction_boundary():
+                    snapshot = dict(self.model.objects.values_list("key", "value"))
+                self.cache.set(snapshot_key, snapshot, SNAPSHOT_TTL)
+        except Exception:
+            logger.warning("Unable to refresh options snapshot", exc_info=True)
+            return
+
+        self._snapshot = snapshot
+        self._snapshot_version = version
+        self._snapshot_refreshed_at = time()
+
+    def _update_snapshot(self, key, value) -> None:
+        """
+        Applies a write to the local snapshot, and changes the snapshot
+        version once the write is committed so that all processes load it.
+        """
+        if self._snapshot is not None:
+            snapshot = dict(self._snapshot)
+            if value is None:
+                snapshot.pop(key.name, None)
+            else:
+                snapshot[key.name] = value
+            self._snapshot = snapshot
+
+        if settings.SENTRY_OPTIONS_SNAPSHOT_INTERVAL and self.cache is not None:
+
+            def bump_version() -> None:
+                try:
+                    self.cache.set(self._get_snapshot_key(), uuid4().hex, None)
+                except Exception:
+                    logger.warning(
+                        CACHE_UPDATE_ERR, key.name, extra={"key": key.name}, exc_info=True
+                    )
+
+            transaction.on_commit(bump_version, using=router.db_for_write(self.model_cls()))
+
     def get_local_cache(self, key, force_grace=False):
         """
         Attempt to fetch a key out of the local cache.
@@ -234,6 +368,7 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.set_store(key, value, channel)
+        self._update_snapshot(key, value)
         return self.set_cache(key, value)
 
     def set_store(self, key, value, channel: UpdateChannel):
@@ -275,6 +410,7 @@ class OptionsStore:
         assert self.cache is not None, "cache must be configured before mutating options"
 
         self.delete_store(key)
+        self._update_snapshot(key, None)
         return self.delete_cache(key)
 
     def delete_store(self, key):
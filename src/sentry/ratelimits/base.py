@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, NamedTuple
 
 from sentry.utils.services import Service
 
@@ -8,8 +9,31 @@ if TYPE_CHECKING:
     from sentry.models.project import Project
 
 
+class RateLimitCheck(NamedTuple):
+    key: str
+    limit: int
+    project: Project | None = None
+    window: int | None = None
+
+
+class RateLimitCheckResult(NamedTuple):
+    is_limited: bool
+    # The check with the tightest limit: the one that limited the request (the
+    # one that resets last, if several did), or the one with the least
+    # remaining requests otherwise.
+    check: RateLimitCheck
+    current: int
+    reset_time: int
+
+
 class RateLimiter(Service):
-    __all__ = ("is_limited", "validate", "current_value", "is_limited_with_value")
+    __all__ = (
+        "is_limited",
+        "validate",
+        "current_value",
+        "is_limited_with_value",
+        "is_limited_many",
+    )
 
     window = 60
 
@@ -29,5 +53,28 @@ class RateLimiter(Service):
     ) -> tuple[bool, int, int]:
         return False, 0, 0
 
+    def is_limited_many(self, checks: Sequence[RateLimitCheck]) -> RateLimitCheckResult | None:
+        """
+        Checks (and consumes) all of the given limits at once, which backends
+        may do in fewer round trips than checking them one by one. Returns
+        `None` if there is nothing to check.
+        """
+        results = []
+        for check in checks:
+            limited, current, reset_time = self.is_limited_with_value(
+                check.key, check.limit, project=check.project, window=check.window
+            )
+            results.append(RateLimitCheckResult(limited, check, current, reset_time))
+        return tightest_result(results)
+
     def validate(self) -> None:
         raise NotImplementedError
+
+
+def tightest_result(results: Iterable[RateLimitCheckResult]) -> RateLimitCheckResult | None:
+    def tightness(result: RateLimitCheckResult) -> tuple[bool, int]:
+        if result.is_limited:
+            return True, result.reset_time
+        return False, result.current - result.check.limit
+
+    return max(results, key=tightness, default=None)
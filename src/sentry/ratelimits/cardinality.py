@@ -1,4 +1,9 @@
+import math
+import time
+from collections import defaultdict
 from collections.abc import Mapping, Sequence
+from typing import Any
+from uuid import uuid4
 
 from sentry_redis_tools.cardinality_limiter import CardinalityLimiter as CardinalityLimiterBase
 from sentry_redis_tools.cardinality_limiter import GrantedQuota, Quota
@@ -17,6 +22,12 @@ __all__ = ["GrantedQuota", "RequestedQuota", "Quota"]
 Hash = int
 Timestamp = int
 
+# The standard error of the cardinality estimated by a HyperLogLog sketch in
+# Redis, which always uses 16384 registers.
+HLL_STANDARD_ERROR = 0.0081
+
+cardinality_hll = redis.load_redis_script("ratelimits/cardinality_hll.lua")
+
 
 class CardinalityLimiter(Service, CardinalityLimiterBase):
     pass
@@ -71,3 +82,161 @@ class RedisCardinalityLimiter(CardinalityLimiter):
         timestamp: Timestamp,
     ) -> None:
         return self.impl.use_quotas(grants, timestamp)
+
+
+class RedisHLLCardinalityLimiter(CardinalityLimiter):
+    """
+    An approximate alternative to `RedisCardinalityLimiter`, which keeps a
+    HyperLogLog sketch per granule of the sliding window instead of the set of
+    all hashes seen, so that memory is bounded (to 12kB per sketch) no matter
+    the cardinality.
+
+    Sketches are split into shards by hash, and the cardinality of the window
+    is estimated as the sum of the merged cardinalities of all shards. The
+    relative error of that estimate shrinks with the square root of the number
+    of shards, which is derived from `error_bound`.
+
+    Sketches cannot tell whether they contain a hash, only whether adding it
+    changes them. Once the limit is reached, hashes are therefore only
+    rejected if they are certainly new, while some new hashes will still be
+    admitted. The fraction of those grows with the number of hashes per
+    register (`limit / (num_shards * 16384)`).
+    """
+
+    def __init__(
+        self,
+        cluster: str = "default",
+        error_bound: float = HLL_STANDARD_ERROR,
+        metric_tags: Mapping[str, str] | None = None,
+    ) -> None:
+        """
+        :param cluster: Name of the redis cluster to use, to be configured with
+            the `redis.clusters` Sentry option (like any other redis cluster in
+            Sentry).
+        :param error_bound: The maximum relative standard error of cardinality
+            estimates. Values below the error of a single sketch (0.81%)
+            increase the number of shards (and memory) quadratically.
+        """
+        self.is_redis_cluster, self.client, _ = redis.get_dynamic_cluster_from_options(
+            "", {"cluster": cluster}
+        )
+        self.num_shards = max(1, math.ceil((HLL_STANDARD_ERROR / error_bound) ** 2))
+        self.metric_tags = metric_tags
+
+        super().__init__()
+
+    def _get_routing_key(self, prefix: str) -> str:
+        # All keys of a prefix are in the same slot (or host), so that they can
+        # be merged by a single script call.
+        return f"cardinality:hll:{{{prefix}}}"
+
+    def _get_granule_keys(
+        self, request: RequestedQuota, shard: int, timestamp: Timestamp
+    ) -> list[str]:
+        quota = request.quota
+        routing_key = self._get_routing_key(request.prefix)
+        current_granule = timestamp // quota.granularity_seconds
+        num_granules = max(1, quota.window_seconds // quota.granularity_seconds)
+        return [
+            f"{routing_key}:{quota.window_seconds}:{quota.granularity_seconds}:{shard}:{granule}"
+            for granule in range(current_granule - num_granules + 1, current_granule + 1)
+        ]
+
+    def _execute(self, commands: Sequence[tuple[str, tuple[Any, ...]]]) -> list[Any]:
+        """
+        Runs the given commands, each preceded by the routing key of the keys
+        it uses, in one pipeline per host. Returns the results in order.
+        """
+        results: list[Any] = [None] * len(commands)
+        indexes_by_host: dict[int | None, list[int]] = defaultdict(list)
+        if self.is_redis_cluster:
+            indexes_by_host[None] = list(range(len(commands)))
+        else:
+            router = self.client.get_router()
+            for i, (routing_key, _) in enumerate(commands):
+                indexes_by_host[router.get_host_for_key(routing_key)].append(i)
+
+        for host, indexes in indexes_by_host.items():
+            client = self.client if host is None else self.client.get_local_client(host)
+            with client.pipeline(transaction=False) as pipe:
+                for i in indexes:
+                    pipe.execute_command(*commands[i][1])
+                for i, result in zip(indexes, pipe.execute()):
+                    results[i] = result
+
+        return results
+
+    def check_within_quotas(
+        self, requests: Sequence[RequestedQuota], timestamp: Timestamp | None = None
+    ) -> tuple[Timestamp, Sequence[GrantedQuota]]:
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        commands = []
+        for request in requests:
+            keys = [f"{self._get_routing_key(request.prefix)}:tmp:{uuid4().hex}"]
+            for shard in range(self.num_shards):
+                keys.extend(self._get_granule_keys(request, shard, timestamp))
+
+            args: list[Any] = [self.num_shards, len(keys[1:]) // self.num_shards]
+            for unit_hash in request.unit_hashes:
+                args.extend((unit_hash % self.num_shards, unit_hash))
+
+            # The script is sent in full (instead of by SHA), as neither
+            # pipelines of rb hosts nor of Redis Cluster load scripts on demand.
+            commands.append(
+                (
+                    self._get_routing_key(request.prefix),
+                    ("EVAL", cardinality_hll.script, len(keys), *keys, *args),
+                )
+            )
+
+        with metrics.timer("ratelimits.cardinality.hll.check", tags=self.metric_tags):
+            results = self._execute(commands)
+
+        grants = []
+        for request, (cardinality, *new_flags) in zip(requests, results):
+            remaining = request.quota.limit - cardinality
+            granted_unit_hashes = []
+            reached_quota = None
+            for unit_hash, is_new in zip(request.unit_hashes, new_flags):
+                if is_new:
+                    if remaining <= 0:
+                        reached_quota = request.quota
+                        continue
+                    remaining -= 1
+                granted_unit_hashes.append(unit_hash)
+
+            grants.append(
+                GrantedQuota(
+                    request=request,
+                    granted_unit_hashes=granted_unit_hashes,
+                    reached_quota=reached_quota,
+                )
+            )
+
+        return timestamp, grants
+
+    def use_quotas(
+        self,
+        grants: Sequence[GrantedQuota],
+        timestamp: Timestamp,
+    ) -> None:
+        commands = []
+        for grant in grants:
+            request = grant.request
+            quota = request.quota
+            hashes_by_shard: dict[int, list[Hash]] = defaultdict(list)
+            for unit_hash in grant.granted_unit_hashes:
+                hashes_by_shard[unit_hash % self.num_shards].append(unit_hash)
+
+            # Sketches are kept until the last window they are part of has passed.
+            ttl = quota.window_seconds + quota.granularity_seconds
+            routing_key = self._get_routing_key(request.prefix)
+            for shard, unit_hashes in hashes_by_shard.items():
+                key = self._get_granule_keys(request, shard, timestamp)[-1]
+                commands.append((routing_key, ("PFADD", key, *unit_hashes)))
+                commands.append((routing_key, ("EXPIRE", key, ttl)))
+
+        if commands:
+            self._execute(commands)
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass
+from time import time
+from typing import TYPE_CHECKING, Any
+
+from cachetools import TTLCache
+from django.conf import settings
+from redis.exceptions import NoScriptError, RedisError
+
+from sentry.exceptions import InvalidConfiguration
+from sentry.ratelimits.base import (
+    RateLimitCheck,
+    RateLimitCheckResult,
+    RateLimiter,
+    tightest_result,
+)
+from sentry.utils import metrics, redis
+from sentry.utils.hashlib import md5_text
+
+if TYPE_CHECKING:
+    from sentry.models.project import Project
+
+logger = logging.getLogger(__name__)
+
+gcra = redis.load_redis_script("ratelimits/gcra.lua")
+
+
+@dataclass
+class LocalLease:
+    """
+    Requests reserved in redis ahead of time, which can be handed out without
+    going to redis until they run out or expire.
+    """
+
+    remaining: int
+    # The number of requests counted against the limit at the time the lease
+    # was taken, not including the remaining reserved requests.
+    current: int
+    reset_time: int
+
+
+class GCRARateLimiter(RateLimiter):
+    """
+    Rate limiter implementing the generic cell rate algorithm (GCRA), see
+    `ratelimits/gcra.lua`. A limit of `limit` requests per `window` seconds
+    allows bursts of up to `limit` requests, after which requests are allowed
+    again at a rate of `limit / window`.
+
+    >>> SENTRY_RATELIMITER = "sentry.ratelimits.gcra.GCRARateLimiter"
+    >>> SENTRY_RATELIMITER_OPTIONS = {
+    ...     "local_cache_ttl": 1.0,
+    ...     "local_lease_fraction": 0.05,
+    ...     "local_lease_headroom": 0.5,
+    ... }
+
+    To avoid a round trip to redis for every request to keys that are far
+    below their limit, a fraction (`local_lease_fraction`) of the limit is
+    reserved at once and handed out from memory for up to `local_cache_ttl`
+    seconds. Leases are only taken while at least `local_lease_headroom` of
+    the limit is still available, so that reservations of other processes
+    cannot push a key over its limit. Reserved requests that are not used
+    before the lease expires are still counted against the limit, which errs
+    on the side of limiting slightly early.
+
+    Multiple limits can be checked in a single pipelined round trip with
+    `is_limited_many`. Every limit is checked and consumed independently.
+    """
+
+    def __init__(
+        self,
+        local_cache_ttl: float = 1.0,
+        local_lease_fraction: float = 0.05,
+        local_lease_headroom: float = 0.5,
+        local_cache_size: int = 10_000,
+        **options: Any,
+    ) -> None:
+        cluster_key = settings.SENTRY_RATE_LIMIT_REDIS_CLUSTER
+        self.client = redis.redis_clusters.get(cluster_key)
+
+        self.local_lease_fraction = local_lease_fraction
+        self.local_lease_headroom = local_lease_headroom
+        self._leases: TTLCache[tuple[str, int, int], LocalLease] | None = None
+        if local_cache_ttl > 0 and local_lease_fraction > 0:
+            self._leases = TTLCache(maxsize=local_cache_size, ttl=local_cache_ttl)
+        self._lock = threading.Lock()
+
+    def validate(self) -> None:
+        try:
+            self.client.ping()
+            self.client.connection_pool.disconnect()
+        except Exception as e:
+            raise InvalidConfiguration(str(e))
+
+    def _construct_redis_key(self, key: str, project: Project | None = None) -> str:
+        """
+        Construct a rate limit key using the args given. Key will have a format of:
+        "gcra:<key_hex>[:<project_id>]"
+        """
+        redis_key = f"gcra:{md5_text(key).hexdigest()}"
+        if project is not None:
+            redis_key += f":{project.id}"
+        return redis_key
+
+    def current_value(
+        self, key: str, project: Project | None = None, window: int | None = None
+    ) -> int:
+        """
+        Get the number of requests currently counted against the limit with key "key".
+        """
+        redis_key = self._construct_redis_key(key, project=project)
+
+        try:
+            tat, interval = self.client.hmget(redis_key, ["tat", "interval"])
+        except RedisError:
+            logger.exception("Failed to retrieve current value from redis")
+            return 0
+
+        if tat is None or interval is None:
+            return 0
+        return max(0, math.ceil((float(tat) - time() * 1000) / float(interval)))
+
+    def is_limited_with_value(
+        self, key: str, limit: int, project: Project | None = None, window: int | None = None
+    ) -> tuple[bool, int, int]:
+        result = self.is_limited_many([RateLimitCheck(key, limit, project, window)])
+        assert result is not None
+        return result.is_limited, result.current, result.reset_time
+
+    def _take_from_lease(self, lease_key: tuple[str, int, int]) -> LocalLease | None:
+        if self._leases is None:
+            return None
+
+        with self._lock:
+            lease = self._leases.get(lease_key)
+            if lease is None or lease.remaining <= 0:
+                return None
+            lease.remaining -= 1
+            lease.current += 1
+            return lease
+
+    def is_limited_many(self, checks: Sequence[RateLimitCheck]) -> RateLimitCheckResult | None:
+        now = time()
+        results: list[RateLimitCheckResult] = []
+        pending: list[tuple[RateLimitCheck, tuple[str, int, int], int, int]] = []
+
+        for check in checks:
+            window = check.window or self.window
+            redis_key = self._construct_redis_key(check.key, project=check.project)
+            lease_key = (redis_key, check.limit, window)
+
+            lease = self._take_from_lease(lease_key)
+            if lease is not None:
+                results.append(RateLimitCheckResult(False, check, lease.current, lease.reset_time))
+                continue
+
+            requested = 1
+            if self._leases is not None:
+                requested = max(1, int(check.limit * self.local_lease_fraction))
+            pending.append((check, lease_key, window, requested))
+
+        if results:
+            metrics.incr("ratelimits.gcra.local_hits", amount=len(results))
+
+        if pending:
+            results.extend(self._check_redis(now, pending))
+
+        return tightest_result(results)
+
+    def _check_redis(
+        self, now: float, pending: list[tuple[RateLimitCheck, tuple[str, int, int], int, int]]
+    ) -> list[RateLimitCheckResult]:
+        now_ms = int(now * 1000)
+
+        calls = []
+        for check, (redis_key, _, _), window, requested in pending:
+            window_ms = window * 1000
+            min_available = 1
+            if requested > 1:
+                min_available = requested + math.ceil(check.limit * self.local_lease_headroom)
+            calls.append(
+                (redis_key, [now_ms, window_ms / check.limit, window_ms, requested, min_available])
+            )
+
+        try:
+            try:
+                responses = self._execute(calls)
+            except NoScriptError:
+                # Unlike regular pipelines, cluster pipelines do not load
+                # scripts before executing them.
+                self.client.script_load(gcra.script)
+                responses = self._execute(calls)
+        except RedisError:
+            # We don't want rate limited endpoints to fail when ratelimits
+            # can't be updated. We do want to know when that happens.
+            logger.exception("Failed to check rate limits in redis")
+            return [
+                RateLimitCheckResult(False, check, 0, int(now) + window)
+                for check, _, window, _ in pending
+            ]
+
+        results = []
+        for (check, lease_key, window, _), (reserved, tat_ms) in zip(pending, responses):
+            interval = window * 1000 / check.limit
+            reset_time = math.ceil(tat_ms / 1000)
+            used = math.ceil((tat_ms - now_ms) / interval)
+
+            if not reserved:
+                results.append(RateLimitCheckResult(True, check, used, reset_time))
+                continue
+
+            current = used - (reserved - 1)
+            if reserved > 1 and self._leases is not None:
+                with self._lock:
+                    self._leases[lease_key] = LocalLease(reserved - 1, current, reset_time)
+            results.append(RateLimitCheckResult(False, check, current, reset_time))
+
+        return results
+
+    def _execute(self, calls: list[tuple[str, list[Any]]]) -> list[Any]:
+        with self.client.pipeline(transaction=False) as pipe:
+            for redis_key, args in calls:
+                gcra([redis_key], args, pipe)
+            return pipe.execute()
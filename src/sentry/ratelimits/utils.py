@@ -11,6 +11,7 @@ from rest_framework.response import Response
 from sentry import features
 from sentry.auth.services.auth import AuthenticatedToken
 from sentry.constants import SentryAppInstallationStatus
+from sentry.ratelimits.base import RateLimitCheck
 from sentry.ratelimits.concurrent import ConcurrentRateLimiter
 from sentry.ratelimits.config import DEFAULT_RATE_LIMIT_CONFIG, RateLimitConfig
 from sentry.types.ratelimit import RateLimit, RateLimitCategory, RateLimitMeta, RateLimitType
@@ -241,29 +242,27 @@ def for_organization_member_invite(
     if not features.has("organizations:invite-members-rate-limits", organization, actor=user):
         return False
 
-    return any(
-        (
-            (
-                ratelimiter.is_limited(
-                    "members:invite-by-user:{}".format(
-                        md5_text(
-                            user.id if user and user.is_authenticated else str(auth)
-                        ).hexdigest()
-                    ),
-                    **config["members:invite-by-user"],
-                )
-                if (user or auth)
-                else None
+    checks = [
+        RateLimitCheck(
+            f"members:invite-by-org:{md5_text(organization.id).hexdigest()}",
+            **config["members:invite-by-org"],
+        ),
+        RateLimitCheck(
+            "members:org-invite-to-email:{}-{}".format(
+                organization.id, md5_text(email.lower()).hexdigest()
             ),
-            ratelimiter.is_limited(
-                f"members:invite-by-org:{md5_text(organization.id).hexdigest()}",
-                **config["members:invite-by-org"],
-            ),
-            ratelimiter.is_limited(
-                "members:org-invite-to-email:{}-{}".format(
-                    organization.id, md5_text(email.lower()).hexdigest()
+            **config["members:org-invite-to-email"],
+        ),
+    ]
+    if user or auth:
+        checks.append(
+            RateLimitCheck(
+                "members:invite-by-user:{}".format(
+                    md5_text(user.id if user and user.is_authenticated else str(auth)).hexdigest()
                 ),
-                **config["members:org-invite-to-email"],
-            ),
+                **config["members:invite-by-user"],
+            )
         )
-    )
+
+    result = ratelimiter.is_limited_many(checks)
+    return result is not None and result.is_limited
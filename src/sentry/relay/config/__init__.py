@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+import contextlib
 import logging
 import uuid
-from collections.abc import Iterable, Mapping, MutableMapping, Sequence
+from collections.abc import Generator, Iterable, Mapping, MutableMapping, Sequence
 from datetime import datetime, timezone
 from typing import Any, Literal, NotRequired, TypedDict
 
@@ -281,7 +282,9 @@ def get_metrics_config(timeout: TimeChecker, project: Project) -> Mapping[str, A
 
 
 def get_project_config(
-    project: Project, project_keys: Iterable[ProjectKey] | None = None
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None = None,
+    organization_sections: Mapping[str, Any] | None = None,
 ) -> ProjectConfig:
     """Constructs the ProjectConfig information.
     :param project: The project to load configuration for. Ensure that
@@ -291,6 +294,9 @@ def get_project_config(
         no project keys are provided it is assumed that the config does not
         need to contain auth information (this is the case when used in
         python's StoreView)
+    :param organization_sections: Pre-computed result of
+        :func:`get_organization_config_sections` for the project's
+        organization, to share it between the configs of all its projects.
     :return: a ProjectConfig object for the given project
     """
     with sentry_sdk.isolation_scope() as scope:
@@ -299,7 +305,51 @@ def get_project_config(
             sentry_sdk.start_transaction(name="get_project_config"),
             metrics.timer("relay.config.get_project_config.duration"),
         ):
-            return _get_project_config(project, project_keys=project_keys)
+            return _get_project_config(
+                project, project_keys=project_keys, organization_sections=organization_sections
+            )
+
+
+@contextlib.contextmanager
+def measure_config_section(section: str) -> Generator[None, None, None]:
+    """Traces the computation of a section of the project config and records
+    its duration in the ``relay.config.section.duration`` histogram."""
+    with (
+        sentry_sdk.start_span(op=f"get_{section}"),
+        metrics.timer("relay.config.section.duration", tags={"section": section}),
+    ):
+        yield
+
+
+def get_organization_config_sections(organization: Organization) -> Mapping[str, Any]:
+    """Computes the sections of the project config that only depend on the
+    organization, so that they can be computed once for all its projects.
+
+    Sections that evaluate to nothing are omitted.
+    """
+    sections: dict[str, Any] = {}
+
+    with measure_config_section("trusted_relays"):
+        sections["trustedRelays"] = [
+            r["public_key"] for r in organization.get_option("sentry:trusted-relays", []) if r
+        ]
+
+    with measure_config_section("performance_score"):
+        performance_score_profiles = [
+            *_get_desktop_browser_performance_profiles(organization),
+            *_get_mobile_browser_performance_profiles(organization),
+            *_get_mobile_performance_profiles(organization),
+            *_get_default_browser_performance_profiles(organization),
+        ]
+        if performance_score_profiles:
+            sections["performanceScore"] = {"profiles": performance_score_profiles}
+
+    with measure_config_section("event_retention"):
+        event_retention = quotas.backend.get_event_retention(organization)
+        if event_retention is not None:
+            sections["eventRetention"] = event_retention
+
+    return sections
 
 
 def get_dynamic_sampling_config(timeout: TimeChecker, project: Project) -> Mapping[str, Any] | None:
@@ -1001,14 +1051,19 @@ def _get_mobile_performance_profiles(organization: Organization) -> list[dict[st
 
 
 def _get_project_config(
-    project: Project, project_keys: Iterable[ProjectKey] | None = None
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None = None,
+    organization_sections: Mapping[str, Any] | None = None,
 ) -> ProjectConfig:
     if project.status != ObjectStatus.ACTIVE:
         return ProjectConfig(project, disabled=True)
 
+    if organization_sections is None:
+        organization_sections = get_organization_config_sections(project.organization)
+
     public_keys = get_public_key_configs(project_keys=project_keys)
 
-    with sentry_sdk.start_span(op="get_public_config"):
+    with measure_config_section("public_config"):
         now = datetime.now(timezone.utc)
         cfg = {
             "disabled": False,
@@ -1019,11 +1074,7 @@ def _get_project_config(
             "publicKeys": public_keys,
             "config": {
                 "allowedDomains": list(get_origins(project)),
-                "trustedRelays": [
-                    r["public_key"]
-                    for r in project.organization.get_option("sentry:trusted-relays", [])
-                    if r
-                ],
+                "trustedRelays": organization_sections["trustedRelays"],
                 "piiConfig": get_pii_config(project),
                 "datascrubbingSettings": get_datascrubbing_settings(project),
             },
@@ -1033,7 +1084,7 @@ def _get_project_config(
 
     config = cfg["config"]
 
-    with sentry_sdk.start_span(op="get_exposed_features"):
+    with measure_config_section("exposed_features"):
         if exposed_features := get_exposed_features(project):
             config["features"] = exposed_features
 
@@ -1081,27 +1132,19 @@ def _get_project_config(
         ),
     }
 
-    performance_score_profiles = [
-        *_get_desktop_browser_performance_profiles(project.organization),
-        *_get_mobile_browser_performance_profiles(project.organization),
-        *_get_mobile_performance_profiles(project.organization),
-        *_get_default_browser_performance_profiles(project.organization),
-    ]
-    if performance_score_profiles:
-        config["performanceScore"] = {"profiles": performance_score_profiles}
+    if "performanceScore" in organization_sections:
+        config["performanceScore"] = organization_sections["performanceScore"]
 
-    with sentry_sdk.start_span(op="get_filter_settings"):
+    with measure_config_section("filter_settings"):
         if filter_settings := get_filter_settings(project):
             config["filterSettings"] = filter_settings
-    with sentry_sdk.start_span(op="get_grouping_config_dict_for_project"):
+    with measure_config_section("grouping_config_dict_for_project"):
         grouping_config = get_grouping_config_dict_for_project(project)
         if grouping_config is not None:
             config["groupingConfig"] = grouping_config
-    with sentry_sdk.start_span(op="get_event_retention"):
-        event_retention = quotas.backend.get_event_retention(project.organization)
-        if event_retention is not None:
-            config["eventRetention"] = event_retention
-    with sentry_sdk.start_span(op="get_all_quotas"):
+    if "eventRetention" in organization_sections:
+        config["eventRetention"] = organization_sections["eventRetention"]
+    with measure_config_section("all_quotas"):
         if quotas_config := get_quotas(project, keys=project_keys):
             config["quotas"] = quotas_config
 
@@ -5,6 +5,8 @@ from typing import Any, Concatenate, ParamSpec, Protocol, TypeVar
 
 import sentry_sdk
 
+from sentry.utils import metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,7 +83,10 @@ def build_safe_config(
     """
     timeout = TimeChecker(_FEATURE_BUILD_TIMEOUT)
 
-    with sentry_sdk.start_span(op=f"project_config.build_safe_config.{key}"):
+    with (
+        sentry_sdk.start_span(op=f"project_config.build_safe_config.{key}"),
+        metrics.timer("relay.config.section.duration", tags={"section": key}),
+    ):
         try:
             return function(timeout, *args, **kwargs)
         except TimeoutException as e:
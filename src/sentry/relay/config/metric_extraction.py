@@ -53,6 +53,7 @@ from sentry.snuba.models import SnubaQuery
 from sentry.snuba.referrer import Referrer
 from sentry.utils import json, metrics
 from sentry.utils.cache import cache
+from sentry.utils.hashlib import md5_text
 
 OnDemandExtractionState = DashboardWidgetQueryOnDemand.OnDemandExtractionState
 
@@ -67,6 +68,13 @@ _METRIC_EXTRACTION_VERSION = 4
 _WIDGET_QUERY_CARDINALITY_TTL = 3600 * 24  # 24h
 _WIDGET_QUERY_CARDINALITY_SOFT_DEADLINE_TTL = 3600 * 0.5  # 30m
 
+# Version of the entries in the on-demand spec cache. Bump it whenever the
+# conversion of queries into specs changes, to invalidate all entries.
+_SPEC_CACHE_VERSION = 1
+# TTL of on-demand spec cache entries. Entries of widgets are refreshed well
+# within it by the `schedule_on_demand_check` task.
+_SPEC_CACHE_TTL = 3600 * 24 * 7  # 7d
+
 HashedMetricSpec = tuple[str, MetricSpec, SpecVersion]
 
 
@@ -487,7 +495,7 @@ def _merge_metric_specs(
 
 
 def _convert_snuba_query_to_metrics(
-    project: Project, snuba_query: SnubaQuery, prefilling: bool
+    project: Project, snuba_query: SnubaQuery, prefilling: bool, refresh_spec_cache: bool = False
 ) -> Sequence[HashedMetricSpec] | None:
     """
     If the passed snuba_query is a valid query for on-demand metric extraction,
@@ -501,14 +509,24 @@ def _convert_snuba_query_to_metrics(
         snuba_query.query,
         environment,
         prefilling,
+        refresh_spec_cache=refresh_spec_cache,
     )
 
 
+def cache_snuba_query_specs(project: Project, snuba_query: SnubaQuery, prefilling: bool) -> None:
+    """
+    Converts the query of an alert and stores the resulting specs in the
+    on-demand spec cache, so that building project configs only looks them up.
+    """
+    _convert_snuba_query_to_metrics(project, snuba_query, prefilling, refresh_spec_cache=True)
+
+
 def convert_widget_query_to_metric(
     project: Project,
     widget_query: DashboardWidgetQuery,
     prefilling: bool,
     organization_bulk_query_cache: dict[int, dict[str, bool]] | None = None,
+    refresh_spec_cache: bool = False,
 ) -> list[HashedMetricSpec]:
     """
     Converts a passed metrics widget query to one or more MetricSpecs.
@@ -524,7 +542,13 @@ def convert_widget_query_to_metric(
 
     for aggregate in aggregates:
         metrics_specs += _generate_metric_specs(
-            aggregate, widget_query, project, prefilling, groupbys, organization_bulk_query_cache
+            aggregate,
+            widget_query,
+            project,
+            prefilling,
+            groupbys,
+            organization_bulk_query_cache,
+            refresh_spec_cache=refresh_spec_cache,
         )
 
     return metrics_specs
@@ -537,6 +561,7 @@ def _generate_metric_specs(
     prefilling: bool,
     groupbys: Sequence[str] | None = None,
     organization_bulk_query_cache: dict[int, dict[str, bool]] | None = None,
+    refresh_spec_cache: bool = False,
 ) -> list[HashedMetricSpec]:
     metrics_specs = []
     metrics.incr("on_demand_metrics.before_widget_spec_generation")
@@ -552,6 +577,7 @@ def _generate_metric_specs(
         groupbys=groupbys,
         spec_type=MetricSpecType.DYNAMIC_QUERY,
         organization_bulk_query_cache=organization_bulk_query_cache,
+        refresh_spec_cache=refresh_spec_cache,
     ):
         for spec in results:
             metrics.incr(
@@ -791,6 +817,49 @@ def _is_widget_query_low_cardinality(widget_query: DashboardWidgetQuery, project
     return True
 
 
+def _get_spec_cache_keys(
+    dataset: str,
+    aggregate: str,
+    query: str,
+    environment: str | None,
+    prefilling: bool,
+    spec_type: MetricSpecType,
+    groupbys: Sequence[str] | None,
+) -> dict[int, str]:
+    """Returns the on-demand spec cache key of the query for every spec version."""
+    # Prefilling only changes whether the transactions dataset is supported.
+    prefilling = prefilling and dataset == Dataset.Transactions.value
+    query_hash = md5_text(
+        json.dumps(
+            [dataset, aggregate, query, environment, prefilling, spec_type.value, groupbys or []]
+        )
+    ).hexdigest()
+    return {
+        spec_version.version: f"on-demand-spec:{_SPEC_CACHE_VERSION}:{spec_version.version}:{query_hash}"
+        for spec_version in OnDemandMetricSpecVersioning.get_spec_versions()
+    }
+
+
+def _get_cached_specs(cache_keys: dict[int, str]) -> list[HashedMetricSpec] | None:
+    """
+    Looks up the specs of a query in the on-demand spec cache. Returns `None`
+    unless all spec versions are cached.
+    """
+    cached = cache.get_many(list(cache_keys.values()))
+    if len(cached) < len(cache_keys):
+        metrics.incr("on_demand_metrics.spec_cache", tags={"result": "miss"})
+        return None
+
+    metrics.incr("on_demand_metrics.spec_cache", tags={"result": "hit"})
+    specs = []
+    for spec_version in OnDemandMetricSpecVersioning.get_spec_versions():
+        # Entries are empty for queries that have no valid spec in a version.
+        if entry := cached[cache_keys[spec_version.version]]:
+            query_hash, metric_spec = entry
+            specs.append((query_hash, metric_spec, spec_version))
+    return specs
+
+
 def _convert_aggregate_and_query_to_metrics(
     project: Project,
     dataset: str,
@@ -801,14 +870,75 @@ def _convert_aggregate_and_query_to_metrics(
     spec_type: MetricSpecType = MetricSpecType.SIMPLE_QUERY,
     groupbys: Sequence[str] | None = None,
     organization_bulk_query_cache: dict[int, dict[str, bool]] | None = None,
+    refresh_spec_cache: bool = False,
 ) -> Sequence[HashedMetricSpec] | None:
     """
     Converts an aggregate and a query to a metric spec with its hash value.
 
     Extra metric specs will be returned if we need to maintain various versions of it.
     This makes it easier to maintain multiple spec versions when a mistake is made.
+
+    With the `on_demand_metrics.spec_cache.enable` option, specs are looked up
+    in the on-demand spec cache first, and stored there once computed. Specs
+    that depend on the project (e.g. apdex) are never cached. Pass
+    `refresh_spec_cache` to recompute and overwrite cached specs.
     """
+    spec_cache_keys = None
+    if options.get("on_demand_metrics.spec_cache.enable"):
+        spec_cache_keys = _get_spec_cache_keys(
+            dataset, aggregate, query, environment, prefilling, spec_type, groupbys
+        )
+        if not refresh_spec_cache:
+            cached_specs = _get_cached_specs(spec_cache_keys)
+            if cached_specs is not None:
+                return cached_specs
+
+    specs = _compute_aggregate_and_query_specs(
+        project,
+        dataset,
+        aggregate,
+        query,
+        environment,
+        prefilling,
+        spec_type,
+        groupbys,
+        organization_bulk_query_cache,
+    )
+
+    if spec_cache_keys is not None:
+        cache_entries: dict[str, tuple[str, MetricSpec] | tuple[()]] = {
+            key: () for key in spec_cache_keys.values()
+        }
+        for query_hash, metric_spec, spec_version, is_project_dependent in specs or []:
+            if is_project_dependent:
+                del cache_entries[spec_cache_keys[spec_version.version]]
+            else:
+                cache_entries[spec_cache_keys[spec_version.version]] = (query_hash, metric_spec)
+        cache.set_many(cache_entries, timeout=_SPEC_CACHE_TTL)
 
+    if specs is None:
+        return None
+    return [
+        (query_hash, metric_spec, spec_version)
+        for query_hash, metric_spec, spec_version, _ in specs
+    ]
+
+
+def _compute_aggregate_and_query_specs(
+    project: Project,
+    dataset: str,
+    aggregate: str,
+    query: str,
+    environment: str | None,
+    prefilling: bool,
+    spec_type: MetricSpecType,
+    groupbys: Sequence[str] | None,
+    organization_bulk_query_cache: dict[int, dict[str, bool]] | None,
+) -> list[tuple[str, MetricSpec, SpecVersion, bool]] | None:
+    """
+    Computes the specs of `_convert_aggregate_and_query_to_metrics`, along
+    with whether each spec depends on the project.
+    """
     # We can avoid injection of the environment in the query, since it's supported by standard, thus it won't change
     # the supported state of a query, since if it's standard, and we added environment it will still be standard
     # and if it's on demand, it will always be on demand irrespectively of what we add.
@@ -848,7 +978,12 @@ def _convert_aggregate_and_query_to_metrics(
                     )
 
                 metric_specs_and_hashes.append(
-                    (on_demand_spec.query_hash, metric_spec, spec_version)
+                    (
+                        on_demand_spec.query_hash,
+                        metric_spec,
+                        spec_version,
+                        on_demand_spec.is_project_dependent(),
+                    )
                 )
             except ValueError:
                 # raised by validate_sampling_condition or metric_spec lacking "condition"
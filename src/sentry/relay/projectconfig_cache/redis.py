@@ -1,9 +1,11 @@
+import hashlib
 import logging
 from collections.abc import Mapping
 from typing import Any
 
 import zstandard
 
+from sentry import options
 from sentry.relay.projectconfig_cache.base import ProjectConfigCache
 from sentry.utils import json, metrics, redis
 from sentry.utils.redis import validate_dynamic_cluster
@@ -13,6 +15,16 @@ COMPRESSION_LEVEL = 3  # 3 is the default level of compression
 
 logger = logging.getLogger(__name__)
 
+#: Fields that are different every time a config is computed, and are
+#: therefore excluded from its content hash.
+VOLATILE_FIELDS = frozenset(("lastFetch", "lastChange", "rev"))
+
+
+def get_content_hash(config: Mapping[str, Any]) -> str:
+    """Hashes everything in a project config except for its volatile fields."""
+    content = {key: value for key, value in config.items() if key not in VOLATILE_FIELDS}
+    return hashlib.sha1(json.dumps(content).encode()).hexdigest()
+
 
 class RedisProjectConfigCache(ProjectConfigCache):
     def __init__(self, **options):
@@ -33,12 +45,51 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def __get_redis_rev_key(self, public_key):
         return f"{self.__get_redis_key(public_key)}.rev"
 
+    def __get_redis_hash_key(self, public_key):
+        return f"{self.__get_redis_key(public_key)}.hash"
+
+    def __get_unchanged(self, hashes: Mapping[str, str]) -> set[str]:
+        """Returns the public keys whose cached config has the given content hash."""
+        public_keys = list(hashes)
+        with self.cluster.pipeline(transaction=False) as p:
+            for public_key in public_keys:
+                p.get(self.__get_redis_hash_key(public_key))
+                p.exists(self.__get_redis_key(public_key))
+            results = p.execute()
+
+        return {
+            public_key
+            for public_key, cached_hash, exists in zip(public_keys, results[::2], results[1::2])
+            if exists and cached_hash is not None and cached_hash.decode() == hashes[public_key]
+        }
+
     def set_many(self, configs: dict[str, Mapping[str, Any]]):
         metrics.incr("relay.projectconfig_cache.write", amount=len(configs), tags={"action": "set"})
 
+        hashes: dict[str, str] = {}
+        unchanged: set[str] = set()
+        if configs and options.get("relay.project-config-cache.skip-unchanged"):
+            hashes = {
+                public_key: get_content_hash(config) for public_key, config in configs.items()
+            }
+            unchanged = self.__get_unchanged(hashes)
+            metrics.incr(
+                "relay.projectconfig_cache.write",
+                amount=len(unchanged),
+                tags={"action": "unchanged"},
+            )
+
         # Note: Those are multiple pipelines, one per cluster node.
         p = self.cluster.pipeline(transaction=False)
         for public_key, config in configs.items():
+            if public_key in unchanged:
+                # Keep the cached config, including its revision, and only
+                # extend its lifetime as if it had been written.
+                p.expire(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT)
+                p.expire(self.__get_redis_rev_key(public_key), REDIS_CACHE_TIMEOUT)
+                p.expire(self.__get_redis_hash_key(public_key), REDIS_CACHE_TIMEOUT)
+                continue
+
             serialized = json.dumps(config).encode()
             compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
             metrics.distribution(
@@ -58,6 +109,11 @@ class RedisProjectConfigCache(ProjectConfigCache):
             if rev := config.get("rev"):
                 p.setex(self.__get_redis_rev_key(public_key), REDIS_CACHE_TIMEOUT, rev)
 
+            if content_hash := hashes.get(public_key):
+                p.setex(self.__get_redis_hash_key(public_key), REDIS_CACHE_TIMEOUT, content_hash)
+            else:
+                p.delete(self.__get_redis_hash_key(public_key))
+
         p.execute()
 
     def delete_many(self, public_keys):
@@ -65,10 +121,13 @@ class RedisProjectConfigCache(ProjectConfigCache):
         with self.cluster.pipeline() as p:
             for public_key in public_keys:
                 p.delete(self.__get_redis_key(public_key))
+                p.delete(self.__get_redis_hash_key(public_key))
             return_values = p.execute()
 
         metrics.incr(
-            "relay.projectconfig_cache.write", amount=sum(return_values), tags={"action": "delete"}
+            "relay.projectconfig_cache.write",
+            amount=sum(return_values[::2]),
+            tags={"action": "delete"},
         )
 
     def get(self, public_key):
@@ -0,0 +1,118 @@
+import os
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import click
+
+from sentry.runner.decorators import configuration
+from sentry.utils.iterators import chunked
+
+
+@click.group()
+def nodestore() -> None:
+    """Tools for interacting with nodestore."""
+
+
+@nodestore.command("train-dictionaries")
+@click.option(
+    "--project",
+    "project_ids",
+    type=int,
+    multiple=True,
+    required=True,
+    help="Project to sample events from. Can be given multiple times.",
+)
+@click.option("--days", default=7, show_default=True, help="How far back to sample events.")
+@click.option(
+    "--samples", default=5000, show_default=True, help="Number of events to sample per project."
+)
+@click.option(
+    "--min-samples",
+    default=100,
+    show_default=True,
+    help="Skip platforms with fewer sampled events than this.",
+)
+@click.option(
+    "--dictionary-size",
+    default=112640,
+    show_default=True,
+    help="Maximum size of each dictionary in bytes.",
+)
+@click.option(
+    "--output",
+    type=click.Path(file_okay=False, writable=True),
+    default=None,
+    help="Directory to write dictionaries to. Defaults to SENTRY_NODESTORE_DICTIONARY_DIR.",
+)
+@configuration
+def train_dictionaries(
+    project_ids: tuple[int, ...],
+    days: int,
+    samples: int,
+    min_samples: int,
+    dictionary_size: int,
+    output: str | None,
+) -> None:
+    """
+    Train per-platform zstd dictionaries from a sample of stored events.
+
+    A new version is written for every platform, which will be used for
+    writes once `nodestore.compression.use-dictionaries` is enabled. Existing
+    dictionaries are kept, as they are still needed to read older nodes.
+    """
+    import zstandard
+    from django.conf import settings
+
+    from sentry import eventstore, nodestore
+    from sentry.eventstore.base import Filter
+    from sentry.eventstore.models import Event
+    from sentry.models.project import Project
+    from sentry.nodestore.base import json_dumps
+    from sentry.nodestore.compression import dictionary_filename
+
+    output = output or settings.SENTRY_NODESTORE_DICTIONARY_DIR
+    if not output:
+        raise click.ClickException(
+            "No --output given and SENTRY_NODESTORE_DICTIONARY_DIR is unset."
+        )
+    os.makedirs(output, exist_ok=True)
+
+    end = datetime.now(timezone.utc)
+    start = end - timedelta(days=days)
+
+    payloads: dict[str, list[bytes]] = defaultdict(list)
+    for project in Project.objects.filter(id__in=project_ids):
+        events = eventstore.backend.get_events(
+            filter=Filter(project_ids=[project.id], start=start, end=end),
+            limit=samples,
+            referrer="nodestore.train_dictionaries",
+            tenant_ids={"organization_id": project.organization_id},
+        )
+        for chunk in chunked(events, 100):
+            node_ids = {
+                Event.generate_node_id(project.id, event.event_id): event.platform or "other"
+                for event in chunk
+            }
+            for node_id, data in nodestore.backend.get_multi(list(node_ids)).items():
+                if data:
+                    payloads[node_ids[node_id]].append(json_dumps(data).encode("utf8"))
+
+    version = int(time.time())
+    for platform, platform_payloads in sorted(payloads.items()):
+        if len(platform_payloads) < min_samples:
+            click.echo(f"Skipping {platform}: only {len(platform_payloads)} samples")
+            continue
+
+        dictionary = zstandard.train_dictionary(dictionary_size, platform_payloads)
+        path = os.path.join(output, dictionary_filename(platform, version))
+        with open(path, "wb") as f:
+            f.write(dictionary.as_bytes())
+
+        raw_size = sum(len(p) for p in platform_payloads)
+        compressor = zstandard.ZstdCompressor(dict_data=dictionary)
+        compressed_size = sum(len(compressor.compress(p)) for p in platform_payloads)
+        click.echo(
+            f"{platform}: {len(platform_payloads)} samples, dictionary {dictionary.dict_id()}, "
+            f"ratio {compressed_size / raw_size:.3f} -> {path}"
+        )
@@ -84,6 +84,20 @@ local function variadic_argument_parser(argument_parser)
     end
 end
 
+local function counted_argument_parser(argument_parser)
+    -- Parses a count followed by that many arguments, which allows a list
+    -- to be followed by further arguments (unlike the variadic parser.)
+    return function (cursor, arguments)
+        local count = tonumber(arguments[cursor])
+        cursor = cursor + 1
+        local results = {}
+        for i = 1, count do
+            cursor, results[i] = argument_parser(cursor, arguments)
+        end
+        return cursor, results
+    end
+end
+
 local function multiple_argument_parser(...)
     local parsers = {...}
     return function (cursor, arguments)
@@ -338,6 +352,42 @@ local function close_digest(configuration, timeline_id, delay_minimum, record_id
     end
 end
 
+local function digest_timelines(configuration, lock, timeline_capacity, timeline_ids)
+    -- Opens the digests of many timelines at once. Each timeline is locked
+    -- using the same lock key as the lock that is held while digesting or
+    -- deleting a single timeline, so this excludes those operations (and
+    -- other batches) for the duration of the lock. Timelines that are locked
+    -- or are not in the ready state are skipped and reported as such.
+    local results = {}
+    for i, timeline_id in ipairs(timeline_ids) do
+        local lock_key = lock:get_lock_key(configuration, timeline_id)
+        if redis.call('SET', lock_key, lock.value, 'NX', 'EX', lock.duration) == false then
+            results[i] = {timeline_id, 'locked', {}}
+        elseif redis.call('ZSCORE', configuration:get_schedule_ready_key(), timeline_id) == false then
+            redis.call('DEL', lock_key)
+            results[i] = {timeline_id, 'invalid_state', {}}
+        else
+            results[i] = {timeline_id, 'ok', digest_timeline(configuration, timeline_id, timeline_capacity)}
+        end
+    end
+    return results
+end
+
+local function close_digests(configuration, lock, digests)
+    -- Closes the digests opened by ``digest_timelines`` that were processed
+    -- successfully and releases the locks of all of them.
+    for _, digest in ipairs(digests) do
+        if digest.close == 1 then
+            close_digest(configuration, digest.timeline_id, digest.delay_minimum, digest.record_ids)
+        end
+
+        local lock_key = lock:get_lock_key(configuration, digest.timeline_id)
+        if redis.call('GET', lock_key) == lock.value then
+            redis.call('DEL', lock_key)
+        end
+    end
+end
+
 local function delete_timeline(configuration, timeline_id)
     truncate_timeline(configuration, timeline_id, 0)
     truncate_digest(configuration, timeline_id, 0)
@@ -383,6 +433,18 @@ local configuration_argument_parser = object_argument_parser({
     return configuration
 end)
 
+local lock_argument_parser = object_argument_parser({
+    {"prefix", argument_parser()},
+    {"value", argument_parser()},
+    {"duration", argument_parser(tonumber)},
+}, function (lock)
+    function lock:get_lock_key(configuration, timeline_id)
+        return self.prefix .. configuration:get_timeline_key(timeline_id)
+    end
+
+    return lock
+end)
+
 local commands = {
     SCHEDULE = function (cursor, arguments)
         local cursor, configuration, deadline = multiple_argument_parser(
@@ -448,6 +510,30 @@ local commands = {
         )(cursor, arguments)
         return close_digest(configuration, timeline_id, delay_minimum, record_ids)
     end,
+    DIGEST_OPEN_MANY = function (cursor, arguments)
+        local cursor, configuration, lock, timeline_capacity, timeline_ids = multiple_argument_parser(
+            configuration_argument_parser,
+            lock_argument_parser,
+            argument_parser(tonumber),
+            variadic_argument_parser(argument_parser())
+        )(cursor, arguments)
+        return digest_timelines(configuration, lock, timeline_capacity, timeline_ids)
+    end,
+    DIGEST_CLOSE_MANY = function (cursor, arguments)
+        local cursor, configuration, lock, digests = multiple_argument_parser(
+            configuration_argument_parser,
+            lock_argument_parser,
+            variadic_argument_parser(
+                object_argument_parser({
+                    {"timeline_id", argument_parser()},
+                    {"close", argument_parser(tonumber)},
+                    {"delay_minimum", argument_parser(tonumber)},
+                    {"record_ids", counted_argument_parser(argument_parser())},
+                })
+            )
+        )(cursor, arguments)
+        return close_digests(configuration, lock, digests)
+    end,
 }
 
 local cursor, command = argument_parser(
@@ -0,0 +1,57 @@
+-- Estimates the cardinality of a sliding window of HyperLogLog sketches and
+-- checks which of the given hashes are new to it, without modifying it.
+--
+-- The window is made up of one sketch per granule and shard. Shards partition
+-- the hashes, so the total cardinality is the sum of the cardinalities of the
+-- shards, each of which is the merged cardinality of its granules.
+--
+-- Input:
+-- keys:
+--  tmp_key, followed by the granule keys of every shard, shard by shard
+-- args:
+--  num_shards, num_granules, followed by a shard and a hash for every hash to check
+--
+-- Output:
+-- cardinality, followed by a flag for every hash: 1 if the hash is certainly
+-- not part of the window, 0 if it probably is
+local tmp_key = KEYS[1]
+local num_shards = tonumber(ARGV[1])
+local num_granules = tonumber(ARGV[2])
+
+local function get_shard_keys(shard)
+    local keys = {}
+    for i = 1, num_granules do
+        keys[i] = KEYS[1 + shard * num_granules + i]
+    end
+    return keys
+end
+
+local hashes_by_shard = {}
+local num_hashes = 0
+for i = 3, #ARGV, 2 do
+    num_hashes = num_hashes + 1
+    local shard = tonumber(ARGV[i])
+    if hashes_by_shard[shard] == nil then
+        hashes_by_shard[shard] = {}
+    end
+    table.insert(hashes_by_shard[shard], {num_hashes, ARGV[i + 1]})
+end
+
+local result = {0}
+for shard = 0, num_shards - 1 do
+    local shard_keys = get_shard_keys(shard)
+    result[1] = result[1] + redis.call('PFCOUNT', unpack(shard_keys))
+
+    local hashes = hashes_by_shard[shard]
+    if hashes ~= nil then
+        -- PFADD only reports whether the sketch changed, so the hashes are
+        -- added to a copy of the merged window which is thrown away after.
+        redis.call('PFMERGE', tmp_key, unpack(shard_keys))
+        for _, hash in ipairs(hashes) do
+            result[1 + hash[1]] = redis.call('PFADD', tmp_key, hash[2])
+        end
+        redis.call('DEL', tmp_key)
+    end
+end
+
+return result
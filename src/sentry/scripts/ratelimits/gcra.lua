@@ -0,0 +1,50 @@
+-- Generic cell rate algorithm (GCRA) rate limiter.
+--
+-- Instead of counting requests per window, a limit is tracked as the
+-- theoretical arrival time (TAT) of the next request: every request moves it
+-- forward by one emission interval (window / limit), and a request is allowed
+-- as long as the TAT does not end up more than one window ahead of now. This
+-- allows bursts of up to <limit> requests and then smoothly refills, without
+-- the double burst at window boundaries of a fixed window.
+--
+-- Several requests can be reserved at once (to be handed out by a local cache
+-- on the application server), but only while the limit is far from exhausted.
+-- Otherwise, a single request is reserved.
+--
+-- Input:
+-- keys:
+--  redis_key
+-- args:
+--  current_time_ms, emission_interval_ms, window_ms, requested, min_available
+--
+-- Output:
+-- reserved (0 if the request is limited), tat_ms
+local key = KEYS[1]
+
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local window = tonumber(ARGV[3])
+-- the number of requests to reserve, if at least <min_available> are available
+local requested = tonumber(ARGV[4])
+local min_available = tonumber(ARGV[5])
+
+local tat = tonumber(redis.call('HGET', key, 'tat'))
+if tat == nil or tat < now then
+    tat = now
+end
+
+local available = math.floor((now + window - tat) / interval)
+if available < 1 then
+    return {0, math.ceil(tat)}
+end
+
+local reserved = 1
+if available >= min_available then
+    reserved = math.min(requested, available)
+end
+
+tat = tat + reserved * interval
+redis.call('HSET', key, 'tat', tat, 'interval', interval)
+redis.call('PEXPIRE', key, math.ceil(tat - now))
+
+return {reserved, math.ceil(tat)}
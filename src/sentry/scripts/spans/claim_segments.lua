@@ -0,0 +1,27 @@
+-- Claims the segments of a partition that are ready to be processed, i.e.
+-- were first seen at or before the given timestamp, by removing them from the
+-- schedule. At most `count` segments are claimed, oldest first.
+--
+-- Returns the number of segments left in the schedule and the first seen
+-- timestamp of the oldest of them (or nil if the schedule is empty), followed
+-- by the claimed segment keys, each followed by its first seen timestamp.
+assert(#KEYS == 1, "provide exactly one schedule key")
+assert(#ARGV == 2, "provide a max timestamp and a count")
+
+local key = KEYS[1]
+local max_timestamp = ARGV[1]
+local count = tonumber(ARGV[2])
+
+local claimed = redis.call("ZRANGEBYSCORE", key, "-inf", max_timestamp, "WITHSCORES", "LIMIT", 0, count)
+for i = 1, #claimed, 2 do
+    redis.call("ZREM", key, claimed[i])
+end
+
+local depth = redis.call("ZCARD", key)
+local oldest = redis.call("ZRANGE", key, 0, 0, "WITHSCORES")
+
+local result = {depth, oldest[2] or false}
+for i = 1, #claimed do
+    result[#result + 1] = claimed[i]
+end
+return result
@@ -0,0 +1,54 @@
+--[[
+
+Counter Sums
+============
+
+Sums counter values stored in the counter hashes of the TSDB, so that only
+the totals are sent back to the client instead of every rollup bucket.
+
+``ARGV`` starts with the number of totals to return, followed by one section
+per item in ``KEYS`` which consists of the number of fields to read from that
+hash and then a ``(total index, field)`` pair for every field. The result is
+a table of totals, indexed by the 1-based total index.
+
+All keys must route to the same host.
+
+]]--
+
+local totals = {}
+local total_count = tonumber(ARGV[1])
+for i = 1, total_count do
+    totals[i] = 0
+end
+
+-- Avoid exceeding the Lua stack size when unpacking large HMGET arguments.
+local BATCH_SIZE = 1000
+
+local offset = 2
+for _, key in ipairs(KEYS) do
+    local field_count = tonumber(ARGV[offset])
+    offset = offset + 1
+
+    local batch_start = 1
+    while batch_start <= field_count do
+        local batch_end = math.min(batch_start + BATCH_SIZE - 1, field_count)
+        local indexes = {}
+        local fields = {}
+        for i = batch_start, batch_end do
+            table.insert(indexes, tonumber(ARGV[offset]))
+            table.insert(fields, ARGV[offset + 1])
+            offset = offset + 2
+        end
+
+        local values = redis.call('HMGET', key, unpack(fields))
+        for i, value in ipairs(values) do
+            if value then
+                totals[indexes[i]] = totals[indexes[i]] + tonumber(value)
+            end
+        end
+
+        batch_start = batch_end + 1
+    end
+end
+
+return totals
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import dataclasses
-from collections.abc import Mapping
+import struct
+from collections.abc import Mapping, Sequence
 from typing import NamedTuple
 
 import sentry_sdk
@@ -9,9 +10,16 @@ from django.conf import settings
 from sentry_redis_tools.clients import RedisCluster, StrictRedis
 
 from sentry import options
-from sentry.utils import redis
+from sentry.utils import metrics, redis
 from sentry.utils.iterators import chunked
 
+# Spans in a compact segment are prefixed with their length as a 32-bit unsigned int
+SPAN_LENGTH = struct.Struct(">I")
+
+SpanPayload = bytes | memoryview
+
+claim_segments = redis.load_redis_script("spans/claim_segments.lua")
+
 
 @dataclasses.dataclass
 class ProcessSegmentsContext:
@@ -34,6 +42,38 @@ def get_segment_key(project_id: str | int, segment_id: str) -> str:
     return f"segment:{segment_id}:{project_id}:process-segment"
 
 
+def get_compact_segment_key(project_id: str | int, segment_id: str) -> str:
+    return f"segment:{segment_id}:{project_id}:process-segment-compact"
+
+
+def is_compact_segment_key(key: str) -> bool:
+    return key.endswith(":process-segment-compact")
+
+
+def encode_spans(spans: Sequence[bytes]) -> bytes:
+    """
+    Encodes spans as a sequence of length-prefixed payloads. Appending two encoded blobs yields a
+    valid encoding of all their spans, which is what lets a segment be built with APPEND.
+    """
+    return b"".join(SPAN_LENGTH.pack(len(span)) + span for span in spans)
+
+
+def decode_spans(blob: bytes) -> list[memoryview]:
+    """
+    Splits a blob produced by `encode_spans` into its spans. The spans are views into `blob`, so
+    nothing is copied.
+    """
+    view = memoryview(blob)
+    spans = []
+    offset = 0
+    while offset < len(view):
+        (length,) = SPAN_LENGTH.unpack_from(view, offset)
+        offset += SPAN_LENGTH.size
+        spans.append(view[offset : offset + length])
+        offset += length
+    return spans
+
+
 def get_last_processed_timestamp_key(partition_index: int) -> str:
     return f"performance-issues:last-processed-timestamp:partition:{partition_index}"
 
@@ -42,6 +82,10 @@ def get_unprocessed_segments_key(partition_index: int) -> str:
     return f"performance-issues:unprocessed-segments:partition-2:{partition_index}"
 
 
+def get_segment_schedule_key(partition_index: int) -> str:
+    return f"performance-issues:segment-schedule:partition:{partition_index}"
+
+
 class RedisSpansBuffer:
     def __init__(self):
         self.client: RedisCluster | StrictRedis = get_redis_client()
@@ -56,23 +100,37 @@ class RedisSpansBuffer:
         1. Pushes batches of spans to redis
         2. Check if number of spans pushed == to the number of elements that exist on the key. This
             tells us if it was the first time we see the key. This works fine because RPUSH is atomic.
+            With compact segments, spans are APPENDed to a single blob instead, and the same check
+            is done on the number of bytes written.
         3. If it is the first time we see a particular segment, push the segment id and first seen
-            timestamp to a bucket so we know when it is ready to be processed.
+            timestamp to a bucket so we know when it is ready to be processed. With sorted set
+            scheduling, the segment is added to the partition's schedule scored by that timestamp.
         3. Checks if 1 second has passed since the last time segments were processed for a partition.
         """
         keys = list(spans_map.keys())
+        segment_keys = []
         spans_written_per_segment = []
         ttl = options.get("standalone-spans.buffer-ttl.seconds")
+        compact = options.get("standalone-spans.buffer-compact-segments.enable")
+        use_schedule = options.get("standalone-spans.buffer-sorted-set-scheduling.enable")
 
         # Batch write spans in a segment
         with self.client.pipeline() as p:
             for key in keys:
                 segment_id, project_id, partition = key
                 spans = spans_map[key]
-                segment_key = get_segment_key(project_id, segment_id)
-                # RPUSH is atomic
-                p.rpush(segment_key, *spans)
-                spans_written_per_segment.append(len(spans))
+                if compact:
+                    segment_key = get_compact_segment_key(project_id, segment_id)
+                    blob = encode_spans(spans)
+                    # APPEND is atomic
+                    p.append(segment_key, blob)
+                    spans_written_per_segment.append(len(blob))
+                else:
+                    segment_key = get_segment_key(project_id, segment_id)
+                    # RPUSH is atomic
+                    p.rpush(segment_key, *spans)
+                    spans_written_per_segment.append(len(spans))
+                segment_keys.append(segment_key)
 
             results = p.execute()
 
@@ -86,17 +144,21 @@ class RedisSpansBuffer:
                 # GETSET is atomic
                 p.getset(timestamp_key, timestamp)
 
-            for result in zip(keys, spans_written_per_segment, results):
+            for result in zip(keys, segment_keys, spans_written_per_segment, results):
                 # Check if this is a new segment, if yes, add to bucket to be processed
-                key, num_written, num_total = result
+                key, segment_key, num_written, num_total = result
                 if num_written == num_total:
-                    segment_id, project_id, partition = key
-                    segment_key = get_segment_key(project_id, segment_id)
-                    bucket = get_unprocessed_segments_key(partition)
-
+                    partition = key.partition
                     timestamp = segment_first_seen_ts[key]
                     p.expire(segment_key, ttl)
-                    p.rpush(bucket, timestamp, segment_key)
+
+                    if use_schedule:
+                        p.zadd(
+                            get_segment_schedule_key(partition), {segment_key: timestamp}, nx=True
+                        )
+                    else:
+                        bucket = get_unprocessed_segments_key(partition)
+                        p.rpush(bucket, timestamp, segment_key)
 
             timestamp_results = p.execute()
 
@@ -115,26 +177,86 @@ class RedisSpansBuffer:
 
         return process_segments_contexts
 
-    def read_and_expire_many_segments(self, keys: list[str]) -> list[list[str | bytes]]:
-        values = []
+    def read_and_expire_many_segments(self, keys: list[str]) -> list[list[SpanPayload]]:
+        """
+        Returns the spans of each segment and deletes the segments. Spans of compact segments are
+        returned as views into the single buffer read for the segment.
+        """
+        values: list[list[SpanPayload]] = []
         with self.client.pipeline() as p:
             for key in keys:
-                p.lrange(key, 0, -1)
+                if is_compact_segment_key(key):
+                    p.get(key)
+                else:
+                    p.lrange(key, 0, -1)
 
             p.delete(*keys)
             response = p.execute()
 
-        for value in response[:-1]:
-            values.append(value)
+        for key, value in zip(keys, response[:-1]):
+            if is_compact_segment_key(key):
+                values.append(decode_spans(value) if value else [])
+            else:
+                values.append(value)
 
         return values
 
     def get_unprocessed_segments_and_prune_bucket(self, now: int, partition: int) -> list[str]:
+        """
+        Returns the keys of all segments of the partition which are older than the buffer window
+        and removes them from the bucket (or schedule), so no other consumer processes them again.
+        """
+        buffer_window = options.get("standalone-spans.buffer-window.seconds")
+
+        # Segments are claimed from both, so that switching between the two does not leave any
+        # segments behind. Checking an empty list or sorted set is cheap.
+        segment_keys, processed_segment_ts = self._prune_bucket(now, partition, buffer_window)
+        scheduled_keys, scheduled_segment_ts = self._claim_scheduled_segments(
+            now, partition, buffer_window
+        )
+        segment_keys.extend(scheduled_keys)
+        if scheduled_segment_ts is not None:
+            processed_segment_ts = max(processed_segment_ts or 0, scheduled_segment_ts)
+
+        segment_context = {"current_timestamp": now, "segment_timestamp": processed_segment_ts}
+        sentry_sdk.set_context("processed_segment", segment_context)
+
+        return segment_keys
+
+    def _claim_scheduled_segments(
+        self, now: int, partition: int, buffer_window: int
+    ) -> tuple[list[str], int | None]:
+        key = get_segment_schedule_key(partition)
+        count = options.get("standalone-spans.buffer-claim-batch-size")
+
+        depth, oldest_ts, *claimed = claim_segments(
+            [key], [now - buffer_window, count], self.client
+        )
+
+        tags = {"partition": partition}
+        metrics.gauge("spans.buffer.schedule.depth", depth, tags=tags)
+        if oldest_ts is not None:
+            metrics.gauge(
+                "spans.buffer.schedule.oldest_age", now - int(oldest_ts), tags=tags, unit="second"
+            )
+
+        segment_keys = []
+        processed_segment_ts = None
+        for segment_key, segment_timestamp in chunked(claimed, 2):
+            segment_keys.append(segment_key.decode("utf-8"))
+            processed_segment_ts = int(float(segment_timestamp))
+
+        if segment_keys:
+            metrics.distribution("spans.buffer.schedule.claimed", len(segment_keys), tags=tags)
+
+        return segment_keys, processed_segment_ts
+
+    def _prune_bucket(
+        self, now: int, partition: int, buffer_window: int
+    ) -> tuple[list[str], int | None]:
         key = get_unprocessed_segments_key(partition)
         results = self.client.lrange(key, 0, -1) or []
 
-        buffer_window = options.get("standalone-spans.buffer-window.seconds")
-
         segment_keys = []
         processed_segment_ts = None
         for result in chunked(results, 2):
@@ -151,9 +273,7 @@ class RedisSpansBuffer:
                 sentry_sdk.capture_exception()
                 break
 
-        self.client.ltrim(key, len(segment_keys) * 2, -1)
+        if results:
+            self.client.ltrim(key, len(segment_keys) * 2, -1)
 
-        segment_context = {"current_timestamp": now, "segment_timestamp": processed_segment_ts}
-        sentry_sdk.set_context("processed_segment", segment_context)
-
-        return segment_keys
+        return segment_keys, processed_segment_ts
@@ -1,8 +1,8 @@
 import dataclasses
 import logging
 from collections import defaultdict
-from collections.abc import Mapping
-from typing import Any
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any, Literal
 
 import orjson
 import rapidjson
@@ -57,6 +57,17 @@ class SpanMessageWithMetadata:
     span: bytes
 
 
+@dataclasses.dataclass
+class SegmentBatch:
+    """
+    Spans of a batch of messages grouped by segment, ready to be written to the buffer.
+    """
+
+    spans_map: dict[SegmentKey, list[bytes]] = dataclasses.field(default_factory=dict)
+    segment_first_seen_ts: dict[SegmentKey, int] = dataclasses.field(default_factory=dict)
+    latest_ts_by_partition: dict[int, int] = dataclasses.field(default_factory=dict)
+
+
 def get_project_id(headers: Headers) -> int | None:
     for k, v in headers:
         if k == "project_id":
@@ -65,7 +76,7 @@ def get_project_id(headers: Headers) -> int | None:
     return None
 
 
-def prepare_buffered_segment_payload(segments) -> bytes:
+def prepare_buffered_segment_payload(segments: Sequence[bytes | memoryview]) -> bytes:
     segment_str = b",".join(segments)
     return b'{"spans": [' + segment_str + b"]}"
 
@@ -136,52 +147,63 @@ def process_message(message: Message[KafkaPayload]) -> SpanMessageWithMetadata |
         return FILTERED_PAYLOAD
 
 
+def build_segment_batch(spans: Iterable[SpanMessageWithMetadata]) -> SegmentBatch:
+    """
+    Creates a dictionary with segment_id as key and a list of spans belonging to that
+    segment_id as value, along with the timestamps needed to schedule the segments.
+    """
+    latest_ts_by_partition: dict[int, int] = {}
+    spans_map: dict[SegmentKey, list[bytes]] = defaultdict(list)
+    segment_first_seen_ts: dict[SegmentKey, int] = {}
+
+    for payload in spans:
+        partition = payload.partition
+        segment_id = payload.segment_id
+        project_id = payload.project_id
+        span = payload.span
+        timestamp = payload.timestamp
+
+        key = SegmentKey(segment_id, project_id, partition)
+
+        # Collects spans for each segment_id
+        spans_map[key].append(span)
+
+        # Collects "first_seen" timestamps for each segment in batch.
+        # Batch step doesn't guarantee order, so pick lowest ts.
+        if key not in segment_first_seen_ts or timestamp < segment_first_seen_ts[key]:
+            segment_first_seen_ts[key] = timestamp
+
+        # Collects latest timestamps processed in each partition. It is
+        # important to keep track of this per partition because message
+        # timestamps are guaranteed to be monotonic per partition only.
+        if partition not in latest_ts_by_partition or timestamp > latest_ts_by_partition[partition]:
+            latest_ts_by_partition[partition] = timestamp
+
+    return SegmentBatch(
+        spans_map=dict(spans_map),
+        segment_first_seen_ts=segment_first_seen_ts,
+        latest_ts_by_partition=latest_ts_by_partition,
+    )
+
+
+def _write_segment_batch(batch: SegmentBatch) -> list[ProcessSegmentsContext]:
+    client = RedisSpansBuffer()
+
+    return client.batch_write_and_check_processing(
+        spans_map=batch.spans_map,
+        segment_first_seen_ts=batch.segment_first_seen_ts,
+        latest_ts_by_partition=batch.latest_ts_by_partition,
+    )
+
+
 def _batch_write_to_redis(message: Message[ValuesBatch[SpanMessageWithMetadata]]):
     """
-    Gets a batch of `SpanMessageWithMetadata` and creates a dictionary with
-    segment_id as key and a list of spans belonging to that segment_id as value.
-    Pushes the batch of spans to redis.
+    Gets a batch of `SpanMessageWithMetadata`, groups the spans by segment and
+    pushes the batch of spans to redis.
     """
     with sentry_sdk.start_transaction(op="process", name="spans.process.expand_segments"):
-        batch = message.payload
-        latest_ts_by_partition: dict[int, int] = {}
-        spans_map: dict[SegmentKey, list[bytes]] = defaultdict(list)
-        segment_first_seen_ts: dict[SegmentKey, int] = {}
-
-        for item in batch:
-            payload = item.payload
-            partition = payload.partition
-            segment_id = payload.segment_id
-            project_id = payload.project_id
-            span = payload.span
-            timestamp = payload.timestamp
-
-            key = SegmentKey(segment_id, project_id, partition)
-
-            # Collects spans for each segment_id
-            spans_map[key].append(span)
-
-            # Collects "first_seen" timestamps for each segment in batch.
-            # Batch step doesn't guarantee order, so pick lowest ts.
-            if key not in segment_first_seen_ts or timestamp < segment_first_seen_ts[key]:
-                segment_first_seen_ts[key] = timestamp
-
-            # Collects latest timestamps processed in each partition. It is
-            # important to keep track of this per partition because message
-            # timestamps are guaranteed to be monotonic per partition only.
-            if (
-                partition not in latest_ts_by_partition
-                or timestamp > latest_ts_by_partition[partition]
-            ):
-                latest_ts_by_partition[partition] = timestamp
-
-        client = RedisSpansBuffer()
-
-        return client.batch_write_and_check_processing(
-            spans_map=spans_map,
-            segment_first_seen_ts=segment_first_seen_ts,
-            latest_ts_by_partition=latest_ts_by_partition,
-        )
+        batch = build_segment_batch(item.payload for item in message.payload)
+        return _write_segment_batch(batch)
 
 
 def batch_write_to_redis(
@@ -194,6 +216,35 @@ def batch_write_to_redis(
         return FILTERED_PAYLOAD
 
 
+def process_batch(message: Message[ValuesBatch[KafkaPayload]]) -> SegmentBatch:
+    """
+    Deserializes a batch of span messages and groups them by segment. This runs in
+    the worker processes in batched-parallel mode, so that the main process is only
+    left with writing the batch to redis.
+    """
+    spans = []
+    for item in message.payload:
+        # Batch items are the `BrokerValue`s of the original messages.
+        result = process_message(Message(item))
+        if not isinstance(result, FilteredPayload):
+            spans.append(result)
+
+    return build_segment_batch(spans)
+
+
+def write_segment_batch_to_redis(message: Message[SegmentBatch]):
+    batch = message.payload
+    if not batch.spans_map:
+        return []
+
+    try:
+        with sentry_sdk.start_transaction(op="process", name="spans.process.write_segment_batch"):
+            return _write_segment_batch(batch)
+    except Exception:
+        sentry_sdk.capture_exception()
+        return FILTERED_PAYLOAD
+
+
 def _expand_segments(should_process_segments: list[ProcessSegmentsContext]):
     with sentry_sdk.start_transaction(op="process", name="spans.process.expand_segments") as txn:
         buffered_segments: list[KafkaPayload | FilteredPayload] = []
@@ -256,6 +307,11 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
     4. Fetch all segments are two minutes or older and expire the keys so they
        aren't reprocessed
     5. Produce segments to buffered-segments topic
+
+    In `parallel` mode, only deserializing spans (1.) is done in the
+    multiprocessing pool. In `batched-parallel` mode, messages are batched
+    first and every batch is deserialized and grouped by segment in a worker
+    process, leaving only redis I/O and commits on the main process.
     """
 
     def __init__(
@@ -265,12 +321,14 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         num_processes: int,
         input_block_size: int | None,
         output_block_size: int | None,
+        mode: Literal["batched-parallel", "parallel"] | None = None,
     ):
         super().__init__()
         self.max_batch_size = max_batch_size
         self.max_batch_time = max_batch_time
         self.input_block_size = input_block_size
         self.output_block_size = output_block_size
+        self.batched = mode == "batched-parallel"
         self.__pool = MultiprocessingPool(num_processes)
 
         cluster_name = get_topic_definition(Topic.BUFFERED_SEGMENTS)["cluster"]
@@ -297,6 +355,9 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
 
         commit_step = CommitSpanOffsets(commit=commit, next_step=unfold_step)
 
+        if self.batched:
+            return self._create_batched_parallel_worker(commit_step)
+
         batch_processor = RunTask(
             function=batch_write_to_redis,
             next_step=commit_step,
@@ -318,6 +379,32 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
             output_block_size=self.output_block_size,
         )
 
+    def _create_batched_parallel_worker(
+        self, next_step: ProcessingStrategy[Any]
+    ) -> ProcessingStrategy[KafkaPayload]:
+        write_step = RunTask(
+            function=write_segment_batch_to_redis,
+            next_step=next_step,
+        )
+
+        # Every batch already holds up to `max_batch_size` spans, so batches are
+        # handed to the pool one by one.
+        parallel_step = run_task_with_multiprocessing(
+            function=process_batch,
+            next_step=write_step,
+            max_batch_size=1,
+            max_batch_time=self.max_batch_time,
+            pool=self.__pool,
+            input_block_size=self.input_block_size,
+            output_block_size=self.output_block_size,
+        )
+
+        return BatchStep(
+            max_batch_size=self.max_batch_size,
+            max_batch_time=self.max_batch_time,
+            next_step=parallel_step,
+        )
+
     def shutdown(self) -> None:
         self.producer.close()
         self.__pool.close()
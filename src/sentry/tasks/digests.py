@@ -2,15 +2,18 @@ import logging
 import time
 from datetime import datetime
 
+from sentry import options
 from sentry.digests import get_option_key
 from sentry.digests.backends.base import InvalidState
-from sentry.digests.notifications import build_digest, split_key
+from sentry.digests.notifications import DigestInfo, build_digest, split_key
 from sentry.digests.types import Record
 from sentry.models.options.project_option import ProjectOption
 from sentry.models.project import Project
+from sentry.notifications.types import ActionTargetType, FallthroughChoiceType
 from sentry.silo.base import SiloMode
 from sentry.tasks.base import instrumented_task
-from sentry.utils import snuba
+from sentry.utils import metrics, snuba
+from sentry.utils.iterators import chunked
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +39,12 @@ def schedule_digests() -> None:
     timeout = 300
     digests.backend.maintenance(deadline - timeout)
 
+    batch_size = options.get("digests.delivery-batch-size")
+    if batch_size > 1:
+        for entries in chunked(digests.backend.schedule(deadline), batch_size):
+            deliver_digests.delay([entry.key for entry in entries])
+        return
+
     for entry in digests.backend.schedule(deadline):
         deliver_digest.delay(entry.key, entry.timestamp)
 
@@ -51,7 +60,6 @@ def deliver_digest(
     notification_uuid: str | None = None,
 ) -> None:
     from sentry import digests
-    from sentry.mail import mail_adapter
 
     try:
         project, target_type, target_identifier, fallthrough_choice = split_key(key)
@@ -75,25 +83,99 @@ def deliver_digest(
             logger.info("Skipped digest delivery: %s", error, exc_info=True)
             return
 
-        if digest.digest:
-            mail_adapter.notify_digest(
-                project,
-                digest,
-                target_type,
-                target_identifier,
-                fallthrough_choice=fallthrough_choice,
-                notification_uuid=notification_uuid,
-            )
-        else:
-            logger.info(
-                "Skipped digest delivery due to empty digest",
-                extra={
-                    "project": project.id,
-                    "target_type": target_type.value,
-                    "target_identifier": target_identifier,
-                    "fallthrough_choice": fallthrough_choice.value if fallthrough_choice else None,
-                },
-            )
+        _notify_digest(
+            project,
+            target_type,
+            target_identifier,
+            fallthrough_choice,
+            digest=digest,
+            notification_uuid=notification_uuid,
+        )
+
+
+@instrumented_task(
+    name="sentry.tasks.digests.deliver_digests",
+    queue="digests.delivery",
+    silo_mode=SiloMode.REGION,
+)
+def deliver_digests(keys: list[str]) -> None:
+    """
+    Delivers the digests of a batch of timelines, opening and closing all of
+    them at once rather than taking a lock and running several redis calls per
+    timeline.
+    """
+    from sentry import digests
+
+    targets = {}
+    minimum_delays: dict[str, int | None] = {}
+    for key in keys:
+        try:
+            targets[key] = split_key(key)
+        except Project.DoesNotExist as error:
+            logger.info("Cannot deliver digest %s due to error: %s", key, error)
+            digests.backend.delete(key)
+            continue
+
+        minimum_delays[key] = ProjectOption.objects.get_value(
+            targets[key][0], get_option_key("mail", "minimum_delay")
+        )
+
+    with snuba.options_override({"consistent": True}):
+        built: dict[str, tuple[DigestInfo, str | None]] = {}
+        with digests.backend.digest_many(minimum_delays) as timelines:
+            for key, records in list(timelines.items()):
+                try:
+                    built[key] = (
+                        build_digest(targets[key][0], records),
+                        get_notification_uuid_from_records(records),
+                    )
+                except Exception:
+                    # The timeline is left in the ready state, so it will be
+                    # retried once it has been rescheduled by maintenance.
+                    logger.exception("Failed to build digest", extra={"key": key})
+                    del timelines[key]
+
+        metrics.distribution("digests.delivery_batch.size", len(keys))
+        metrics.distribution("digests.delivery_batch.digested", len(built))
+
+        for key, (digest, notification_uuid) in built.items():
+            # The timelines are already closed, so a failure must not keep the
+            # remaining digests of the batch from being delivered.
+            try:
+                _notify_digest(*targets[key], digest=digest, notification_uuid=notification_uuid)
+            except Exception:
+                logger.exception("Failed to deliver digest", extra={"key": key})
+
+
+def _notify_digest(
+    project: Project,
+    target_type: ActionTargetType,
+    target_identifier: str | None,
+    fallthrough_choice: FallthroughChoiceType | None,
+    digest: DigestInfo,
+    notification_uuid: str | None,
+) -> None:
+    from sentry.mail import mail_adapter
+
+    if digest.digest:
+        mail_adapter.notify_digest(
+            project,
+            digest,
+            target_type,
+            target_identifier,
+            fallthrough_choice=fallthrough_choice,
+            notification_uuid=notification_uuid,
+        )
+    else:
+        logger.info(
+            "Skipped digest delivery due to empty digest",
+            extra={
+                "project": project.id,
+                "target_type": target_type.value,
+                "target_identifier": target_identifier,
+                "fallthrough_choice": fallthrough_choice.value if fallthrough_choice else None,
+            },
+        )
 
 
 def get_notification_uuid_from_records(records: list[Record]) -> str | None:
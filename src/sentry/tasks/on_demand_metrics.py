@@ -257,7 +257,12 @@ def _get_widget_on_demand_specs(
     if not project_for_query:
         return []
 
-    widget_specs = convert_widget_query_to_metric(project_for_query, widget_query, True)
+    # Widgets are converted on save and periodically by `process_widget_specs`,
+    # which keeps their entries in the on-demand spec cache fresh for when
+    # project configs are built.
+    widget_specs = convert_widget_query_to_metric(
+        project_for_query, widget_query, True, refresh_spec_cache=True
+    )
 
     specs_per_version: dict[int, dict[str, HashedMetricSpec]] = {}
     for hash, spec, spec_version in widget_specs:
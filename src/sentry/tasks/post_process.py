@@ -519,9 +519,10 @@ def post_process_group(
     """
     Fires post processing hooks for a group.
     """
+    from sentry.features.evaluation_cache import feature_evaluation_cache
     from sentry.utils import snuba
 
-    with snuba.options_override({"consistent": True}):
+    with snuba.options_override({"consistent": True}), feature_evaluation_cache():
         from sentry import eventstore
         from sentry.eventstore.processing import event_processing_store
         from sentry.ingest.transaction_clusterer.datasource.redis import (
@@ -112,6 +112,7 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     """
     from sentry.models.project import Project
     from sentry.models.projectkey import ProjectKey
+    from sentry.relay.config import get_organization_config_sections
 
     validate_args(organization_id, project_id, public_key)
     configs = {}
@@ -124,6 +125,9 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
         # it could be possible that refrequent invalidations cause the task to take excessive time
         # to complete.
         for organization in Organization.objects.filter(id=organization_id):
+            # The sections of the config which only depend on the organization
+            # are computed once, and only if any of its configs is cached.
+            organization_sections = None
             for project in Project.objects.filter(organization_id=organization_id):
                 project.set_cached_field_value("organization", organization)
                 for key in ProjectKey.objects.filter(project_id=project.id):
@@ -132,7 +136,11 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
                     # recalculate it.  If the config was not there at all, we leave it and avoid the
                     # cost of re-computation.
                     if projectconfig_cache.backend.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
+                        if organization_sections is None:
+                            organization_sections = get_organization_config_sections(organization)
+                        configs[key.public_key] = compute_projectkey_config(
+                            key, organization_sections=organization_sections
+                        )
                         action = "recompute"
                     else:
                         action = "not-cached"
@@ -178,9 +186,12 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     return configs
 
 
-def compute_projectkey_config(key):
+def compute_projectkey_config(key, organization_sections=None):
     """Computes a single config for the given :class:`ProjectKey`.
 
+    :param organization_sections: Sections of the config shared by all
+        projects of the key's organization, see
+        :func:`sentry.relay.config.get_organization_config_sections`.
     :returns: A dict with the project config.
     """
     from sentry.models.projectkey import ProjectKeyStatus
@@ -189,7 +200,9 @@ def compute_projectkey_config(key):
     if key.status != ProjectKeyStatus.ACTIVE:
         return {"disabled": True}
     else:
-        return get_project_config(key.project, project_keys=[key]).to_dict()
+        return get_project_config(
+            key.project, project_keys=[key], organization_sections=organization_sections
+        ).to_dict()
 
 
 @instrumented_task(
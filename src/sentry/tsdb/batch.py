@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import contextlib
+import math
+from collections import defaultdict
+from collections.abc import Generator, Iterable, Mapping
+from contextvars import ContextVar
+from datetime import datetime
+from functools import reduce
+
+from sentry.tsdb.base import BaseTSDB, TSDBItem, TSDBKey, TSDBModel
+from sentry.utils import metrics
+from sentry.utils.dates import to_datetime
+
+_current_batch: ContextVar[TSDBWriteBatch | None] = ContextVar("tsdb_write_batch", default=None)
+
+
+class TSDBWriteBatch:
+    """
+    Accumulates TSDB writes and emits them as a handful of `*_multi` calls.
+
+    Writes are merged per ``(model, key, environment)`` and bucket, where the
+    bucket is the greatest common divisor of all configured rollups. Every
+    rollup bucket (and expiry, which is derived from the rollup epoch) is a
+    multiple of it, so merging within it does not change what is stored:
+
+    * counters (``incr``) are summed,
+    * distinct counters (``record``) union their values,
+    * frequency tables (``record_frequency``) sum their item scores.
+    """
+
+    def __init__(self, backend: BaseTSDB) -> None:
+        self.backend = backend
+        self.resolution = reduce(math.gcd, backend.get_rollups().keys())
+
+        # environment_id -> (model, key, bucket) -> count
+        self._counters: dict[int | None, dict[tuple[TSDBModel, TSDBKey, int], int]] = defaultdict(
+            lambda: defaultdict(int)
+        )
+        # (environment_id, bucket) -> (model, key) -> values
+        self._distinct: dict[
+            tuple[int | None, int], dict[tuple[TSDBModel, int], set[str]]
+        ] = defaultdict(lambda: defaultdict(set))
+        # (environment_id, bucket) -> model -> key -> item -> score
+        self._frequencies: dict[
+            tuple[int | None, int], dict[TSDBModel, dict[str, dict[str, float]]]
+        ] = defaultdict(lambda: defaultdict(lambda: defaultdict(lambda: defaultdict(float))))
+
+        self._writes = 0
+
+    def _bucket(self, timestamp: datetime) -> int:
+        return self.backend.normalize_to_epoch(timestamp, self.resolution)
+
+    def incr(
+        self,
+        model: TSDBModel,
+        key: TSDBKey,
+        timestamp: datetime,
+        count: int = 1,
+        environment_id: int | None = None,
+    ) -> None:
+        self._counters[environment_id][(model, key, self._bucket(timestamp))] += count
+        self._writes += 1
+
+    def record(
+        self,
+        model: TSDBModel,
+        key: int,
+        values: Iterable[str],
+        timestamp: datetime,
+        environment_id: int | None = None,
+    ) -> None:
+        self._distinct[(environment_id, self._bucket(timestamp))][(model, key)].update(values)
+        self._writes += 1
+
+    def record_frequency(
+        self,
+        model: TSDBModel,
+        key: str,
+        items: Mapping[TSDBItem, int | float],
+        timestamp: datetime,
+        environment_id: int | None = None,
+    ) -> None:
+        table = self._frequencies[(environment_id, self._bucket(timestamp))][model][key]
+        for item, score in items.items():
+            table[item] += score
+        self._writes += 1
+
+    def flush(self) -> None:
+        calls = 0
+
+        for environment_id, counters in self._counters.items():
+            self.backend.incr_multi(
+                [
+                    (model, key, {"timestamp": to_datetime(bucket), "count": count})
+                    for (model, key, bucket), count in counters.items()
+                ],
+                environment_id=environment_id,
+            )
+            calls += 1
+
+        for (environment_id, bucket), distinct in self._distinct.items():
+            self.backend.record_multi(
+                [(model, key, values) for (model, key), values in distinct.items()],
+                timestamp=to_datetime(bucket),
+                environment_id=environment_id,
+            )
+            calls += 1
+
+        for (environment_id, bucket), frequencies in self._frequencies.items():
+            self.backend.record_frequency_multi(
+                list(frequencies.items()),
+                timestamp=to_datetime(bucket),
+                environment_id=environment_id,
+            )
+            calls += 1
+
+        if self._writes:
+            metrics.distribution("tsdb.write_batch.writes", self._writes)
+            metrics.distribution("tsdb.write_batch.calls", calls)
+
+        self._counters.clear()
+        self._distinct.clear()
+        self._frequencies.clear()
+        self._writes = 0
+
+
+@contextlib.contextmanager
+def batched_writes(backend: BaseTSDB) -> Generator[TSDBWriteBatch, None, None]:
+    """
+    Collects the writes made through the `incr`, `record` and
+    `record_frequency` methods of the yielded batch and flushes them to
+    `backend` on exit. Nested blocks yield the outermost batch, so writers that
+    open their own block (such as `_tsdb_record_all_metrics` in the event
+    manager) are deferred to the end of an enclosing one, for example one
+    spanning all events of a consumer batch.
+    """
+    batch = _current_batch.get()
+    if batch is not None:
+        yield batch
+        return
+
+    batch = TSDBWriteBatch(backend)
+    token = _current_batch.set(batch)
+    try:
+        yield batch
+    finally:
+        _current_batch.reset(token)
+        batch.flush()
+
+
+def get_write_batch() -> TSDBWriteBatch | None:
+    return _current_batch.get()
@@ -114,9 +114,13 @@ def _get_arroyo_subprocess_initializer(
 
 def _initialize_arroyo_subprocess(initializer: Callable[[], None] | None, tags: Tags) -> None:
     from sentry.runner import configure
+    from sentry.utils.process_buffers import install_sigterm_flush
 
     configure()
 
+    # arroyo terminates its workers with SIGTERM on shutdown and rebalances.
+    install_sigterm_flush()
+
     if initializer:
         initializer()
 
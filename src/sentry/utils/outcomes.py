@@ -1,15 +1,29 @@
 from __future__ import annotations
 
+import atexit
+import logging
+import os
+import threading
 import time
 from datetime import datetime
 from enum import IntEnum
 
+from sentry import options
 from sentry.conf.types.kafka_definition import Topic
 from sentry.constants import DataCategory
 from sentry.utils import json, kafka_config, metrics
 from sentry.utils.dates import to_datetime
 from sentry.utils.pubsub import KafkaPublisher
 
+logger = logging.getLogger(__name__)
+
+# Aggregated outcomes are summed within buckets of this many seconds.
+AGGREGATION_BUCKET_SIZE = 60
+# Aggregated outcomes are flushed at least this often, in seconds...
+AGGREGATION_FLUSH_INTERVAL = 10
+# ...and as soon as outcomes for this many distinct keys have been collected.
+AGGREGATION_MAX_KEYS = 10_000
+
 # valid values for outcome
 
 
@@ -33,8 +47,134 @@ class Outcome(IntEnum):
         return self in (Outcome.ACCEPTED, Outcome.RATE_LIMITED)
 
 
+# (org_id, project_id, key_id, outcome, reason, category, bucket timestamp)
+OutcomeKey = tuple[int, int, int | None, Outcome, str | None, DataCategory | None, int]
+
+
+class OutcomeAggregator:
+    """
+    Sums the quantities of outcomes per org, project, key, outcome, reason,
+    category and bucket, and publishes one outcome without an event id per
+    combination.
+
+    Outcomes are flushed by a background thread every `flush_interval`
+    seconds and as soon as `max_keys` combinations have been collected. Worker
+    processes of arroyo and Celery flush them before they exit, see
+    `sentry.utils.process_buffers`. Outcomes which could not be published are
+    kept for the next flush.
+    """
+
+    def __init__(
+        self,
+        bucket_size: int = AGGREGATION_BUCKET_SIZE,
+        flush_interval: float = AGGREGATION_FLUSH_INTERVAL,
+        max_keys: int = AGGREGATION_MAX_KEYS,
+    ) -> None:
+        self.bucket_size = bucket_size
+        self.flush_interval = flush_interval
+        self.max_keys = max_keys
+
+        self._lock = threading.Lock()
+        # key -> [quantity, number of outcomes]
+        self._buckets: dict[OutcomeKey, list[int]] = {}
+        self._flusher_pid: int | None = None
+
+    def track(
+        self,
+        org_id: int,
+        project_id: int,
+        key_id: int | None,
+        outcome: Outcome,
+        reason: str | None,
+        timestamp: datetime,
+        category: DataCategory | None,
+        quantity: int,
+    ) -> None:
+        if self._flusher_pid != os.getpid():
+            self._start_flusher()
+
+        bucket = int(timestamp.timestamp()) // self.bucket_size * self.bucket_size
+        key = (org_id, project_id, key_id, outcome, reason, category, bucket)
+
+        with self._lock:
+            counts = self._buckets.get(key)
+            if counts is None:
+                self._buckets[key] = [quantity, 1]
+            else:
+                counts[0] += quantity
+                counts[1] += 1
+            full = len(self._buckets) >= self.max_keys
+
+        if full:
+            self.flush()
+
+    def _start_flusher(self) -> None:
+        with self._lock:
+            # Check again in case another thread started the flusher.
+            pid = os.getpid()
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+            # Forked processes inherit the outcomes collected by their parent,
+            # which are flushed by the parent.
+            self._buckets = {}
+
+        def run() -> None:
+            while self._flusher_pid == pid:
+                time.sleep(self.flush_interval)
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("outcomes.aggregator.flush_failed")
+
+        threading.Thread(target=run, name="outcomes-aggregator", daemon=True).start()
+
+    def flush(self) -> None:
+        with self._lock:
+            # Outcomes inherited from the parent of a forked process are
+            # flushed by the parent.
+            if self._flusher_pid != os.getpid():
+                return
+            buckets, self._buckets = self._buckets, {}
+
+        if not buckets:
+            return
+
+        items = list(buckets.items())
+        for index, (key, (quantity, count)) in enumerate(items):
+            org_id, project_id, key_id, outcome, reason, category, bucket = key
+            try:
+                _publish_outcome(
+                    org_id=org_id,
+                    project_id=project_id,
+                    key_id=key_id,
+                    outcome=outcome,
+                    reason=reason,
+                    timestamp=to_datetime(bucket),
+                    event_id=None,
+                    category=category,
+                    quantity=quantity,
+                    count=count,
+                )
+            except Exception:
+                self._requeue(items[index:])
+                raise
+
+        metrics.distribution("events.outcomes.aggregated", len(buckets))
+
+    def _requeue(self, items: list[tuple[OutcomeKey, list[int]]]) -> None:
+        # Outcomes that were not published are merged with the ones collected
+        # in the meantime, so that the next flush retries them.
+        with self._lock:
+            for key, (quantity, count) in items:
+                counts = self._buckets.setdefault(key, [0, 0])
+                counts[0] += quantity
+                counts[1] += count
+
+
 outcomes_publisher: KafkaPublisher | None = None
 billing_publisher: KafkaPublisher | None = None
+outcome_aggregator: OutcomeAggregator | None = None
 
 
 def track_outcome(
@@ -57,9 +197,12 @@ def track_outcome(
     This sends the "outcome" message to Kafka which is used by Snuba to serve
     data for SnubaTSDB and RedisSnubaTSDB, such as # of rate-limited/filtered
     events.
+
+    With the `outcomes.aggregation.enable` option, outcomes which are not
+    billing outcomes are summed by the `OutcomeAggregator` and sent without
+    their event id. Billing outcomes are always sent as they are.
     """
-    global outcomes_publisher
-    global billing_publisher
+    global outcome_aggregator
 
     if quantity is None:
         quantity = 1
@@ -72,6 +215,51 @@ def track_outcome(
     assert isinstance(category, (type(None), DataCategory))
     assert isinstance(quantity, int)
 
+    timestamp = timestamp or to_datetime(time.time())
+
+    if not outcome.is_billing() and options.get("outcomes.aggregation.enable"):
+        if outcome_aggregator is None:
+            outcome_aggregator = OutcomeAggregator()
+        outcome_aggregator.track(
+            org_id=org_id,
+            project_id=project_id,
+            key_id=key_id,
+            outcome=outcome,
+            reason=reason,
+            timestamp=timestamp,
+            category=category,
+            quantity=quantity,
+        )
+        return
+
+    _publish_outcome(
+        org_id=org_id,
+        project_id=project_id,
+        key_id=key_id,
+        outcome=outcome,
+        reason=reason,
+        timestamp=timestamp,
+        event_id=event_id,
+        category=category,
+        quantity=quantity,
+    )
+
+
+def _publish_outcome(
+    org_id: int,
+    project_id: int,
+    key_id: int | None,
+    outcome: Outcome,
+    reason: str | None,
+    timestamp: datetime,
+    event_id: str | None,
+    category: DataCategory | None,
+    quantity: int,
+    count: int = 1,
+) -> None:
+    global outcomes_publisher
+    global billing_publisher
+
     outcomes_config = kafka_config.get_topic_definition(Topic.OUTCOMES)
     billing_config = kafka_config.get_topic_definition(Topic.OUTCOMES_BILLING)
 
@@ -95,8 +283,6 @@ def track_outcome(
             )
         publisher = outcomes_publisher
 
-    timestamp = timestamp or to_datetime(time.time())
-
     # Send billing outcomes to a dedicated topic.
     topic_name = (
         billing_config["real_topic_name"] if use_billing else outcomes_config["real_topic_name"]
@@ -122,6 +308,7 @@ def track_outcome(
 
     metrics.incr(
         "events.outcomes",
+        amount=count,
         skip_internal=True,
         tags={
             "outcome": outcome.name.lower(),
@@ -130,3 +317,19 @@ def track_outcome(
             "topic": topic_name,
         },
     )
+
+
+def flush_outcomes() -> None:
+    """
+    Publishes all outcomes collected by the `OutcomeAggregator` of this process
+    and waits for them to be delivered.
+    """
+    if outcome_aggregator is None:
+        return
+
+    outcome_aggregator.flush()
+    if outcomes_publisher is not None:
+        outcomes_publisher.flush()
+
+
+atexit.register(flush_outcomes)
@@ -0,0 +1,62 @@
+"""
+Flushing of writes that are held in memory per process, such as the increments
+collected by `CoalescingBuffer` and the outcomes summed by `OutcomeAggregator`,
+before a worker process exits.
+
+Worker processes of arroyo's multiprocessing pool and of Celery's prefork pool
+exit through `os._exit`, which skips `atexit` handlers:
+
+* arroyo terminates its pool with `SIGTERM` on shutdown and when partitions
+  are revoked, see `install_sigterm_flush`,
+* Celery sends `worker_process_shutdown` in the child process before it exits,
+  including when it is recycled after `max-tasks-per-child` tasks.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import threading
+from types import FrameType
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the flush when a worker process is terminated.
+SIGTERM_FLUSH_TIMEOUT = 5.0
+
+
+def flush_process_buffers() -> None:
+    """
+    Pushes out all writes held in the memory of this process. Errors are logged,
+    so that one failing flush does not prevent the others.
+    """
+    from sentry import buffer
+    from sentry.utils.outcomes import flush_outcomes
+
+    for name, flush in (("buffer", buffer.flush), ("outcomes", flush_outcomes)):
+        try:
+            flush()
+        except Exception:
+            logger.exception("process_buffers.flush_failed", extra={"buffer": name})
+
+
+def _flush_and_terminate(signum: int, frame: FrameType | None) -> None:
+    # The signal interrupts the main thread, which may hold the lock of a buffer.
+    # Flush from another thread, so that we give up after the timeout rather
+    # than deadlock.
+    flusher = threading.Thread(target=flush_process_buffers, name="process-buffers-flush")
+    flusher.start()
+    flusher.join(SIGTERM_FLUSH_TIMEOUT)
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+def install_sigterm_flush() -> None:
+    """
+    Flushes all writes held in memory when the process receives `SIGTERM`, and
+    then terminates it as usual. Meant for worker processes that are stopped
+    with `SIGTERM`.
+    """
+    signal.signal(signal.SIGTERM, _flush_and_terminate)
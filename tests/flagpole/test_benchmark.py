@@ -0,0 +1,102 @@
+import pytest
+
+from flagpole import EvaluationContext, Feature
+from flagpole.compiled import CompiledFeature
+
+# A feature like the larger ones in our options store: long lists of
+# organization ids, a few slug and email conditions and a partial rollout.
+FEATURE = Feature.from_feature_dictionary(
+    name="organizations:benchmark",
+    config_dict={
+        "created_at": "2023-10-12T00:00:00.000Z",
+        "owner": "test-owner",
+        "segments": [
+            {
+                "name": "excluded orgs",
+                "rollout": 0,
+                "conditions": [
+                    {
+                        "property": "organization_id",
+                        "operator": "in",
+                        "value": list(range(1_000_000, 1_001_000)),
+                    }
+                ],
+            },
+            {
+                "name": "internal",
+                "rollout": 100,
+                "conditions": [
+                    {
+                        "property": "organization_slug",
+                        "operator": "in",
+                        "value": ["sentry", "sentry-test", "sentry-sdks"],
+                    }
+                ],
+            },
+            {
+                "name": "early adopters",
+                "rollout": 50,
+                "conditions": [
+                    {
+                        "property": "organization_is-early-adopter",
+                        "operator": "equals",
+                        "value": True,
+                    },
+                    {
+                        "property": "organization_id",
+                        "operator": "not_in",
+                        "value": list(range(2_000_000, 2_005_000)),
+                    },
+                ],
+            },
+            {
+                "name": "allowlist",
+                "rollout": 100,
+                "conditions": [
+                    {
+                        "property": "organization_id",
+                        "operator": "in",
+                        "value": list(range(3_000_000, 3_010_000)),
+                    }
+                ],
+            },
+        ],
+    },
+)
+
+CONTEXTS = [
+    EvaluationContext(
+        {
+            "organization_id": organization_id,
+            "organization_slug": f"org-{organization_id}",
+            "organization_is-early-adopter": organization_id % 2 == 0,
+        },
+        {"organization_id"},
+    )
+    for organization_id in range(3_005_000, 3_015_000, 10)
+]
+
+
+def benchmark_available() -> bool:
+    try:
+        __import__("pytest_benchmark")
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("compiled", [False, True], ids=["interpreted", "compiled"])
+def test_benchmark_feature_match(compiled, benchmark):
+    """
+    Times evaluating a feature with long id lists for a batch of contexts,
+    interpreted and compiled.
+    """
+    feature = CompiledFeature.compile(FEATURE) if compiled else FEATURE
+
+    def run():
+        for context in CONTEXTS:
+            feature.match(context)
+
+    benchmark(run)
@@ -0,0 +1,125 @@
+from typing import Any
+
+import pytest
+
+from flagpole import EvaluationContext, Feature
+from flagpole.compiled import CompiledFeature
+from flagpole.conditions import ConditionTypeMismatchException
+
+
+def make_feature(segments: list[dict[str, Any]], enabled: bool = True) -> Feature:
+    return Feature.from_feature_dictionary(
+        name="foobar",
+        config_dict={
+            "created_at": "2023-10-12T00:00:00.000Z",
+            "owner": "test-owner",
+            "enabled": enabled,
+            "segments": segments,
+        },
+    )
+
+
+def assert_same_result(feature: Feature, context: EvaluationContext) -> bool:
+    compiled = CompiledFeature.compile(feature)
+    try:
+        expected = feature.match(context)
+    except ConditionTypeMismatchException:
+        with pytest.raises(ConditionTypeMismatchException):
+            compiled.match(context)
+        return False
+
+    assert compiled.match(context) == expected
+    return expected
+
+
+SEGMENTS = [
+    {
+        "name": "exclude",
+        "rollout": 0,
+        "conditions": [
+            {"property": "user_email", "operator": "equals", "value": "NOPE@example.com"}
+        ],
+    },
+    {
+        "name": "orgs",
+        "rollout": 100,
+        "conditions": [
+            {"property": "organization_id", "operator": "in", "value": [1, 2, 3]},
+            {"property": "organization_slug", "operator": "not_in", "value": ["Acme"]},
+        ],
+    },
+    {
+        "name": "emails",
+        "conditions": [
+            {"property": "user_emails", "operator": "contains", "value": "Yes@Example.com"},
+            {"property": "user_is-staff", "operator": "not_equals", "value": True},
+        ],
+    },
+    {
+        "name": "half",
+        "rollout": 50,
+        "conditions": [
+            {"property": "user_domain", "operator": "equals", "value": "sentry.io"},
+            {"property": "user_emails", "operator": "not_contains", "value": "blocked@sentry.io"},
+        ],
+    },
+]
+
+CONTEXTS = [
+    {},
+    {"user_email": "nope@example.com", "organization_id": 1},
+    {"organization_id": 1},
+    {"organization_id": 4},
+    {"organization_id": 2, "organization_slug": "ACME"},
+    {"organization_id": "1"},
+    {"organization_id": [1]},
+    {"user_emails": ["yes@example.com"], "user_is-staff": False},
+    {"user_emails": ["yes@example.com"], "user_is-staff": True},
+    {"user_emails": "yes@example.com"},
+    {"user_emails": ["yes@example.com"], "user_is-staff": "false"},
+    *({"user_domain": "Sentry.io", "user_id": user_id, "user_emails": []} for user_id in range(20)),
+    {"user_domain": "sentry.io", "user_emails": ["blocked@sentry.io"]},
+]
+
+
+class TestCompiledFeature:
+    @pytest.mark.parametrize("context_data", CONTEXTS)
+    def test_matches_interpreted_feature(self, context_data):
+        assert_same_result(make_feature(SEGMENTS), EvaluationContext(context_data))
+
+    def test_disabled_feature(self):
+        feature = make_feature(SEGMENTS, enabled=False)
+        assert not assert_same_result(feature, EvaluationContext({"organization_id": 1}))
+
+    def test_empty_segments(self):
+        assert not assert_same_result(make_feature([]), EvaluationContext({"organization_id": 1}))
+
+    def test_rollout(self):
+        feature = make_feature(SEGMENTS)
+        granted = [
+            assert_same_result(
+                feature,
+                EvaluationContext(
+                    {"user_domain": "sentry.io", "user_id": user_id, "user_emails": []},
+                    {"user_id"},
+                ),
+            )
+            for user_id in range(200)
+        ]
+        assert any(granted)
+        assert not all(granted)
+
+    def test_in_condition_is_case_insensitive(self):
+        feature = make_feature(
+            [
+                {
+                    "name": "slugs",
+                    "rollout": 100,
+                    "conditions": [
+                        {"property": "organization_slug", "operator": "in", "value": ["Sentry"]}
+                    ],
+                }
+            ]
+        )
+        assert assert_same_result(feature, EvaluationContext({"organization_slug": "SENTRY"}))
+        assert not assert_same_result(feature, EvaluationContext({"organization_slug": "acme"}))
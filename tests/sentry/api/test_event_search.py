@@ -8,12 +8,15 @@ from django.test import SimpleTestCase
 from django.utils import timezone
 
 from sentry.api.event_search import (
+    MAX_CACHED_QUERY_LENGTH,
     AggregateFilter,
     AggregateKey,
     SearchConfig,
     SearchFilter,
     SearchKey,
     SearchValue,
+    _parse_query_tree_cached,
+    event_search_grammar,
     parse_search_query,
 )
 from sentry.constants import MODULE_ROOT
@@ -638,6 +641,41 @@ class ParseSearchQueryBackendTest(SimpleTestCase):
         # the slash should be removed in the final value
         assert search_filter.value.value == 'a"b'
 
+    def test_parse_tree_cache(self):
+        _parse_query_tree_cached.cache_clear()
+        query = "user.email:foo@example.com time:-1d"
+        with patch(
+            "sentry.api.event_search.event_search_grammar.parse",
+            wraps=event_search_grammar.parse,
+        ) as grammar_parse:
+            now = timezone.now()
+            with freeze_time(now):
+                assert parse_search_query(query)[1].value.raw_value == now - timedelta(days=1)
+            assert grammar_parse.call_count == 1
+
+            # The tree is reused, but visited again with the new config and time.
+            with freeze_time(now + timedelta(hours=1)):
+                search_filters = parse_search_query(
+                    query, config_overrides={"key_mappings": {"email": ["user.email"]}}
+                )
+            assert grammar_parse.call_count == 1
+            assert search_filters == [
+                SearchFilter(
+                    key=SearchKey(name="email"), operator="=", value=SearchValue("foo@example.com")
+                ),
+                SearchFilter(
+                    key=SearchKey(name="time"),
+                    operator=">=",
+                    value=SearchValue(raw_value=now + timedelta(hours=1) - timedelta(days=1)),
+                ),
+            ]
+
+            # Long queries are not cached.
+            long_query = "a" * (MAX_CACHED_QUERY_LENGTH + 1)
+            parse_search_query(long_query)
+            parse_search_query(long_query)
+            assert grammar_parse.call_count == 3
+
 
 @pytest.mark.parametrize(
     "raw,result",
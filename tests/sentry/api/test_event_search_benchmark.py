@@ -0,0 +1,47 @@
+import pytest
+
+from sentry.api.event_search import _parse_query_tree_cached, parse_search_query
+
+# Common shapes of dashboard, alert and saved search queries.
+QUERIES = {
+    "empty": "",
+    "free_text": "TypeError: cannot read property",
+    "tag": "transaction:/api/0/organizations/{organization_slug}/issues/",
+    "tags": "event.type:transaction environment:production release:backend@24.1.0",
+    "negation_and_has": "!transaction.op:http.server has:user.email",
+    "in_list": "browser.name:[Chrome,Firefox,Safari] os.name:[Windows,Mac]",
+    "wildcard": "transaction:*checkout* http.url:https://*.example.com/*",
+    "numeric": "transaction.duration:>1s measurements.lcp:>=2500 measurements.cls:<0.1",
+    "date": "timestamp:>2024-01-01T00:00:00 timestamp:-24h",
+    "aggregate": "count():>100 p95(transaction.duration):>500ms failure_rate():>0.05",
+    "boolean": "(transaction:/checkout OR transaction:/cart) AND (http.status_code:500 OR http.status_code:503)",
+    "alert": "event.type:transaction transaction.op:http.server !transaction:/health* http.status_code:[500,502,503,504] environment:production",
+}
+
+
+def benchmark_available() -> bool:
+    try:
+        __import__("pytest_benchmark")
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("cached", [False, True], ids=["cold", "cached"])
+@pytest.mark.parametrize("name", sorted(QUERIES.keys()))
+def test_benchmark_parse_search_query(name, cached, benchmark):
+    """
+    Times parsing the most common query shapes, both with a cold parse tree
+    cache and with the tree of the query already cached.
+    """
+    query = QUERIES[name]
+
+    def setup():
+        if not cached:
+            _parse_query_tree_cached.cache_clear()
+        return (query,), {}
+
+    parse_search_query(query)
+    benchmark.pedantic(parse_search_query, setup=setup, rounds=200)
@@ -1,6 +1,13 @@
 import copy
 
-from sentry.attachments.base import BaseAttachmentCache, CachedAttachment
+import pytest
+
+from sentry.attachments.base import (
+    UNINITIALIZED_DATA,
+    BaseAttachmentCache,
+    CachedAttachment,
+    MissingAttachmentChunks,
+)
 
 
 class InMemoryCache:
@@ -25,6 +32,9 @@ class InMemoryCache:
         assert key not in self.raw_map or raw == self.raw_map[key]
         self.data[key] = value
 
+    def exists(self, key):
+        return key in self.data
+
     def delete(self, key):
         del self.data[key]
 
@@ -128,3 +138,38 @@ def test_basic_rate_limited():
     assert att2.id == att.id == 0
     assert att2.data == att.data == b"Hello World! Bye."
     assert att2.rate_limited is True
+
+
+def test_open_chunked():
+    data = InMemoryCache()
+    cache = BaseAttachmentCache(data)
+
+    cache.set_chunk("c:foo", 123, 0, b"Hello World! ")
+    cache.set_chunk("c:foo", 123, 1, b"")
+    cache.set_chunk("c:foo", 123, 2, b"Bye.")
+
+    att = cache.get_from_chunks(key="c:foo", id=123, chunks=3)
+    stream = att.open()
+    assert stream.read(5) == b"Hello"
+    assert stream.read(100) == b" World! "
+    assert stream.tell() == 13
+    assert stream.read() == b"Bye."
+    assert stream.read(100) == b""
+
+    stream.seek(0)
+    assert stream.read() == b"Hello World! Bye."
+
+    # Chunks are only read when the stream is, and are not kept around.
+    assert att._data is UNINITIALIZED_DATA
+    assert att.has_data()
+    del data.data["c:foo:a:123:2"]
+    assert not att.has_data()
+    stream = att.open()
+    assert stream.read(13) == b"Hello World! "
+    with pytest.raises(MissingAttachmentChunks):
+        stream.read()
+
+
+def test_open_unchunked():
+    att = CachedAttachment(name="lol.txt", content_type="text/plain", data=b"Hello World! Bye.")
+    assert att.open().read() == b"Hello World! Bye."
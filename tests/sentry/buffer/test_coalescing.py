@@ -0,0 +1,76 @@
+from unittest import mock
+
+import pytest
+
+from sentry.buffer.base import Buffer
+from sentry.buffer.coalescing import CoalescingBuffer
+from sentry.models.group import Group
+from sentry.testutils.cases import TestCase
+
+
+class CoalescingBufferTest(TestCase):
+    def setUp(self):
+        self.buf = CoalescingBuffer(
+            backend={"path": "sentry.buffer.base.Buffer"}, flush_interval=60, max_keys=10
+        )
+        self.buf.backend = mock.Mock(spec=Buffer)
+
+    def test_incr_merges_by_filters(self):
+        self.buf.incr(Group, {"times_seen": 1}, {"id": 1}, extra={"message": "a"})
+        self.buf.incr(Group, {"times_seen": 2}, {"id": 1}, extra={"message": "b"})
+        self.buf.incr(Group, {"times_seen": 1}, {"id": 2})
+        assert not self.buf.backend.incr.called
+
+        self.buf.flush()
+        assert self.buf.backend.incr.call_args_list == [
+            mock.call(
+                Group, {"times_seen": 3}, {"id": 1}, extra={"message": "b"}, signal_only=None
+            ),
+            mock.call(Group, {"times_seen": 1}, {"id": 2}, extra=None, signal_only=None),
+        ]
+
+        self.buf.backend.incr.reset_mock()
+        self.buf.flush()
+        assert not self.buf.backend.incr.called
+
+    def test_signal_only_is_not_merged(self):
+        self.buf.incr(Group, {"times_seen": 1}, {"id": 1})
+        self.buf.incr(Group, {"times_seen": 1}, {"id": 1}, signal_only=True)
+        self.buf.flush()
+        assert self.buf.backend.incr.call_count == 2
+
+    def test_flushes_when_max_keys_reached(self):
+        for i in range(10):
+            self.buf.incr(Group, {"times_seen": 1}, {"id": i})
+        assert self.buf.backend.incr.call_count == 10
+
+    def test_flushes_after_interval(self):
+        self.buf.flush_interval = 0.001
+        self.buf._last_flush -= 1
+        self.buf.incr(Group, {"times_seen": 1}, {"id": 1})
+        self.buf.backend.incr.assert_called_once()
+
+    def test_get_includes_pending(self):
+        self.buf.backend.get.return_value = {"times_seen": 2}
+        self.buf.incr(Group, {"times_seen": 3}, {"id": 1})
+        assert self.buf.get(Group, ["times_seen"], {"id": 1}) == {"times_seen": 5}
+
+    def test_failed_flush_keeps_unwritten_increments(self):
+        self.buf.incr(Group, {"times_seen": 1}, {"id": 1})
+        self.buf.incr(Group, {"times_seen": 1}, {"id": 2})
+        self.buf.incr(Group, {"times_seen": 1}, {"id": 3})
+        self.buf.backend.incr.side_effect = [None, Exception("boom")]
+
+        with pytest.raises(Exception, match="boom"):
+            self.buf.flush()
+        assert self.buf.backend.incr.call_count == 2
+
+        self.buf.incr(Group, {"times_seen": 2}, {"id": 2}, extra={"message": "b"})
+        self.buf.backend.incr.reset_mock(side_effect=True)
+        self.buf.flush()
+        assert self.buf.backend.incr.call_args_list == [
+            mock.call(
+                Group, {"times_seen": 3}, {"id": 2}, extra={"message": "b"}, signal_only=None
+            ),
+            mock.call(Group, {"times_seen": 1}, {"id": 3}, extra=None, signal_only=None),
+        ]
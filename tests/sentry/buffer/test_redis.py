@@ -138,6 +138,45 @@ class TestRedisBuffer:
         group = Group.objects.get_from_cache(id=default_group.id)
         assert group.times_seen == orig_times_seen + times_seen_incr
 
+    @django_db_all
+    @freeze_time()
+    def test_bulk_flush_updates_groups(self, default_group, task_runner):
+        self.buf.bulk_flush = True
+        orig_times_seen = Group.objects.get_from_cache(id=default_group.id).times_seen
+        now = timezone.now()
+        self.buf.incr(Group, {"times_seen": 3}, {"id": default_group.id}, {"last_seen": now})
+        self.buf.incr(Group, {"times_seen": 2}, {"id": default_group.id}, {"last_seen": now})
+        with task_runner(), mock.patch("sentry.buffer", self.buf):
+            self.buf.process_pending()
+        group = Group.objects.get_from_cache(id=default_group.id)
+        assert group.times_seen == orig_times_seen + 5
+        assert group.last_seen == now
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        assert client.zrange("b:p", 0, -1) == []
+
+    @django_db_all
+    def test_bulk_flush_skips_deleted_groups(self, default_group):
+        self.buf.bulk_flush = True
+        self.buf.incr(Group, {"times_seen": 1}, {"id": default_group.id})
+        self.buf.incr(Group, {"times_seen": 1}, {"id": default_group.id + 1000})
+        self.buf.process(
+            batch_keys=[
+                self.buf._make_key(Group, {"id": default_group.id}),
+                self.buf._make_key(Group, {"id": default_group.id + 1000}),
+            ]
+        )
+        assert Group.objects.get(id=default_group.id).times_seen == default_group.times_seen + 1
+        assert not Group.objects.filter(id=default_group.id + 1000).exists()
+
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_bulk_flush_falls_back_to_single_process(self, process):
+        self.buf.bulk_flush = True
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1}, signal_only=True)
+        self.buf.process(batch_keys=[self.buf._make_key(model, {"pk": 1})])
+        process.assert_called_once_with(mock.Mock, {"times_seen": 1}, {"pk": 1}, {}, True)
+
     def test_get(self):
         model = mock.Mock()
         model.__name__ = "Mock"
@@ -8,6 +8,7 @@ from sentry.digests.backends.base import InvalidState
 from sentry.digests.backends.redis import RedisBackend
 from sentry.digests.types import Notification, Record
 from sentry.testutils.cases import TestCase
+from sentry.utils.locking import UnableToAcquireLock
 
 
 class RedisBackendTestCase(TestCase):
@@ -158,3 +159,44 @@ class RedisBackendTestCase(TestCase):
 
         with backend.digest("timeline", 0) as records:
             assert len(records) == n
+
+    def test_digest_many(self):
+        backend = RedisBackend()
+
+        for timeline in ("timeline:1", "timeline:2"):
+            backend.add(timeline, Record(f"{timeline}:record", self.notification, time.time()))
+
+        with backend.digest_many({"timeline:1": 0, "timeline:2": 0, "timeline:3": 0}) as digests:
+            assert {
+                key: [record.key for record in records] for key, records in digests.items()
+            } == {
+                "timeline:1": ["timeline:1:record"],
+                "timeline:2": ["timeline:2:record"],
+            }
+
+            # Timelines are locked while the batch is open.
+            with pytest.raises(UnableToAcquireLock):
+                with backend.digest("timeline:1", 0):
+                    pass
+
+            # Leave the second timeline open.
+            del digests["timeline:2"]
+
+        # The first timeline was closed, the second one is still ready.
+        with pytest.raises(InvalidState):
+            with backend.digest("timeline:1", 0):
+                pass
+
+        with backend.digest("timeline:2", 0) as records:
+            assert [record.key for record in records] == ["timeline:2:record"]
+
+    def test_digest_many_failure_recovery(self):
+        backend = RedisBackend()
+        backend.add("timeline", Record("record:1", self.notification, time.time()))
+
+        with pytest.raises(RuntimeError, match="not be closed"):
+            with backend.digest_many({"timeline": 0}):
+                raise RuntimeError("This causes the digests to not be closed.")
+
+        with backend.digest_many({"timeline": None}) as digests:
+            assert [record.key for record in digests["timeline"]] == ["record:1"]
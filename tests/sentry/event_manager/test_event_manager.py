@@ -1912,6 +1912,39 @@ class EventManagerTest(TestCase, SnubaTestCase, EventManagerTestMixin, Performan
         assert o.kwargs["outcome"] == Outcome.ACCEPTED
         assert o.kwargs["category"] == DataCategory.ERROR
 
+    def test_attachment_missing_chunks_outcome(self) -> None:
+        manager = EventManager(make_event(message="foo"), project=self.project)
+        manager.normalize()
+
+        cache_key = cache_key_for_event(manager.get_data())
+        # The attachment's chunks expired before the event was saved.
+        a1 = CachedAttachment(key=cache_key, id=0, name="a1", chunks=2, size=10)
+        attachment_cache.set(cache_key, attachments=[a1])
+
+        mock_track_outcome = mock.Mock()
+        with (
+            mock.patch("sentry.event_manager.track_outcome", mock_track_outcome),
+            mock.patch(
+                "sentry.ratelimits.backend.is_limited_with_value", return_value=(True, 1, 0)
+            ) as is_limited,
+            self.feature("organizations:event-attachments"),
+        ):
+            manager.save(self.project.id, cache_key=cache_key, has_attachments=True)
+
+        # Missing attachments do not count against the rate limits and are not
+        # reported as rate limited.
+        assert not is_limited.called
+        assert mock_track_outcome.call_count == 2
+
+        o = mock_track_outcome.mock_calls[0]
+        assert o.kwargs["outcome"] == Outcome.INVALID
+        assert o.kwargs["category"] == DataCategory.ATTACHMENT
+        assert o.kwargs["reason"] == "missing_chunks"
+
+        o = mock_track_outcome.mock_calls[1]
+        assert o.kwargs["outcome"] == Outcome.ACCEPTED
+        assert o.kwargs["category"] == DataCategory.ERROR
+
     def test_transaction_outcome_accepted(self) -> None:
         """
         Without metrics extraction, we count the number of accepted transaction
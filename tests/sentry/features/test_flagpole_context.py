@@ -1,9 +1,11 @@
 import pytest
 from django.contrib.auth.models import AnonymousUser
 
+from sentry.features.evaluation_cache import feature_evaluation_cache
 from sentry.features.flagpole_context import (
     InvalidContextDataException,
     SentryContextData,
+    build_sentry_flagpole_context,
     get_sentry_flagpole_context_builder,
     organization_context_transformer,
     project_context_transformer,
@@ -13,6 +15,7 @@ from sentry.hybridcloud.services.organization_mapping import organization_mappin
 from sentry.models.useremail import UserEmail
 from sentry.organizations.services.organization import organization_service
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.silo import control_silo_test
 
 
@@ -31,6 +34,21 @@ class TestSentryFlagpoleContext(TestCase):
         assert sentry_context.get("project_slug") == project.slug
         assert sentry_context.get("project_id") == project.id
 
+    @override_options({"features.evaluation-cache.enable": True})
+    def test_build_sentry_flagpole_context_cached(self):
+        org = self.create_organization()
+        other_org = self.create_organization()
+
+        with feature_evaluation_cache():
+            context = build_sentry_flagpole_context(SentryContextData(organization=org))
+            assert context.get("organization_id") == org.id
+            assert build_sentry_flagpole_context(SentryContextData(organization=org)) is context
+
+            other_context = build_sentry_flagpole_context(SentryContextData(organization=other_org))
+            assert other_context.get("organization_id") == other_org.id
+
+        assert build_sentry_flagpole_context(SentryContextData(organization=org)) is not context
+
 
 class TestSentryOrganizationContextTransformer(TestCase):
     def test_without_organization_passed(self):
@@ -0,0 +1,73 @@
+from unittest import mock
+
+from flagpole.compiled import CompiledFeature
+from sentry.features import flagpole_features
+from sentry.features.flagpole_context import SentryContextData
+from sentry.features.flagpole_features import (
+    compile_flagpole_features,
+    get_flagpole_feature,
+    has_flagpole_feature,
+)
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
+
+FEATURE_NAME = "organizations:activated-alert-rules"
+OPTION_NAME = f"feature.{FEATURE_NAME}"
+
+
+def make_config(organization_ids: list[int]) -> dict:
+    return {
+        "created_at": "2024-01-01T00:00:00.000Z",
+        "owner": "test-owner",
+        "segments": [
+            {
+                "name": "orgs",
+                "rollout": 100,
+                "conditions": [
+                    {"property": "organization_id", "operator": "in", "value": organization_ids}
+                ],
+            }
+        ],
+    }
+
+
+class FlagpoleFeaturesTest(TestCase):
+    def test_no_definition(self):
+        assert get_flagpole_feature(FEATURE_NAME) is None
+        assert (
+            has_flagpole_feature(FEATURE_NAME, SentryContextData(organization=self.organization))
+            is None
+        )
+
+    def test_has_flagpole_feature(self):
+        other_org = self.create_organization()
+
+        with override_options({OPTION_NAME: make_config([self.organization.id])}):
+            assert has_flagpole_feature(
+                FEATURE_NAME, SentryContextData(organization=self.organization)
+            )
+            assert not has_flagpole_feature(FEATURE_NAME, SentryContextData(organization=other_org))
+
+    def test_recompiles_on_option_change(self):
+        with (
+            mock.patch.dict(flagpole_features._compiled_features, clear=True),
+            mock.patch.object(
+                CompiledFeature, "compile", wraps=CompiledFeature.compile
+            ) as compile_feature,
+        ):
+            with override_options({OPTION_NAME: make_config([1])}):
+                compile_flagpole_features([FEATURE_NAME])
+                feature = get_flagpole_feature(FEATURE_NAME)
+                assert feature is not None
+                assert get_flagpole_feature(FEATURE_NAME) is feature
+                assert compile_feature.call_count == 1
+
+            with override_options({OPTION_NAME: make_config([1, 2])}):
+                new_feature = get_flagpole_feature(FEATURE_NAME)
+                assert new_feature is not None
+                assert new_feature is not feature
+                assert compile_feature.call_count == 2
+
+    def test_invalid_definition(self):
+        with override_options({OPTION_NAME: {"segments": "nope"}}):
+            assert get_flagpole_feature(FEATURE_NAME) is None
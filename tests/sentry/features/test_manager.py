@@ -15,8 +15,10 @@ from sentry.features.base import (
     SystemFeature,
     UserFeature,
 )
+from sentry.features.evaluation_cache import feature_evaluation_cache
 from sentry.models.user import User
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.users.services.user import RpcUser
 
 
@@ -374,3 +376,102 @@ class FeatureManagerTest(TestCase):
         manager = features.FeatureManager()
         with pytest.raises(NotImplementedError):
             manager.add("users:some-test", OrganizationFeature, FeatureHandlerStrategy.OPTIONS)
+
+    @override_options({"features.evaluation-cache.enable": True})
+    def test_evaluation_cache(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", OrganizationFeature)
+        manager.add("projects:feature", ProjectFeature)
+        entity_handler = mock.Mock()
+        entity_handler.has.return_value = True
+        manager.add_entity_handler(entity_handler)
+
+        with feature_evaluation_cache() as cache:
+            assert cache is not None
+            for _ in range(3):
+                assert manager.has("organizations:feature", self.organization, actor=self.user)
+            assert len(entity_handler.has.mock_calls) == 1
+
+            # Results are cached per subject and actor
+            assert manager.has("organizations:feature", self.organization)
+            assert manager.has("projects:feature", self.project, actor=self.user)
+            assert len(entity_handler.has.mock_calls) == 3
+
+            # Nested scopes share the cache
+            with feature_evaluation_cache() as nested_cache:
+                assert nested_cache is cache
+                assert manager.has("organizations:feature", self.organization, actor=self.user)
+            assert len(entity_handler.has.mock_calls) == 3
+
+        # Outside of a scope, features are evaluated every time
+        assert manager.has("organizations:feature", self.organization, actor=self.user)
+        assert len(entity_handler.has.mock_calls) == 4
+
+    def test_evaluation_cache_disabled(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", OrganizationFeature)
+        entity_handler = mock.Mock()
+        entity_handler.has.return_value = True
+        manager.add_entity_handler(entity_handler)
+
+        with feature_evaluation_cache() as cache:
+            assert cache is None
+            manager.has("organizations:feature", self.organization)
+            manager.has("organizations:feature", self.organization)
+        assert len(entity_handler.has.mock_calls) == 2
+
+    @override_options({"features.evaluation-cache.enable": True})
+    def test_evaluation_cache_errors_not_cached(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", OrganizationFeature)
+        entity_handler = mock.Mock()
+        entity_handler.has.side_effect = [Exception("something bad"), True]
+        manager.add_entity_handler(entity_handler)
+
+        with feature_evaluation_cache():
+            assert not manager.has("organizations:feature", self.organization)
+            assert manager.has("organizations:feature", self.organization)
+            assert manager.has("organizations:feature", self.organization)
+        assert len(entity_handler.has.mock_calls) == 2
+
+    @override_options({"features.evaluation-cache.enable": True})
+    def test_prefetch(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", OrganizationFeature)
+        manager.add("projects:feature", ProjectFeature)
+        entity_handler = MockBatchHandler()
+        manager.add_entity_handler(entity_handler)
+        projects = [self.project, self.create_project()]
+
+        with (
+            feature_evaluation_cache(),
+            mock.patch.object(entity_handler, "has", wraps=entity_handler.has) as has,
+        ):
+            manager.prefetch(
+                ["organizations:feature", "projects:feature"],
+                self.organization,
+                projects,
+                actor=self.user,
+            )
+            assert manager.has("organizations:feature", self.organization, actor=self.user)
+            for project in projects:
+                assert manager.has("projects:feature", project, actor=self.user)
+            assert has.call_count == 0
+
+            # Prefetched results are specific to the actor
+            assert manager.has("organizations:feature", self.organization)
+            assert has.call_count == 1
+
+    @override_options({"features.evaluation-cache.enable": True})
+    def test_prefetch_skips_registered_handlers(self):
+        manager = features.FeatureManager()
+        manager.add("organizations:feature", OrganizationFeature)
+        registered_handler = mock.Mock()
+        registered_handler.features = ["organizations:feature"]
+        registered_handler.return_value = False
+        manager.add_handler(registered_handler)
+        manager.add_entity_handler(MockBatchHandler())
+
+        with feature_evaluation_cache():
+            manager.prefetch(["organizations:feature"], self.organization)
+            assert not manager.has("organizations:feature", self.organization)
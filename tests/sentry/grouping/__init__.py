@@ -23,7 +23,7 @@ class GroupingInput:
         with open(os.path.join(_grouping_fixture_path, self.filename)) as f:
             return json.load(f)
 
-    def create_event(self, grouping_config):
+    def normalize(self, grouping_config):
         grouping_input = dict(self.data)
         # Customize grouping config from the _grouping config
         grouping_info = grouping_input.pop("_grouping", None) or {}
@@ -36,7 +36,10 @@ class GroupingInput:
         # Normalize the event
         mgr = EventManager(data=grouping_input, grouping_config=grouping_config)
         mgr.normalize()
-        data = mgr.get_data()
+        return mgr.get_data()
+
+    def create_event(self, grouping_config):
+        data = self.normalize(grouping_config)
 
         # Normalize the stacktrace for grouping.  This normally happens in
         # save()
@@ -8,8 +8,10 @@ from sentry.grouping.ingest.hashing import (
     _calculate_background_grouping,
     _calculate_event_grouping,
     _calculate_secondary_hash,
+    get_or_create_grouphashes,
 )
 from sentry.models.group import Group
+from sentry.models.grouphash import GroupHash
 from sentry.testutils.cases import TestCase
 from sentry.testutils.skips import requires_snuba
 
@@ -167,3 +169,24 @@ class SecondaryGroupingTest(TestCase):
             mock_capture_exception.assert_called_with(secondary_grouping_error)
             # This proves the secondary grouping crash didn't crash the overall grouping process
             assert event.group
+
+
+class GetOrCreateGroupHashesTest(TestCase):
+    def test_creates_missing_in_order(self):
+        existing = GroupHash.objects.create(project=self.project, hash="a" * 32)
+
+        grouphashes = get_or_create_grouphashes(self.project, ["b" * 32, "a" * 32, "c" * 32])
+
+        assert [gh.hash for gh in grouphashes] == ["b" * 32, "a" * 32, "c" * 32]
+        assert grouphashes[1].id == existing.id
+        assert GroupHash.objects.filter(project=self.project).count() == 3
+
+    def test_single_query_for_existing(self):
+        hashes = ["a" * 32, "b" * 32]
+        for hash in hashes:
+            GroupHash.objects.create(project=self.project, hash=hash)
+
+        with self.assertNumQueries(1):
+            grouphashes = get_or_create_grouphashes(self.project, hashes)
+
+        assert [gh.hash for gh in grouphashes] == hashes
@@ -1,8 +1,12 @@
 import pytest
 
-from sentry.grouping.api import get_default_grouping_config_dict
+from sentry.grouping.api import get_default_grouping_config_dict, load_grouping_config
+from sentry.grouping.enhancer import match_frame_cache
+from sentry.grouping.parameterization import Parameterizer, UniqueIdExperiment
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.stacktraces.processing import normalize_stacktraces_for_grouping
 from tests.sentry.grouping import grouping_input as grouping_inputs
+from tests.sentry.grouping.test_parameterization import MESSAGE_CORPUS
 
 CONFIGS = {key: get_default_grouping_config_dict(key) for key in sorted(CONFIGURATIONS.keys())}
 
@@ -30,6 +34,43 @@ def test_benchmark_grouping(config_name, benchmark):
     benchmark.pedantic(run_configuration, setup=setup, rounds=len(grouping_inputs))
 
 
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("phase", ["normalize_stacktraces", "get_hashes"])
+@pytest.mark.parametrize(
+    "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
+)
+def test_benchmark_grouping_phase(config_name, phase, benchmark):
+    """
+    Times the phases of grouping separately. The results are reported per phase and config.
+    """
+    input_iter = iter(grouping_inputs)
+
+    def setup_normalize_stacktraces():
+        config = dict(CONFIGS[config_name])
+        data = next(input_iter).normalize(config)
+        return (data, load_grouping_config(config)), {}
+
+    def setup_get_hashes():
+        event = next(input_iter).create_event(dict(CONFIGS[config_name]))
+        event.project = None
+        return (event,), {}
+
+    if phase == "normalize_stacktraces":
+        benchmark.pedantic(
+            normalize_stacktraces_for_grouping,
+            setup=setup_normalize_stacktraces,
+            rounds=len(grouping_inputs),
+        )
+    else:
+        benchmark.pedantic(get_hashes, setup=setup_get_hashes, rounds=len(grouping_inputs))
+
+
+def get_hashes(event):
+    # Match frames are reused across grouping variants during ingestion, so do the same here
+    with match_frame_cache():
+        event.get_hashes()
+
+
 def run_configuration(grouping_input, config):
     event = grouping_input.create_event(config)
 
@@ -37,3 +78,32 @@ def run_configuration(grouping_input, config):
     event.project = None
 
     event.get_hashes()
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+def test_benchmark_parameterization(benchmark):
+    parameterizer = Parameterizer(
+        regex_pattern_keys=(
+            "email",
+            "url",
+            "hostname",
+            "ip",
+            "uuid",
+            "sha1",
+            "md5",
+            "date",
+            "duration",
+            "hex",
+            "float",
+            "int",
+            "quoted_str",
+            "bool",
+        ),
+        experiments=(UniqueIdExperiment,),
+    )
+
+    def run() -> None:
+        for message in MESSAGE_CORPUS:
+            parameterizer.parameterize_all(message)
+
+    benchmark(run)
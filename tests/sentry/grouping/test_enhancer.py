@@ -6,7 +6,7 @@ from unittest import mock
 import pytest
 
 from sentry.grouping.component import GroupingComponent
-from sentry.grouping.enhancer import Enhancements
+from sentry.grouping.enhancer import Enhancements, create_match_frames, match_frame_cache
 from sentry.grouping.enhancer.exceptions import InvalidEnhancerConfig
 from sentry.grouping.enhancer.matchers import _cached, create_match_frame
 
@@ -511,3 +511,29 @@ def test_cached_with_kwargs():
     # Call with different kwargs order - call_count is still one:
     _cached(cache, foo, kw2=2, kw1=1)
     assert foo.call_count == 1
+
+
+def test_match_frame_cache():
+    frames = [{"function": "foo", "in_app": False}, {"function": "foo", "in_app": False}]
+
+    with mock.patch(
+        "sentry.grouping.enhancer.create_match_frame", side_effect=create_match_frame
+    ) as create:
+        create_match_frames(frames, "native")
+        assert create.call_count == 2
+
+        with match_frame_cache():
+            enhancements = Enhancements.from_config_string("function:foo +app")
+            enhancements.apply_modifications_to_frame(frames, "native", {})
+            assert create.call_count == 3
+            assert all(frame["in_app"] for frame in frames)
+
+            # The modified frames no longer match the cached ones
+            with match_frame_cache():
+                match_frames = create_match_frames(frames, "native")
+            assert create.call_count == 4
+            assert match_frames[0] is match_frames[1]
+            assert match_frames[0]["in_app"] is True
+
+            create_match_frames(frames, "native")
+            assert create.call_count == 4
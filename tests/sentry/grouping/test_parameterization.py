@@ -1,8 +1,11 @@
+import os
+import re
 from unittest import mock
 
 import pytest
 
 from sentry.grouping.parameterization import (
+    PARAMETERIZATION_PREFILTER,
     ParameterizationRegexExperiment,
     Parameterizer,
     UniqueIdExperiment,
@@ -268,6 +271,41 @@ def test_parameterize_regex_experiment_cached_compiled():
     mocked_pattern.assert_called_once()
 
 
+def _load_message_corpus() -> list[str]:
+    path = os.path.join(os.path.dirname(__file__), "parameterization_inputs", "messages.txt")
+    with open(path) as f:
+        return [line for line in f.read().splitlines() if line]
+
+
+MESSAGE_CORPUS = _load_message_corpus()
+
+
+@pytest.mark.parametrize("message", MESSAGE_CORPUS)
+def test_parameterize_prefilter_parity(message, parameterizer):
+    """
+    Skipping messages which fail the prefilter must not change the result of the combined regex.
+    """
+
+    def _handle_regex_match(match: re.Match[str]) -> str:
+        for key, value in match.groupdict().items():
+            if value is not None:
+                return f"<{key}>"
+        return ""
+
+    expected = parameterizer._parameterization_regex.sub(_handle_regex_match, message)
+    assert parameterizer.parametrize_w_regex(message) == expected
+    if not PARAMETERIZATION_PREFILTER.search(message):
+        assert expected == message
+
+
+def test_parameterization_regex_compiled_once():
+    keys = ("email", "int")
+    assert (
+        Parameterizer(regex_pattern_keys=keys)._parameterization_regex
+        is Parameterizer(regex_pattern_keys=list(keys))._parameterization_regex
+    )
+
+
 # These are test cases that we should fix
 @pytest.mark.xfail()
 @pytest.mark.parametrize(
@@ -10,6 +10,7 @@ from sentry.grouping.api import (
 )
 from sentry.grouping.component import GroupingComponent
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.testutils.helpers.options import override_options
 from sentry.utils import json
 from tests.sentry.grouping import with_grouping_input
 
@@ -85,3 +86,24 @@ def test_event_hash_variant(config_name, grouping_input, insta_snapshot, log):
     assert evt.get_grouping_config() == grouping_config
 
     insta_snapshot(output)
+
+
+@with_grouping_input("grouping_input")
+@pytest.mark.parametrize("config_name", CONFIGURATIONS.keys(), ids=lambda x: x.replace("-", "_"))
+def test_event_hash_variant_frame_component_cache(config_name, grouping_input):
+    grouping_config = get_default_grouping_config_dict(config_name)
+
+    def dump_variants():
+        evt = grouping_input.create_event(grouping_config)
+        evt.project = None
+        rv: list[str] = []
+        for key, value in sorted(evt.get_grouping_variants().items()):
+            rv.append("%s:" % key)
+            dump_variant(value, rv, 1)
+        return rv
+
+    expected = dump_variants()
+    with override_options({"grouping.frame-component-cache.enabled": True}):
+        # The second run is served from the cache
+        assert dump_variants() == expected
+        assert dump_variants() == expected
@@ -12,6 +12,7 @@ from sentry.ingest.transaction_clusterer.datasource.redis import (
     get_active_projects,
     get_redis_client,
     get_transaction_names,
+    get_tree,
     record_transaction_name,
 )
 from sentry.ingest.transaction_clusterer.meta import get_clusterer_meta
@@ -25,7 +26,11 @@ from sentry.ingest.transaction_clusterer.rules import (
     update_rules,
 )
 from sentry.ingest.transaction_clusterer.tasks import cluster_projects, spawn_clusterers
-from sentry.ingest.transaction_clusterer.tree import TreeClusterer
+from sentry.ingest.transaction_clusterer.tree import (
+    CompactTree,
+    IncrementalTreeClusterer,
+    TreeClusterer,
+)
 from sentry.models.organization import Organization
 from sentry.models.project import Project
 from sentry.relay.config import get_project_config
@@ -86,6 +91,66 @@ def test_clusterer_doesnt_generate_invalid_rules():
     assert clusterer.get_rules() == []
 
 
+def test_incremental_multi_fanout():
+    clusterer = IncrementalTreeClusterer(merge_threshold=3)
+    transaction_names = [
+        "/a/b0/c/d0/e",
+        "/a/b0/c/d1/e",
+        "/a/b0/c/d2/e",
+        "/a/b1/c/d0/e",
+        "/a/b1/c/d1/e/",
+        "/a/b1/c/d2/e",
+        "/a/b2/c/d0/e",
+        "/a/b2/c/d1/e/",
+        "/a/b2/c/d2/e",
+        "/a/b2/c1/d2/e",
+    ]
+    clusterer.add_input(transaction_names)
+    assert clusterer.get_rules() == ["/a/*/c/*/**", "/a/*/**"]
+
+
+def test_incremental_deep_tree():
+    clusterer = IncrementalTreeClusterer(merge_threshold=1)
+    clusterer.add_input([1001 * "/."])
+
+    # Does not throw an exception:
+    clusterer.get_rules()
+
+
+def test_incremental_across_runs():
+    clusterer = IncrementalTreeClusterer(merge_threshold=3)
+    clusterer.add_input(["/a/b0/c", "/a/b1/c", "/x/y0"])
+    assert clusterer.get_rules() == []
+
+    # Merges take into account the names of earlier runs
+    tree = CompactTree.loads(clusterer.tree.dumps())
+    clusterer = IncrementalTreeClusterer(merge_threshold=3, tree=tree)
+    clusterer.add_input(["/a/b2/c"])
+    assert clusterer.get_rules() == ["/a/*/**"]
+
+    # Only rules that new names went through are returned
+    tree = CompactTree.loads(clusterer.tree.dumps())
+    clusterer = IncrementalTreeClusterer(merge_threshold=3, tree=tree)
+    clusterer.add_input(["/x/y1"])
+    assert clusterer.get_rules() == []
+
+    clusterer.add_input(["/a/b3/d"])
+    assert clusterer.get_rules() == ["/a/*/**"]
+
+
+def test_incremental_keeps_merges():
+    clusterer = IncrementalTreeClusterer(merge_threshold=2)
+    clusterer.add_input(["/a/b/c0", "/a/b/c1"])
+    assert clusterer.get_rules() == ["/a/b/*/**"]
+
+    # Merging `/a` also merges what is under `/a/b` with `/a/c/d`
+    clusterer.add_input(["/a/c/d"])
+    assert clusterer.get_rules() == ["/a/*/*/**", "/a/*/**"]
+
+    tree = CompactTree.loads(clusterer.tree.dumps())
+    assert len(tree) == len(clusterer.tree) == 5
+
+
 @mock.patch("sentry.ingest.transaction_clusterer.datasource.redis.MAX_SET_SIZE", 5)
 def test_collection():
     org = Organization(pk=666)
@@ -369,6 +434,30 @@ def test_clusterer_only_runs_when_enough_transactions(mock_update_rules, default
     )
 
 
+@mock.patch("sentry.ingest.transaction_clusterer.datasource.redis.MAX_SET_SIZE", 10)
+@mock.patch("sentry.ingest.transaction_clusterer.tasks.MERGE_THRESHOLD", 3)
+@mock.patch("sentry.ingest.transaction_clusterer.rules.update_rules")
+@django_db_all
+def test_incremental_clusterer_task(mock_update_rules, default_project):
+    project = default_project
+
+    with override_options({"txnames.clusterer.incremental": True}):
+        _record_sample(ClustererNamespace.TRANSACTIONS, project, "/transaction/number/1")
+        _record_sample(ClustererNamespace.TRANSACTIONS, project, "/transaction/number/2")
+        cluster_projects([project])
+        assert mock_update_rules.call_args == mock.call(
+            ClustererNamespace.TRANSACTIONS, project, []
+        )
+        assert get_tree(ClustererNamespace.TRANSACTIONS, project)
+
+        # The third name is clustered together with the names of the last run
+        _record_sample(ClustererNamespace.TRANSACTIONS, project, "/transaction/number/3")
+        cluster_projects([project])
+        assert mock_update_rules.call_args == mock.call(
+            ClustererNamespace.TRANSACTIONS, project, ["/transaction/number/*/**"]
+        )
+
+
 @django_db_all
 def test_get_deleted_project():
     deleted_project = Project(pk=666, organization=Organization(pk=666))
@@ -97,3 +97,37 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_set_compressed(ns):
+    ns.set("node_1", {"foo": "uncompressed"})
+    with override_options({"nodestore.compression": "zstd"}):
+        ns.set_subkeys("node_2", {None: {"foo": "a", "platform": "python"}, "other": {"foo": "b"}})
+
+    assert ns.get_multi(["node_1", "node_2"]) == {
+        "node_1": {"foo": "uncompressed"},
+        "node_2": {"foo": "a", "platform": "python"},
+    }
+    assert ns.get("node_2", subkey="other") == {"foo": "b"}
+
+
+@pytest.mark.parametrize("sectioned", [True, False])
+@override_options({"nodestore.set-subkeys.enable-set-cache-item": False})
+def test_get_multi_fields(ns, sectioned):
+    data = {"title": "hello", "culprit": "foo in bar", "exception": {"values": []}}
+    with override_options({"nodestore.sectioned-encoding": sectioned}):
+        ns.set_subkeys("node_1", {None: data, "other": {"title": "other"}})
+        ns.set("node_2", {"title": "world"})
+
+    assert ns.get("node_1") == data
+    assert ns.get("node_1", subkey="other") == {"title": "other"}
+    assert ns.get("node_1", fields=["title", "culprit"]) == {
+        "title": "hello",
+        "culprit": "foo in bar",
+    }
+    assert ns.get_multi(["node_1", "node_2", "node_3"], fields=["culprit"]) == {
+        "node_1": {"culprit": "foo in bar"},
+        "node_2": {},
+        "node_3": None,
+    }
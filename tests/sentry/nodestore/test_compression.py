@@ -0,0 +1,68 @@
+import pytest
+import zstandard
+
+from sentry.nodestore.compression import (
+    DictionaryRegistry,
+    NodeCompressionError,
+    NodeCompressor,
+    dictionary_filename,
+    is_framed,
+)
+from sentry.testutils.helpers import override_options
+from sentry.utils import json
+
+SAMPLES = [
+    json.dumps(
+        {
+            "platform": "python",
+            "sdk": {"name": "sentry.python", "version": f"2.{i % 20}.0"},
+            "modules": {"django": "5.0", "requests": f"2.{i % 30}"},
+            "message": f"Something went wrong in request {i}",
+        }
+    ).encode("utf8")
+    for i in range(1000)
+]
+
+
+@pytest.fixture
+def dictionary_dir(tmp_path):
+    dictionary = zstandard.train_dictionary(4096, SAMPLES)
+    (tmp_path / dictionary_filename("python", 1)).write_bytes(dictionary.as_bytes())
+    return tmp_path
+
+
+def test_roundtrip_without_dictionaries():
+    compressor = NodeCompressor(DictionaryRegistry(None))
+    compressed = compressor.compress(SAMPLES[0], platform="python")
+    assert is_framed(compressed)
+    assert compressor.decompress(compressed) == SAMPLES[0]
+
+
+def test_legacy_payloads_pass_through():
+    compressor = NodeCompressor(DictionaryRegistry(None))
+    assert compressor.decompress(b'{"foo":"bar"}') == b'{"foo":"bar"}'
+
+
+@override_options({"nodestore.compression.use-dictionaries": True})
+def test_roundtrip_with_dictionary(dictionary_dir):
+    compressor = NodeCompressor(DictionaryRegistry(str(dictionary_dir)))
+    plain = NodeCompressor(DictionaryRegistry(None)).compress(SAMPLES[1])
+
+    compressed = compressor.compress(SAMPLES[1], platform="python")
+    assert len(compressed) < len(plain)
+    assert zstandard.get_frame_parameters(compressed[2:]).dict_id != 0
+    assert compressor.decompress(compressed) == SAMPLES[1]
+
+    # Platforms without a dictionary are still compressed
+    other = compressor.compress(SAMPLES[1], platform="javascript")
+    assert zstandard.get_frame_parameters(other[2:]).dict_id == 0
+    assert compressor.decompress(other) == SAMPLES[1]
+
+
+@override_options({"nodestore.compression.use-dictionaries": True})
+def test_missing_dictionary(dictionary_dir):
+    compressed = NodeCompressor(DictionaryRegistry(str(dictionary_dir))).compress(
+        SAMPLES[2], platform="python"
+    )
+    with pytest.raises(NodeCompressionError):
+        NodeCompressor(DictionaryRegistry(None)).decompress(compressed)
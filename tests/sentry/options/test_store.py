@@ -164,3 +164,66 @@ class OptionsStoreTest(TestCase):
         mocked_time.return_value = 26
         store.clean_local_cache()
         assert not store._local_cache
+
+    @override_settings(SENTRY_OPTIONS_SNAPSHOT_INTERVAL=10)
+    @patch("sentry.options.store.threading.Thread")
+    def test_snapshot(self, mock_thread):
+        store, key = self.store, self.key
+        other_key = self.make_key()
+        store.set(other_key, "foo", UpdateChannel.CLI)
+
+        assert store.get(key) is None
+        assert mock_thread.return_value.start.call_count == 1
+        with self.captureOnCommitCallbacks(execute=True):
+            store.set(key, "bar", UpdateChannel.CLI)
+
+        # Options are served from the snapshot without any network round trip
+        with patch.object(Option.objects, "get_queryset", side_effect=RuntimeError()):
+            with patch.object(store.cache, "get", side_effect=RuntimeError()):
+                assert store.get(key) == "bar"
+                assert store.get(other_key) == "foo"
+                assert store.get(self.make_key()) is None
+        assert mock_thread.return_value.start.call_count == 1
+
+    @override_settings(SENTRY_OPTIONS_SNAPSHOT_INTERVAL=10)
+    @patch("sentry.options.store.threading.Thread")
+    def test_snapshot_refresh(self, mock_thread):
+        store, key = self.store, self.key
+        # Another process sharing the cache
+        other_store = OptionsStore(cache=store.cache)
+
+        assert other_store.get(key) is None
+
+        with self.captureOnCommitCallbacks(execute=True):
+            store.set(key, "bar", UpdateChannel.CLI)
+        assert other_store.get(key) is None
+
+        # The watcher picks up the new version of the snapshot
+        other_store.refresh_snapshot()
+        assert other_store.get(key) == "bar"
+
+        with self.captureOnCommitCallbacks(execute=True):
+            store.delete(key)
+        assert store.get(key) is None
+        other_store.refresh_snapshot()
+        assert other_store.get(key) is None
+
+    @override_settings(SENTRY_OPTIONS_SNAPSHOT_INTERVAL=10)
+    @patch("sentry.options.store.threading.Thread")
+    @patch("sentry.options.store.time")
+    def test_snapshot_stale(self, mocked_time, mock_thread):
+        store, key = self.store, self.key
+        mocked_time.return_value = 1000
+        store.set(key, "bar", UpdateChannel.CLI)
+        assert store.get_snapshot() is not None
+
+        # Snapshots that cannot be refreshed are used for a while
+        mocked_time.return_value = 1050
+        with patch.object(store.cache, "get", side_effect=RuntimeError()):
+            store.refresh_snapshot()
+            assert store.get_snapshot() is not None
+
+        # and then options are fetched individually again
+        mocked_time.return_value = 1101
+        assert store.get_snapshot() is None
+        assert store.get(key) == "bar"
@@ -3,11 +3,14 @@ from collections.abc import Collection, Sequence
 import pytest
 
 from sentry.ratelimits.cardinality import (
+    CardinalityLimiter,
     GrantedQuota,
     Quota,
     RedisCardinalityLimiter,
+    RedisHLLCardinalityLimiter,
     RequestedQuota,
 )
+from sentry.utils import redis
 
 
 @pytest.fixture
@@ -21,7 +24,7 @@ class LimiterHelper:
     primitive interface for more readable tests.
     """
 
-    def __init__(self, limiter: RedisCardinalityLimiter):
+    def __init__(self, limiter: CardinalityLimiter):
         self.limiter = limiter
         self.quota = Quota(window_seconds=3600, granularity_seconds=60, limit=10)
         self.timestamp = 3600
@@ -227,3 +230,112 @@ def test_regression_mixed_order(limiter: RedisCardinalityLimiter):
     # there used to be a bug where anything after 10 (i.e. 5) was dropped as
     # well (due to a wrong `break` somewhere in a loop)
     assert helper.add_values([0, 1, 2, 3, 4, 6, 7, 8, 9, 10, 5]) == [0, 1, 2, 3, 4, 6, 7, 8, 9, 5]
+
+
+@pytest.fixture
+def hll_limiter():
+    return RedisHLLCardinalityLimiter()
+
+
+def test_hll_basic(hll_limiter: RedisHLLCardinalityLimiter):
+    helper = LimiterHelper(hll_limiter)
+
+    for _ in range(20):
+        assert helper.add_value(1) == 1
+
+    for _ in range(20):
+        assert helper.add_value(2) == 2
+
+    assert [helper.add_value(10 + i) for i in range(100)] == list(range(10, 18)) + [None] * 92
+
+    helper.timestamp += 3600
+
+    # an hour has passed, all granules that hashes were added to are out of
+    # the window
+    assert [helper.add_value(10 + i) for i in range(100)] == list(range(10, 20)) + [None] * 90
+
+
+def test_hll_shards():
+    limiter = RedisHLLCardinalityLimiter(error_bound=0.004)
+    assert limiter.num_shards == 5
+
+    helper = LimiterHelper(limiter)
+    assert helper.add_values(list(range(20))) == list(range(10))
+    assert helper.add_values(list(range(20))) == list(range(10))
+
+
+def test_hll_multiple_prefixes(hll_limiter: RedisHLLCardinalityLimiter):
+    quota = Quota(window_seconds=3600, granularity_seconds=60, limit=10)
+    requests = [
+        RequestedQuota(prefix="a", unit_hashes=[1, 2, 3, 4, 5], quota=quota),
+        RequestedQuota(prefix="b", unit_hashes=list(range(1, 12)), quota=quota),
+    ]
+    new_timestamp, grants = hll_limiter.check_within_quotas(requests)
+    assert grants == [
+        GrantedQuota(request=requests[0], granted_unit_hashes=[1, 2, 3, 4, 5], reached_quota=None),
+        GrantedQuota(
+            request=requests[1], granted_unit_hashes=list(range(1, 11)), reached_quota=quota
+        ),
+    ]
+    hll_limiter.use_quotas(grants, new_timestamp)
+
+    requests = [
+        RequestedQuota(prefix="a", unit_hashes=list(range(1, 12)), quota=quota),
+        RequestedQuota(prefix="b", unit_hashes=list(range(1, 12)), quota=quota),
+    ]
+    new_timestamp, grants = hll_limiter.check_within_quotas(requests)
+    assert [grant.granted_unit_hashes for grant in grants] == [
+        list(range(1, 11)),
+        list(range(1, 11)),
+    ]
+
+
+BENCHMARK_CARDINALITY = 10_000_000
+BENCHMARK_BATCH_SIZE = 10_000
+
+
+def benchmark_available() -> bool:
+    try:
+        __import__("pytest_benchmark")
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+def get_used_memory() -> int:
+    is_redis_cluster, client, _ = redis.get_dynamic_cluster_from_options("", {"cluster": "default"})
+    if not is_redis_cluster:
+        return sum(
+            client.get_local_client(host).info("memory")["used_memory"] for host in client.hosts
+        )
+    return sum(info["used_memory"] for info in client.info("memory").values())
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("limiter_cls", [RedisCardinalityLimiter, RedisHLLCardinalityLimiter])
+def test_benchmark_cardinality(limiter_cls, benchmark):
+    """
+    Feeds `BENCHMARK_CARDINALITY` unique hashes for a single organization
+    through the limiter, and reports the time per batch and the memory used
+    by Redis for them.
+    """
+    limiter = limiter_cls()
+    quota = Quota(window_seconds=3600, granularity_seconds=60, limit=2 * BENCHMARK_CARDINALITY)
+    batches = iter(range(0, BENCHMARK_CARDINALITY, BENCHMARK_BATCH_SIZE))
+    timestamp = 3600
+
+    def setup():
+        start = next(batches)
+        request = RequestedQuota(
+            prefix="benchmark", unit_hashes=range(start, start + BENCHMARK_BATCH_SIZE), quota=quota
+        )
+        return (request,), {}
+
+    def run(request):
+        new_timestamp, grants = limiter.check_within_quotas([request], timestamp=timestamp)
+        limiter.use_quotas(grants, new_timestamp)
+
+    used_memory = get_used_memory()
+    benchmark.pedantic(run, setup=setup, rounds=BENCHMARK_CARDINALITY // BENCHMARK_BATCH_SIZE)
+    benchmark.extra_info["used_memory"] = get_used_memory() - used_memory
@@ -0,0 +1,100 @@
+from time import time
+from unittest import mock
+
+from sentry.ratelimits.base import RateLimitCheck
+from sentry.ratelimits.gcra import GCRARateLimiter
+from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.datetime import freeze_time
+
+
+class GCRARateLimiterTest(TestCase):
+    def setUp(self):
+        self.backend = GCRARateLimiter(local_cache_ttl=0)
+
+    def test_project_key(self):
+        with freeze_time("2000-01-01"):
+            assert not self.backend.is_limited("foo", 1, self.project)
+            assert self.backend.is_limited("foo", 1, self.project)
+            assert not self.backend.is_limited("foo", 1)
+
+    def test_burst_and_refill(self):
+        with freeze_time("2000-01-01") as frozen_time:
+            for _ in range(10):
+                assert not self.backend.is_limited("foo", 10, window=10)
+            assert self.backend.is_limited("foo", 10, window=10)
+            assert self.backend.current_value("foo") == 10
+
+            # One request is allowed again per emission interval (window / limit)
+            frozen_time.shift(1)
+            assert self.backend.current_value("foo") == 9
+            assert not self.backend.is_limited("foo", 10, window=10)
+            assert self.backend.is_limited("foo", 10, window=10)
+
+            frozen_time.shift(10)
+            assert self.backend.current_value("foo") == 0
+
+    def test_is_limited_with_value(self):
+        with freeze_time("2000-01-01"):
+            limited, value, reset_time = self.backend.is_limited_with_value("foo", 2, window=10)
+            assert not limited
+            assert value == 1
+            assert reset_time == int(time() + 5)
+
+            limited, value, reset_time = self.backend.is_limited_with_value("foo", 2, window=10)
+            assert not limited
+            assert value == 2
+            assert reset_time == int(time() + 10)
+
+            limited, value, reset_time = self.backend.is_limited_with_value("foo", 2, window=10)
+            assert limited
+            assert value == 2
+            assert reset_time == int(time() + 10)
+
+    def test_is_limited_many(self):
+        with freeze_time("2000-01-01"):
+            checks = [
+                RateLimitCheck("foo", 5, window=10),
+                RateLimitCheck("bar", 2, window=10),
+            ]
+            result = self.backend.is_limited_many(checks)
+            assert result is not None
+            assert not result.is_limited
+            assert result.check.key == "bar"
+
+            self.backend.is_limited_many(checks)
+            result = self.backend.is_limited_many(checks)
+            assert result is not None
+            assert result.is_limited
+            assert result.check.key == "bar"
+            assert self.backend.current_value("foo") == 3
+
+        assert self.backend.is_limited_many([]) is None
+
+    def test_local_lease(self):
+        backend = GCRARateLimiter(local_lease_fraction=0.1, local_lease_headroom=0.5)
+
+        with freeze_time("2000-01-01"), mock.patch.object(
+            backend, "_execute", wraps=backend._execute
+        ) as execute:
+            # The first check reserves 10 requests, the other 9 are handed out locally
+            for i in range(10):
+                limited, value, _ = backend.is_limited_with_value("foo", 100, window=100)
+                assert not limited
+                assert value == i + 1
+            assert execute.call_count == 1
+            assert backend.current_value("foo") == 10
+
+            backend.is_limited("foo", 100, window=100)
+            assert execute.call_count == 2
+
+    def test_no_local_lease_close_to_limit(self):
+        backend = GCRARateLimiter(local_lease_fraction=0.1, local_lease_headroom=0.5)
+
+        with freeze_time("2000-01-01"):
+            for _ in range(50):
+                self.backend.is_limited("foo", 100, window=100)
+
+            # Only a single request is reserved once less than half of the limit
+            # (plus the size of a lease) is available.
+            backend.is_limited("foo", 100, window=100)
+            assert backend.current_value("foo") == 51
@@ -13,6 +13,7 @@ from sentry.models.dashboard_widget import DashboardWidgetQuery, DashboardWidget
 from sentry.models.environment import Environment
 from sentry.models.project import Project
 from sentry.models.transaction_threshold import ProjectTransactionThreshold, TransactionMetric
+from sentry.relay.config import metric_extraction
 from sentry.relay.config.experimental import TimeoutException
 from sentry.relay.config.metric_extraction import (
     _set_bulk_cached_query_chunk,
@@ -781,6 +782,53 @@ def test_get_metric_extraction_config_uses_cache_for_widgets(default_project: Pr
         assert mock_set_cache_chunk_spy.call_count == 6
 
 
+@django_db_all
+@override_options({"on_demand_metrics.spec_cache.enable": True})
+def test_get_metric_extraction_config_uses_spec_cache(default_project: Project) -> None:
+    with (
+        Feature({ON_DEMAND_METRICS: True, ON_DEMAND_METRICS_WIDGETS: True}),
+        mock.patch(
+            "sentry.relay.config.metric_extraction._compute_aggregate_and_query_specs",
+            wraps=metric_extraction._compute_aggregate_and_query_specs,
+        ) as compute_specs,
+    ):
+        create_alert("count()", "transaction.duration:>=1000", default_project)
+        create_widget(["count()"], "transaction.duration:>=2000", default_project)
+
+        config = get_metric_extraction_config(default_project)
+        assert config
+        assert len(config["metrics"]) == 2
+        assert compute_specs.call_count == 2
+
+        # Specs are looked up in the cache instead of being converted again.
+        assert get_metric_extraction_config(default_project) == config
+        assert compute_specs.call_count == 2
+
+
+@django_db_all
+@override_options({"on_demand_metrics.spec_cache.enable": True})
+def test_get_metric_extraction_config_spec_cache_skips_project_dependent_specs(
+    default_project: Project,
+) -> None:
+    with (
+        Feature({ON_DEMAND_METRICS: True}),
+        mock.patch(
+            "sentry.relay.config.metric_extraction._compute_aggregate_and_query_specs",
+            wraps=metric_extraction._compute_aggregate_and_query_specs,
+        ) as compute_specs,
+    ):
+        create_alert("apdex(10)", "transaction.duration:>=1000", default_project)
+
+        config = get_metric_extraction_config(default_project)
+        assert config
+        assert compute_specs.call_count == 1
+
+        # Apdex depends on the project's thresholds, so it is never cached.
+        create_project_threshold(default_project, 200, TransactionMetric.DURATION.value)
+        assert get_metric_extraction_config(default_project) != config
+        assert compute_specs.call_count == 2
+
+
 @django_db_all
 def test_get_metric_extraction_config_alerts_and_widgets(default_project: Project) -> None:
     # deduplication should work across alerts and widgets
@@ -1,6 +1,7 @@
 from unittest import mock
 
 from sentry.relay.projectconfig_cache import redis
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils import metrics
 
@@ -34,3 +35,31 @@ def test_read_write():
 
     assert cache.get_rev(dsn1) == "my_rev_123"
     assert cache.get_rev(dsn2) is None
+
+
+@django_db_all
+@override_options({"relay.project-config-cache.skip-unchanged": True})
+def test_skip_unchanged():
+    cache = redis.RedisProjectConfigCache()
+
+    value1 = {"my-value": "foo", "rev": "rev_1", "lastChange": "2024-01-01T00:00:00Z"}
+    cache.set_many({"a": value1})
+    assert cache.get("a") == value1
+
+    # Only the revision and timestamps differ, the cached config is kept.
+    value2 = {"my-value": "foo", "rev": "rev_2", "lastChange": "2024-01-02T00:00:00Z"}
+    with mock.patch("sentry.relay.projectconfig_cache.redis.zstandard.compress") as compress:
+        cache.set_many({"a": value2})
+    assert compress.call_count == 0
+    assert cache.get("a") == value1
+    assert cache.get_rev("a") == "rev_1"
+
+    value3 = {"my-value": "bar", "rev": "rev_3"}
+    cache.set_many({"a": value3})
+    assert cache.get("a") == value3
+    assert cache.get_rev("a") == "rev_3"
+
+    # Deleted configs are written again, even if unchanged.
+    cache.delete_many(["a"])
+    cache.set_many({"a": value3})
+    assert cache.get("a") == value3
@@ -1,4 +1,11 @@
-from sentry.spans.buffer.redis import ProcessSegmentsContext, RedisSpansBuffer, SegmentKey
+from sentry.spans.buffer.redis import (
+    ProcessSegmentsContext,
+    RedisSpansBuffer,
+    SegmentKey,
+    decode_spans,
+    encode_spans,
+)
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 
 
@@ -101,6 +108,46 @@ class TestRedisSpansBuffer:
             [b"span data", b"span data 2", b"span data 3", b"span data 4", b"span data 5"]
         ]
 
+    @django_db_all
+    @override_options({"standalone-spans.buffer-compact-segments.enable": True})
+    def test_compact_batch_write(self):
+        buffer = RedisSpansBuffer()
+        key = SegmentKey("segment_1", 1, 1)
+
+        result = buffer.batch_write_and_check_processing(
+            spans_map={key: [b"span data", b"span data 2"]},
+            segment_first_seen_ts={key: 1710280889},
+            latest_ts_by_partition={1: 1710280889},
+        )
+        assert result == [
+            ProcessSegmentsContext(timestamp=1710280889, partition=1, should_process_segments=True)
+        ]
+
+        # The second write appends to the segment and does not schedule it again
+        buffer.batch_write_and_check_processing(
+            spans_map={key: [b"", b"span data 3"]},
+            segment_first_seen_ts={key: 1710280890},
+            latest_ts_by_partition={1: 1710280890},
+        )
+
+        segment_key = "segment:segment_1:1:process-segment-compact"
+        assert buffer.client.ttl(segment_key) == 300
+        assert buffer.client.lrange(
+            "performance-issues:unprocessed-segments:partition-2:1", 0, -1
+        ) == [b"1710280889", segment_key.encode()]
+
+        segments = buffer.read_and_expire_many_segments([segment_key])
+        assert [[bytes(span) for span in segment] for segment in segments] == [
+            [b"span data", b"span data 2", b"", b"span data 3"]
+        ]
+        assert buffer.read_and_expire_many_segments([segment_key]) == [[]]
+
+    def test_encode_spans(self):
+        spans = [b'{"span_id": "a"}', b"", b'{"span_id": "b"}']
+        blob = encode_spans(spans[:2]) + encode_spans(spans[2:])
+        assert [bytes(span) for span in decode_spans(blob)] == spans
+        assert decode_spans(b"") == []
+
     @django_db_all
     def test_get_unprocessed_segments_and_prune_bucket(self):
         buffer = RedisSpansBuffer()
@@ -148,3 +195,54 @@ class TestRedisSpansBuffer:
             b"1710280892",
             b"segment:segment_3:1:process-segment",
         ]
+
+    @django_db_all
+    @override_options(
+        {
+            "standalone-spans.buffer-sorted-set-scheduling.enable": True,
+            "standalone-spans.buffer-claim-batch-size": 1,
+        }
+    )
+    def test_get_unprocessed_segments_from_schedule(self):
+        buffer = RedisSpansBuffer()
+        spans_map = {
+            SegmentKey("segment_1", 1, 1): [b"span data"],
+            SegmentKey("segment_2", 1, 1): [b"span data"],
+            SegmentKey("segment_3", 1, 1): [b"span data"],
+        }
+        timestamp_map = {
+            SegmentKey("segment_1", 1, 1): 1710280890,
+            SegmentKey("segment_2", 1, 1): 1710280891,
+            SegmentKey("segment_3", 1, 1): 1710280892,
+        }
+        buffer.batch_write_and_check_processing(
+            spans_map=spans_map,
+            segment_first_seen_ts=timestamp_map,
+            latest_ts_by_partition={1: 1710280893},
+        )
+
+        # A segment left over in the legacy bucket is still picked up
+        buffer.client.rpush(
+            "performance-issues:unprocessed-segments:partition-2:1",
+            1710280889,
+            "segment:segment_0:1:process-segment",
+        )
+
+        schedule_key = "performance-issues:segment-schedule:partition:1"
+        assert buffer.client.zrange(schedule_key, 0, -1, withscores=True) == [
+            (b"segment:segment_1:1:process-segment", 1710280890),
+            (b"segment:segment_2:1:process-segment", 1710280891),
+            (b"segment:segment_3:1:process-segment", 1710280892),
+        ]
+
+        segment_keys = buffer.get_unprocessed_segments_and_prune_bucket(1710281011, 1)
+        assert segment_keys == [
+            "segment:segment_0:1:process-segment",
+            "segment:segment_1:1:process-segment",
+        ]
+
+        segment_keys = buffer.get_unprocessed_segments_and_prune_bucket(1710281011, 1)
+        assert segment_keys == ["segment:segment_2:1:process-segment"]
+
+        assert buffer.client.zrange(schedule_key, 0, -1) == [b"segment:segment_3:1:process-segment"]
+        assert buffer.client.llen("performance-issues:unprocessed-segments:partition-2:1") == 0
@@ -4,14 +4,16 @@ from unittest import mock
 from arroyo.backends.kafka import KafkaPayload
 from arroyo.types import BrokerValue, Message, Partition
 from arroyo.types import Topic as ArroyoTopic
+from arroyo.types import Value
 
 from sentry.conf.types.kafka_definition import Topic
-from sentry.spans.buffer.redis import get_redis_client
+from sentry.spans.buffer.redis import SegmentKey, get_redis_client
 from sentry.spans.consumers.detect_performance_issues.factory import BUFFERED_SEGMENT_SCHEMA
 from sentry.spans.consumers.process.factory import (
     ProcessSpansStrategyFactory,
     batch_write_to_redis,
     expand_segments,
+    process_batch,
 )
 from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
@@ -503,3 +505,74 @@ def test_with_expand_segment():
         ]
 
         assert redis_client.ttl("segment:a96c2bcd49de0c43:1:process-segment") == -2
+
+
+@override_options(
+    {
+        "standalone-spans.process-spans-consumer.enable": True,
+        "standalone-spans.process-spans-consumer.project-allowlist": [1],
+    }
+)
+def test_batched_parallel_pushes_to_redis():
+    redis_client = get_redis_client()
+
+    topic = ArroyoTopic(get_topic_definition(Topic.SNUBA_SPANS)["real_topic_name"])
+    partition = Partition(topic, 0)
+    factory = ProcessSpansStrategyFactory(
+        num_processes=2,
+        input_block_size=1,
+        max_batch_size=2,
+        max_batch_time=1,
+        output_block_size=1,
+        mode="batched-parallel",
+    )
+    strategy = factory.create_with_partitions(commit=mock.Mock(), partitions={})
+
+    span_data = build_mock_span(project_id=1, is_segment=True, segment_id="b49b42af9fb69da0")
+    message1 = build_mock_message(span_data, topic)
+    strategy.submit(make_payload(message1, partition))
+
+    span_data = build_mock_span(project_id=1, segment_id="b49b42af9fb69da0")
+    message2 = build_mock_message(span_data, topic)
+    strategy.submit(make_payload(message2, partition, 2))
+
+    strategy.poll()
+    strategy.join(1)
+    strategy.terminate()
+
+    assert redis_client.lrange("segment:b49b42af9fb69da0:1:process-segment", 0, -1) == [
+        message1.value().encode("utf-8"),
+        message2.value().encode("utf-8"),
+    ]
+
+
+@override_options(
+    {
+        "standalone-spans.process-spans-consumer.enable": True,
+        "standalone-spans.process-spans-consumer.project-allowlist": [1],
+    }
+)
+def test_process_batch():
+    topic = ArroyoTopic(get_topic_definition(Topic.SNUBA_SPANS)["real_topic_name"])
+    partition = Partition(topic, 0)
+    timestamp = datetime(2024, 1, 1, 12, 0, 0)
+
+    message1 = build_mock_message(
+        build_mock_span(project_id=1, is_segment=True, segment_id="b49b42af9fb69da0"), topic
+    )
+    message2 = build_mock_message(
+        build_mock_span(project_id=1, segment_id="b49b42af9fb69da0"), topic
+    )
+    values = [
+        make_payload(message1, partition, 1, timestamp).value,
+        make_payload(message2, partition, 2, timestamp + timedelta(seconds=1)).value,
+    ]
+
+    batch = process_batch(Message(Value(values, {partition: 3})))
+
+    key = SegmentKey("b49b42af9fb69da0", 1, 0)
+    assert batch.spans_map == {
+        key: [message1.value().encode("utf-8"), message2.value().encode("utf-8")]
+    }
+    assert batch.segment_first_seen_ts == {key: int(timestamp.timestamp())}
+    assert batch.latest_ts_by_partition == {0: int(timestamp.timestamp()) + 1}
@@ -7,9 +7,10 @@ from django.core.mail.message import EmailMultiAlternatives
 import sentry
 from sentry.digests.backends.redis import RedisBackend
 from sentry.digests.notifications import event_to_record
+from sentry.mail import mail_adapter
 from sentry.models.projectownership import ProjectOwnership
 from sentry.models.rule import Rule
-from sentry.tasks.digests import deliver_digest
+from sentry.tasks.digests import deliver_digest, deliver_digests
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.testutils.skips import requires_snuba
@@ -18,11 +19,12 @@ pytestmark = [requires_snuba]
 
 
 class DeliverDigestTest(TestCase):
-    def run_test(self, key: str) -> None:
+    def run_test(self, *keys: str, batched: bool = False) -> None:
         """Simple integration test to make sure that digests are firing as expected."""
         with mock.patch.object(sentry, "digests") as digests:
             backend = RedisBackend()
             digests.backend.digest = backend.digest
+            digests.backend.digest_many = backend.digest_many
 
             rule = Rule.objects.create(project=self.project, label="Test Rule", data={})
             ProjectOwnership.objects.create(project_id=self.project.id, fallthrough=True)
@@ -35,20 +37,25 @@ class DeliverDigestTest(TestCase):
                 project_id=self.project.id,
             )
             notification_uuid = str(uuid.uuid4())
-            backend.add(
-                key,
-                event_to_record(event, [rule], notification_uuid),
-                increment_delay=0,
-                maximum_delay=0,
-            )
-            backend.add(
-                key,
-                event_to_record(event_2, [rule], notification_uuid),
-                increment_delay=0,
-                maximum_delay=0,
-            )
+            for key in keys:
+                backend.add(
+                    key,
+                    event_to_record(event, [rule], notification_uuid),
+                    increment_delay=0,
+                    maximum_delay=0,
+                )
+                backend.add(
+                    key,
+                    event_to_record(event_2, [rule], notification_uuid),
+                    increment_delay=0,
+                    maximum_delay=0,
+                )
             with self.tasks():
-                deliver_digest(key)
+                if batched:
+                    deliver_digests(list(keys))
+                else:
+                    for key in keys:
+                        deliver_digest(key)
 
     def test_old_key(self):
         self.run_test(f"mail:p:{self.project.id}")
@@ -74,6 +81,37 @@ class DeliverDigestTest(TestCase):
         assert isinstance(message.alternatives[0][0], str)
         assert "notification_uuid" in message.alternatives[0][0]
 
+    def test_batched_member_key(self):
+        self.run_test(f"mail:p:{self.project.id}:Member:{self.user.id}", batched=True)
+        assert "2 new alerts since" in mail.outbox[0].subject
+
+    def test_batched_notify_failure(self):
+        user = self.create_user()
+        self.create_member(user=user, organization=self.organization, teams=[self.team])
+
+        notify_digest = mail_adapter.notify_digest
+        failed = []
+
+        def fail_first(project, digest, target_type, target_identifier=None, **kwargs):
+            if not failed:
+                failed.append(target_identifier)
+                raise Exception("Failed to send")
+            return notify_digest(project, digest, target_type, target_identifier, **kwargs)
+
+        with mock.patch.object(mail_adapter, "notify_digest", side_effect=fail_first) as notify:
+            self.run_test(
+                f"mail:p:{self.project.id}:Member:{self.user.id}",
+                f"mail:p:{self.project.id}:Member:{user.id}",
+                batched=True,
+            )
+
+        # The failure of the first digest does not keep the second from being delivered.
+        assert failed == [str(self.user.id)]
+        assert notify.call_count == 2
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == [user.email]
+        assert "2 new alerts since" in mail.outbox[0].subject
+
     def test_no_records(self):
         # This shouldn't error if no records are present
         deliver_digest(f"mail:p:{self.project.id}:IssueOwners:")
@@ -9,6 +9,7 @@ from sentry.db.postgres.transactions import in_test_hide_transaction_boundary
 from sentry.models.options.project_option import ProjectOption
 from sentry.models.project import Project
 from sentry.models.projectkey import ProjectKey, ProjectKeyStatus
+from sentry.relay.config import get_organization_config_sections
 from sentry.relay.projectconfig_cache.redis import RedisProjectConfigCache
 from sentry.relay.projectconfig_debounce_cache.redis import RedisProjectConfigDebounceCache
 from sentry.tasks.relay import (
@@ -188,6 +189,35 @@ def test_generate(
     ]
 
 
+@django_db_all
+def test_invalidate_org_shares_organization_sections(
+    default_project,
+    default_organization,
+    default_projectkey,
+    redis_cache,
+    django_cache,
+):
+    other_projectkey = ProjectKey.objects.create(project=default_project)
+    redis_cache.set_many(
+        {
+            default_projectkey.public_key: {"dummy-key": "val"},
+            other_projectkey.public_key: {"dummy-key": "val"},
+        }
+    )
+
+    with mock.patch(
+        "sentry.relay.config.get_organization_config_sections",
+        wraps=get_organization_config_sections,
+    ) as organization_sections:
+        invalidate_project_config(organization_id=default_organization.id)
+
+    assert organization_sections.call_count == 1
+    for public_key in (default_projectkey.public_key, other_projectkey.public_key):
+        cfg = redis_cache.get(public_key)
+        assert "dummy-key" not in cfg
+        assert cfg["projectId"] == default_project.id
+
+
 @django_db_all
 def test_project_update_option(
     default_projectkey,
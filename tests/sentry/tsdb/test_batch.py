@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from sentry.testutils.cases import TestCase
+from sentry.tsdb.base import BaseTSDB, TSDBModel
+from sentry.tsdb.batch import TSDBWriteBatch, batched_writes, get_write_batch
+
+
+class TSDBWriteBatchTest(TestCase):
+    def setUp(self):
+        self.backend = mock.Mock(spec=BaseTSDB)
+        self.backend.get_rollups.return_value = {10: 30, 3600: 24}
+        self.backend.normalize_to_epoch.side_effect = lambda ts, seconds: (
+            int(ts.timestamp()) // seconds * seconds
+        )
+        self.now = datetime(2024, 1, 1, 12, 0, 3, tzinfo=timezone.utc)
+
+    def test_incr_merges_within_resolution(self):
+        batch = TSDBWriteBatch(self.backend)
+        assert batch.resolution == 10
+
+        batch.incr(TSDBModel.project, 1, self.now, environment_id=2)
+        batch.incr(TSDBModel.project, 1, self.now + timedelta(seconds=5), environment_id=2)
+        batch.incr(TSDBModel.project, 1, self.now + timedelta(seconds=10), environment_id=2)
+        batch.incr(TSDBModel.group, 3, self.now, count=2, environment_id=2)
+        batch.flush()
+
+        bucket = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        self.backend.incr_multi.assert_called_once_with(
+            [
+                (TSDBModel.project, 1, {"timestamp": bucket, "count": 2}),
+                (
+                    TSDBModel.project,
+                    1,
+                    {"timestamp": bucket + timedelta(seconds=10), "count": 1},
+                ),
+                (TSDBModel.group, 3, {"timestamp": bucket, "count": 2}),
+            ],
+            environment_id=2,
+        )
+
+        self.backend.incr_multi.reset_mock()
+        batch.flush()
+        assert not self.backend.incr_multi.called
+
+    def test_record_and_frequencies(self):
+        batch = TSDBWriteBatch(self.backend)
+        batch.record(TSDBModel.users_affected_by_group, 1, ("a",), self.now, environment_id=2)
+        batch.record(TSDBModel.users_affected_by_group, 1, ("a", "b"), self.now, environment_id=2)
+        batch.record_frequency(TSDBModel.frequent_environments_by_group, 1, {2: 1}, self.now)
+        batch.record_frequency(TSDBModel.frequent_environments_by_group, 1, {2: 1}, self.now)
+        batch.flush()
+
+        bucket = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+        self.backend.record_multi.assert_called_once_with(
+            [(TSDBModel.users_affected_by_group, 1, {"a", "b"})],
+            timestamp=bucket,
+            environment_id=2,
+        )
+        self.backend.record_frequency_multi.assert_called_once_with(
+            [(TSDBModel.frequent_environments_by_group, {1: {2: 2}})],
+            timestamp=bucket,
+            environment_id=None,
+        )
+
+    def test_batched_writes_nests(self):
+        assert get_write_batch() is None
+        with batched_writes(self.backend) as outer:
+            with batched_writes(self.backend) as inner:
+                assert inner is outer
+                inner.incr(TSDBModel.project, 1, self.now)
+            assert not self.backend.incr_multi.called
+            assert get_write_batch() is outer
+        assert get_write_batch() is None
+        self.backend.incr_multi.assert_called_once()
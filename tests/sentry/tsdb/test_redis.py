@@ -185,6 +185,25 @@ class RedisTSDBTest(TestCase):
         sum_results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=1)
         assert sum_results == {1: 0, 2: 0}
 
+    def test_get_range_and_sums_many_keys(self):
+        now = datetime.now(timezone.utc)
+        keys = list(range(1, 300))
+        self.db.incr_multi(
+            [(TSDBModel.group, key, {"timestamp": now, "count": key}) for key in keys]
+        )
+        self.db.incr(TSDBModel.group, 1, now - timedelta(hours=1))
+
+        start = now - timedelta(hours=1)
+        assert self.db.get_sums(TSDBModel.group, keys + [1000], start, now) == {
+            **{key: key for key in keys},
+            1: 2,
+            1000: 0,
+        }
+
+        results = self.db.get_range(TSDBModel.group, keys, start, now, rollup=ONE_HOUR)
+        assert [count for _, count in results[1]] == [1, 1]
+        assert [count for _, count in results[299]] == [0, 299]
+
     def test_count_distinct(self):
         now = datetime.now(timezone.utc) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
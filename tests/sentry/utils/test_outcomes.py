@@ -1,11 +1,14 @@
 import types
+from datetime import UTC, datetime
 from unittest import mock
 
 import pytest
 
 from sentry.conf.types.kafka_definition import Topic
+from sentry.constants import DataCategory
+from sentry.testutils.helpers.options import override_options
 from sentry.utils import json, kafka_config, outcomes
-from sentry.utils.outcomes import Outcome, track_outcome
+from sentry.utils.outcomes import Outcome, OutcomeAggregator, flush_outcomes, track_outcome
 
 
 @pytest.fixture(autouse=True)
@@ -161,3 +164,109 @@ def test_track_outcome_billing_cluster(settings, setup):
         assert topic_name == "outcomes-billing"
 
         assert outcomes.outcomes_publisher is None
+
+
+def test_track_outcome_aggregated(setup):
+    """
+    Checks that non-billing outcomes are summed per key and minute when
+    aggregation is enabled, while billing outcomes are sent right away.
+    """
+    with (
+        override_options({"outcomes.aggregation.enable": True}),
+        mock.patch.object(outcomes, "outcome_aggregator", None),
+        mock.patch("sentry.utils.outcomes.threading.Thread"),
+    ):
+        for second, event_id, reason in [
+            (10, "a" * 32, "release-version"),
+            (30, "b" * 32, "release-version"),
+            (50, "c" * 32, "error-message"),
+            (70, "d" * 32, "release-version"),
+        ]:
+            track_outcome(
+                org_id=1,
+                project_id=2,
+                key_id=3,
+                outcome=Outcome.FILTERED,
+                reason=reason,
+                timestamp=datetime.fromtimestamp(1_700_000_040 + second, UTC),
+                event_id=event_id,
+                category=DataCategory.ERROR,
+            )
+
+        track_outcome(
+            org_id=1,
+            project_id=2,
+            key_id=3,
+            outcome=Outcome.ACCEPTED,
+            event_id="e" * 32,
+            category=DataCategory.ERROR,
+        )
+
+        publish = setup.mock_publisher.return_value.publish
+        assert publish.call_count == 1
+        (topic_name, payload), _ = publish.call_args
+        assert topic_name == "outcomes-billing"
+        assert json.loads(payload)["event_id"] == "e" * 32
+
+        publish.reset_mock()
+        flush_outcomes()
+
+    payloads = sorted(
+        (json.loads(payload) for (topic_name, payload), _ in publish.call_args_list),
+        key=lambda data: (data["timestamp"], data["reason"]),
+    )
+    assert {topic_name for (topic_name, _), _ in publish.call_args_list} == {"outcomes"}
+    assert [
+        (data["timestamp"], data["reason"], data["event_id"], data["quantity"]) for data in payloads
+    ] == [
+        ("2023-11-14T22:14:00.000000Z", "error-message", None, 1),
+        ("2023-11-14T22:14:00.000000Z", "release-version", None, 2),
+        ("2023-11-14T22:15:00.000000Z", "release-version", None, 1),
+    ]
+
+
+def test_outcome_aggregator_max_keys(setup):
+    """
+    Checks that the aggregator flushes as soon as it collected outcomes for
+    the maximum number of keys.
+    """
+    aggregator = OutcomeAggregator(max_keys=2)
+    timestamp = datetime.now(UTC)
+    publish = setup.mock_publisher.return_value.publish
+
+    with mock.patch("sentry.utils.outcomes.threading.Thread"):
+        aggregator.track(1, 2, 3, Outcome.INVALID, "project_id", timestamp, None, 1)
+        aggregator.track(1, 2, 3, Outcome.INVALID, "project_id", timestamp, None, 1)
+        assert publish.call_count == 0
+
+        aggregator.track(1, 2, 3, Outcome.INVALID, "payload", timestamp, None, 1)
+        assert publish.call_count == 2
+
+    aggregator.flush()
+    assert publish.call_count == 2
+
+
+def test_outcome_aggregator_requeues_unpublished(setup):
+    """
+    Checks that outcomes which could not be published are kept for the next flush.
+    """
+    aggregator = OutcomeAggregator()
+    timestamp = datetime.now(UTC)
+    publish = setup.mock_publisher.return_value.publish
+
+    with mock.patch("sentry.utils.outcomes.threading.Thread"):
+        aggregator.track(1, 2, 3, Outcome.INVALID, "project_id", timestamp, None, 1)
+        aggregator.track(1, 2, 3, Outcome.INVALID, "payload", timestamp, None, 1)
+
+        publish.side_effect = [None, Exception("boom")]
+        with pytest.raises(Exception, match="boom"):
+            aggregator.flush()
+
+        aggregator.track(1, 2, 3, Outcome.INVALID, "payload", timestamp, None, 2)
+
+    publish.reset_mock(side_effect=True)
+    aggregator.flush()
+    (topic_name, payload), _ = publish.call_args
+    assert publish.call_count == 1
+    assert json.loads(payload)["reason"] == "payload"
+    assert json.loads(payload)["quantity"] == 3
@@ -0,0 +1,34 @@
+import signal
+from unittest import mock
+
+from sentry.utils import process_buffers
+from sentry.utils.process_buffers import flush_process_buffers
+
+
+@mock.patch("sentry.utils.outcomes.flush_outcomes")
+@mock.patch("sentry.buffer.flush")
+def test_flush_process_buffers(flush, flush_outcomes):
+    flush_process_buffers()
+    flush.assert_called_once_with()
+    flush_outcomes.assert_called_once_with()
+
+
+@mock.patch("sentry.utils.outcomes.flush_outcomes")
+@mock.patch("sentry.buffer.flush")
+def test_flush_process_buffers_logs_errors(flush, flush_outcomes):
+    flush.side_effect = Exception("boom")
+    with mock.patch.object(process_buffers.logger, "exception") as log_exception:
+        flush_process_buffers()
+    log_exception.assert_called_once()
+    flush_outcomes.assert_called_once_with()
+
+
+@mock.patch("sentry.utils.process_buffers.os.kill")
+@mock.patch("sentry.utils.process_buffers.signal.signal")
+@mock.patch("sentry.utils.process_buffers.flush_process_buffers")
+def test_sigterm_flushes_before_terminating(flush, set_signal, kill):
+    process_buffers._flush_and_terminate(signal.SIGTERM, None)
+
+    flush.assert_called_once_with()
+    set_signal.assert_called_once_with(signal.SIGTERM, signal.SIG_DFL)
+    kill.assert_called_once_with(mock.ANY, signal.SIGTERM)